@@ -11,20 +11,35 @@ This module:
 
 charge_stick(world_angle_hw, csx, csy) returns the (sx,sy) that charges toward world_angle_hw given
 where the camera WILL be, so the charge holds a fixed world axis no matter how the camera spins.
+csangle_trajectory / csangle_trajectory_seq return the whole predicted csangle path for an N-frame
+hold or a C-stick input sequence in one call, for planners that look several frames ahead.
 
 Data tables (omega_table_full.csv, stick_angle_table.csv) now ship inside the `superswim` pip
 package, under superswim/superswim/tables/. They are resolved at import time by _resolve_tables()
-below; see that function for the search order.
+below; see that function for the search order. The resolved paths and a compiled binary copy of
+both tables are cached under .cache/ (revalidated by mtime/size), so later imports skip the
+directory walk and the CSV parse.
 """
 import os
+import sys
 import csv
+import json
 import bisect
+from array import array
+from functools import lru_cache
 
-from dolphin import memory
-from ww import camera
+try:
+    from dolphin import memory
+    from ww import camera
+except ImportError:      # headless (offline planners / simulator): tables + math only, pass cam=
+    memory = camera = None
 
 _HERE = os.path.dirname(os.path.abspath(__file__))
 FULL_DEFLECT_MIN = 0.98          # stick_dist threshold for "full deflection" (max-charge snap)
+_CACHE_DIR = os.path.join(_HERE, ".cache")
+_MANIFEST = os.path.join(_CACHE_DIR, "cam_sync_tables.json")
+_MANIFEST_BIN = os.path.join(_CACHE_DIR, "cam_sync_tables.bin")
+_MANIFEST_VERSION = 1
 
 
 def _candidate_table_dirs():
@@ -76,72 +91,210 @@ _CAM_ROOT = 0x803AD380
 _YAW_OFF = 0x252
 _TARGET_OFF = 0x5F2
 
-_OMEGA = {}
+# Dense omega table: _OMEGA[(csx << 8) | csy] for all 256x256 C-stick positions, with pairs the CSV
+# doesn't list pre-filled from the csx-only (csy=128) column at load, so omega_cmd is a single index.
+# Stored as s16: omega is only ever added into a u16 angle, so it's exact mod 0x10000.
+_OMEGA = array("h")
 _ANG, _STK, _N = [], [], 0
 loaded = False
 load_error = None
 
 
-def _load():
-    global _OMEGA, _ANG, _STK, _N, loaded, load_error
-    omega_path, stick_path = _resolve_tables()
-    if not omega_path:
-        load_error = ("superswim tables not found (omega_table_full.csv / stick_angle_table.csv); "
-                      "searched: " + " | ".join(_candidate_table_dirs()))
-        loaded = False
-        return
+def s16(x):
+    x &= 0xFFFF
+    return x - 0x10000 if x >= 0x8000 else x
+
+
+def _parse_tables(omega_path, stick_path):
+    """CSV -> (dense omega array('h'), sorted angle array('i'), flat (sx,sy) array('B'))."""
+    with open(omega_path) as f:
+        sparse = {(int(r["csx"]) & 0xFF, int(r["csy"]) & 0xFF): int(r["omega"])
+                  for r in csv.DictReader(f)}
+    omega = array("h")
+    if sparse:
+        omega = array("h", bytes(2 * 0x10000))
+        for csx in range(256):
+            fb = sparse.get((csx, 128), 0)          # csy fallback to the csx-only column
+            row = csx << 8
+            for csy in range(256):
+                omega[row | csy] = s16(sparse.get((csx, csy), fb))
+    by_ang = {}
+    with open(stick_path) as f:
+        for r in csv.DictReader(f):
+            if float(r["stick_dist"]) >= FULL_DEFLECT_MIN:
+                by_ang.setdefault(int(r["angle"]), (int(r["sx"]), int(r["sy"])))
+    ang = array("i", sorted(by_ang))
+    stk = array("B")
+    for a in ang:
+        stk.extend(by_ang[a])
+    return omega, ang, stk
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return {"path": path, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _read_manifest():
+    """Compiled tables from the manifest if both source CSVs are unchanged, else None."""
     try:
-        with open(omega_path) as f:
-            _OMEGA = {(int(r["csx"]), int(r["csy"])): int(r["omega"]) for r in csv.DictReader(f)}
-        by_ang = {}
-        with open(stick_path) as f:
-            for r in csv.DictReader(f):
-                if float(r["stick_dist"]) >= FULL_DEFLECT_MIN:
-                    by_ang.setdefault(int(r["angle"]), (int(r["sx"]), int(r["sy"])))
-        _ANG = sorted(by_ang)
-        _STK = [by_ang[a] for a in _ANG]
-        _N = len(_ANG)
-        loaded = _N > 0 and len(_OMEGA) > 0
-    except Exception as e:
-        load_error = str(e)
-        loaded = False
+        with open(_MANIFEST) as f:
+            man = json.load(f)
+        if (man.get("version") != _MANIFEST_VERSION or man.get("byteorder") != sys.byteorder
+                or man.get("full_deflect_min") != FULL_DEFLECT_MIN):
+            return None
+        for key in ("omega", "stick"):
+            if _stamp(man[key]["path"]) != man[key]:
+                return None
+        omega, ang, stk = array("h"), array("i"), array("B")
+        with open(_MANIFEST_BIN, "rb") as f:
+            omega.fromfile(f, man["n_omega"])
+            ang.fromfile(f, man["n_ang"])
+            stk.fromfile(f, 2 * man["n_ang"])
+        return man["omega"]["path"], man["stick"]["path"], omega, ang, stk
+    except Exception:
+        return None
 
 
-_load()
+def _write_manifest(omega_path, stick_path, omega, ang, stk):
+    """Best-effort: a read-only checkout just re-parses next launch."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        tmp = _MANIFEST_BIN + ".tmp"
+        with open(tmp, "wb") as f:
+            omega.tofile(f)
+            ang.tofile(f)
+            stk.tofile(f)
+        os.replace(tmp, _MANIFEST_BIN)
+        man = {"version": _MANIFEST_VERSION, "byteorder": sys.byteorder,
+               "full_deflect_min": FULL_DEFLECT_MIN,
+               "omega": _stamp(omega_path), "stick": _stamp(stick_path),
+               "n_omega": len(omega), "n_ang": len(ang)}
+        tmp = _MANIFEST + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(man, f, indent=1)
+        os.replace(tmp, _MANIFEST)
+    except Exception:
+        pass
 
 
-def s16(x):
-    x &= 0xFFFF
-    return x - 0x10000 if x >= 0x8000 else x
+def _load():
+    global _OMEGA, _ANG, _STK, _N, loaded, load_error
+    cached = _read_manifest()
+    if cached is not None:
+        omega_path, stick_path, omega, ang, stk = cached
+    else:
+        omega_path, stick_path = _resolve_tables()
+        if not omega_path:
+            load_error = ("superswim tables not found (omega_table_full.csv / stick_angle_table.csv); "
+                          "searched: " + " | ".join(_candidate_table_dirs()))
+            loaded = False
+            return
+        try:
+            omega, ang, stk = _parse_tables(omega_path, stick_path)
+        except Exception as e:
+            load_error = str(e)
+            loaded = False
+            return
+        _write_manifest(omega_path, stick_path, omega, ang, stk)
+    _OMEGA = omega
+    _ANG = list(ang)
+    _STK = list(zip(stk[0::2], stk[1::2]))
+    _N = len(_ANG)
+    loaded = _N > 0 and len(_OMEGA) > 0
+
+
+_load()
 
 
 def omega_cmd(csx, csy):
-    o = _OMEGA.get((csx & 0xFF, csy & 0xFF))
-    if o is not None:
-        return o
-    return _OMEGA.get((csx & 0xFF, 128), 0)      # csy fallback to the csx-only column
+    if not _OMEGA:
+        return 0
+    return _OMEGA[((csx & 0xFF) << 8) | (csy & 0xFF)]
 
 
 def _cam_instance():
     return memory.read_u32(memory.read_u32(_CAM_ROOT) + 0x34)
 
 
-def predict_csangle(csx, csy, steps=1):
-    """csangle `steps` frames ahead given the C-stick currently held (which drives the rotation).
-    Falls back to the live read if the camera internals aren't readable."""
+def read_cam_state():
+    """(cam_yaw, cam_target) u16s from the live camera instance, or None if unreadable."""
     try:
         inst = _cam_instance()
-        yaw = memory.read_u16(inst + _YAW_OFF)
-        target = memory.read_u16(inst + _TARGET_OFF)
+        return memory.read_u16(inst + _YAW_OFF), memory.read_u16(inst + _TARGET_OFF)
     except Exception:
-        return camera.cs_angle_halfword()
-    if steps <= 0:
-        return (yaw + 0x8000) & 0xFFFF
-    om = omega_cmd(csx, csy)
+        return None
+
+
+def _live_csangle():
+    """The live csangle, for when the camera internals aren't readable. Outside Dolphin there is no
+    live camera, so the callers need their state passed in (cam= / yaw=, target=)."""
+    if camera is None:
+        raise RuntimeError("cam_sync: no live camera outside Dolphin; pass cam=(yaw, target) or yaw=, target=")
+    return camera.cs_angle_halfword()
+
+
+@lru_cache(maxsize=4096)
+def _yaw_offsets(d0, om, steps):
+    """Cumulative yaw offsets for `steps` frames of a constant omega, from d0 = s16(target - yaw).
+    The chase only depends on that difference (not on absolute yaw), so one entry serves every
+    camera state with the same lag -- repeated horizon queries while a hold is on are a lookup."""
+    out = []
+    d, off = d0, 0
     for _ in range(steps):
+        d = s16(d + om)
+        inc = int(d / 2)
+        off += inc
+        d -= inc
+        out.append(off)
+    return tuple(out)
+
+
+def csangle_trajectory(csx, csy, steps, yaw=None, target=None):
+    """csangle for each of the next `steps` frames (list, [k] = k+1 frames ahead) while (csx,csy) is
+    held. yaw/target default to the live camera; falls back to the live csangle repeated if the
+    camera internals aren't readable. Headless (no dolphin), yaw and target are required."""
+    if yaw is None or target is None:
+        st = read_cam_state()
+        if st is None:
+            return [_live_csangle()] * max(0, steps)
+        yaw, target = st
+    if steps <= 0:
+        return []
+    base = yaw + 0x8000
+    return [(base + off) & 0xFFFF for off in _yaw_offsets(s16(target - yaw), omega_cmd(csx, csy), steps)]
+
+
+def csangle_trajectory_seq(inputs, yaw=None, target=None):
+    """csangle after each frame of a C-stick input sequence [(csx,csy), ...] (list, same length).
+    yaw/target default to the live camera, as csangle_trajectory (required headless)."""
+    inputs = list(inputs)
+    if yaw is None or target is None:
+        st = read_cam_state()
+        if st is None:
+            return [_live_csangle()] * len(inputs)
+        yaw, target = st
+    om_tbl = _OMEGA
+    out = []
+    for csx, csy in inputs:
+        om = om_tbl[((csx & 0xFF) << 8) | (csy & 0xFF)] if om_tbl else 0
         target = (target + om) & 0xFFFF
         yaw = (yaw + int(s16(target - yaw) / 2)) & 0xFFFF
-    return (yaw + 0x8000) & 0xFFFF
+        out.append((yaw + 0x8000) & 0xFFFF)
+    return out
+
+
+def predict_csangle(csx, csy, steps=1, cam=None):
+    """csangle `steps` frames ahead given the C-stick currently held (which drives the rotation).
+    `cam` = (yaw, target) overrides the live read; falls back to the live csangle if the camera
+    internals aren't readable. Headless (no dolphin), cam is required."""
+    st = cam if cam is not None else read_cam_state()
+    if st is None:
+        return _live_csangle()
+    yaw, target = st
+    if steps <= 0:
+        return (yaw + 0x8000) & 0xFFFF
+    return csangle_trajectory(csx, csy, steps, yaw, target)[-1]
 
 
 def stick_for_angle_hw(stick_hw):
@@ -159,11 +312,11 @@ def stick_for_angle_hw(stick_hw):
     return best
 
 
-def charge_stick(world_angle_hw, csx, csy, steps=1):
+def charge_stick(world_angle_hw, csx, csy, steps=1, cam=None):
     """Full-deflection (sx,sy) that charges toward world_angle_hw given the PREDICTED camera.
     A snap sets facing := m34E8 == world_angle_hw, so pass the world facing you want to snap to.
-    Returns ((sx,sy), predicted_csangle)."""
-    pred = predict_csangle(csx, csy, steps)
+    `cam` = (yaw, target) as predict_csangle. Returns ((sx,sy), predicted_csangle)."""
+    pred = predict_csangle(csx, csy, steps, cam)
     stick_hw = (world_angle_hw - pred - 0x8000) & 0xFFFF
     return stick_for_angle_hw(stick_hw), pred
 
@@ -215,3 +368,140 @@ def reorient_targets(facing_hw, axis_hw, tol_hw=1820, max_depth=6):
                 return seen[g]
             q.append(g)
     return None
+
+
+# ---- C-stick camera planner: fewest frames (on a coarse omega grid) to bring csangle to a target -
+# Search is over the RELATIVE camera state (d = s16(target - yaw), yaw offset so far): the chase only
+# depends on d, so a plan found from one camera state replays from any other with the same lag, and
+# results are memoized on (d, wanted yaw delta). Each frame: target += omega; d1 = s16(d + omega);
+# yaw += trunc(d1/2); d = d1 - trunc(d1/2). Yaw gain is monotone in every frame's omega, so:
+#   - holding the max (min) omega for k frames bounds what's reachable in k frames -- the A*
+#     heuristic (admissible), which also prunes branches that can't land within max_frames;
+#   - interior frames branch over a coarse grid of omegas (_PLAN_LEVELS, always incl. both extremes
+#     and the one nearest 0), and the finishing frame bisects the FULL table for the omega that
+#     lands closest, so plans keep the table's full resolution without a 1000-way branch per frame.
+_PLAN_LEVELS = 24                # interior-frame omega grid size
+_PLAN_MAX_NODES = 20000          # A* node budget per query; None past it (raise max_frames/tol)
+_OMEGA_CHOICES = None            # cached ([omega, ...], [(csx,csy), ...]) -- one input per omega
+_OMEGA_LEVELS = None             # cached coarse [(omega, (csx,csy)), ...]
+
+
+def _omega_choices():
+    """(sorted distinct omegas, matching C-stick inputs): one input per omega in the table,
+    preferring csy=128 then the smallest deflection (the horizontal holds scripts already use)."""
+    global _OMEGA_CHOICES, _OMEGA_LEVELS
+    if _OMEGA_CHOICES is None and _OMEGA:
+        best = {}
+        for csx in range(256):
+            for csy in range(256):
+                om = _OMEGA[(csx << 8) | csy]
+                rank = (abs(csy - 128), abs(csx - 128))
+                cur = best.get(om)
+                if cur is None or rank < cur[0]:
+                    best[om] = (rank, (csx, csy))
+        oms = sorted(best)
+        _OMEGA_CHOICES = (oms, [best[om][1] for om in oms])
+        n = len(oms)
+        idx = {round(i * (n - 1) / (_PLAN_LEVELS - 1)) for i in range(_PLAN_LEVELS)} if n > 1 else {0}
+        idx.add(min(range(n), key=lambda i: abs(oms[i])))
+        _OMEGA_LEVELS = [(oms[i], _OMEGA_CHOICES[1][i]) for i in sorted(idx)]
+    return _OMEGA_CHOICES or ([], [])
+
+
+def _reach_frames(d, rem, lo_om, hi_om, tol_hw, limit):
+    """Fewest frames k <= limit in which yaw can move by `rem` (mod 0x10000, +-tol) from lag d,
+    bounding frame k's reachable offsets by holding the min / max omega; None if no k <= limit."""
+    if abs(s16(rem)) <= tol_hw:
+        return 0
+    dl = dh = d
+    lo = hi = 0
+    for k in range(1, limit + 1):
+        dl = s16(dl + lo_om)
+        inc = int(dl / 2)
+        lo += inc
+        dl -= inc
+        dh = s16(dh + hi_om)
+        inc = int(dh / 2)
+        hi += inc
+        dh -= inc
+        a = lo - tol_hw
+        r = rem + -((rem - a) // 0x10000) * 0x10000     # smallest rem (mod 0x10000) >= a
+        if r <= hi + tol_hw:
+            return k
+    return None
+
+
+def _finish(d, need, oms, sticks):
+    """(miss, stick): the single-frame input whose yaw gain from lag d lands closest to `need`."""
+    i = bisect.bisect_left(oms, 2 * need - d)
+    best = None
+    for j in (i - 1, i, i + 1):
+        if 0 <= j < len(oms):
+            miss = abs(need - int(s16(d + oms[j]) / 2))
+            if best is None or miss < best[0]:
+                best = (miss, sticks[j])
+    return best
+
+
+@lru_cache(maxsize=4096)
+def _plan_rel(d0, delta, tol_hw, max_frames):
+    """A* over (d, yaw offset) from lag d0 to a yaw offset within tol_hw of `delta`. Tuple of
+    C-stick inputs, or None if unreachable within max_frames / the node budget. Fewest frames
+    among plans whose interior frames use _OMEGA_LEVELS (the finishing frame uses the full table),
+    so a plan needing fine interior omegas may come out a frame long, or None near max_frames."""
+    import heapq
+    oms, sticks = _omega_choices()
+    if not oms:
+        return None
+    lo_om, hi_om = oms[0], oms[-1]
+    h0 = _reach_frames(d0, delta, lo_om, hi_om, tol_hw, max_frames)
+    if h0 is None:
+        return None
+    if h0 == 0:
+        return ()
+    # heap of (f, -g, tie, g, d, off, path): f = frames so far + heuristic; deeper first on ties.
+    heap = [(h0, 0, 0, 0, d0, 0, ())]
+    seen = {(d0, 0): 0}
+    nodes = 0
+    while heap:
+        _f, _ng, _t, g, d, off, path = heapq.heappop(heap)
+        if g >= max_frames:
+            continue
+        miss, stick = _finish(d, s16(delta - off), oms, sticks)
+        if miss <= tol_hw:
+            return path + (stick,)
+        if g + 1 >= max_frames:
+            continue
+        for om, stick in _OMEGA_LEVELS:
+            d1 = s16(d + om)
+            inc = int(d1 / 2)
+            nd, noff = d1 - inc, off + inc
+            key = (nd, noff & 0xFFFF)
+            if seen.get(key, max_frames + 1) <= g + 1:
+                continue
+            rem = s16(delta - noff)
+            h = _reach_frames(nd, rem, lo_om, hi_om, tol_hw, max_frames - g - 1)
+            if h is None:
+                continue
+            seen[key] = g + 1
+            nodes += 1
+            if nodes > _PLAN_MAX_NODES:
+                return None
+            heapq.heappush(heap, (g + 1 + h, -g - 1, nodes, g + 1, nd, noff, path + (stick,)))
+    return None
+
+
+def plan_cstick(want_csangle_hw, yaw=None, target=None, tol_hw=0x100, max_frames=30):
+    """C-stick input sequence [(csx,csy), ...] (one per frame) after which csangle is within tol_hw
+    of want_csangle_hw, from the given (or live) cam yaw/target -- shortest on the coarse omega grid
+    (see _plan_rel), not over every table entry. [] if already there, None if unreachable within
+    max_frames (or the tables/camera aren't available). Replay it with
+    csangle_trajectory_seq to get the per-frame csangles."""
+    if yaw is None or target is None:
+        st = read_cam_state()
+        if st is None:
+            return None
+        yaw, target = st
+    delta = s16((want_csangle_hw - 0x8000) - yaw)
+    plan = _plan_rel(s16(target - yaw), delta, int(tol_hw), int(max_frames))
+    return None if plan is None else list(plan)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""chart_tiles.py - mipmap tile pyramid for the ss_navigator chart backdrop.
+
+Slices a PNG (assets/great_sea_chart.png) into TILE x TILE tiles at successive half
+resolutions (L0 = source pixels, L1 = 1/2, ... down to one tile) under
+.cache/chart_tiles/<name>/, with a manifest.json stamped with the source's mtime/size. The
+navigator's ViewTransform.tile_draws then draws only the tiles intersecting the viewport at the
+level whose texels are nearest one canvas pixel, so the draw cost stays flat across zoom levels:
+zoomed out uses a few small coarse tiles, zoomed in one or two full-resolution ones.
+
+Stdlib only (zlib PNG codec for 8-bit non-interlaced RGB/RGBA -- what the chart is), so
+ss_navigator can (re)build it lazily inside Dolphin when the manifest is missing or stale.
+  python chart_tiles.py [src.png] [--tile N]
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SRC = os.path.join(_HERE, "assets", "great_sea_chart.png")
+CACHE_DIR = os.path.join(_HERE, ".cache", "chart_tiles")
+TILE = 256
+MANIFEST_VERSION = 1
+
+_PNG_SIG = b"\x89PNG\r\n\x1a\n"
+_CHANNELS = {2: 3, 6: 4}        # colour type -> bytes per pixel (8-bit only)
+
+
+# ── minimal PNG codec ───────────────────────────────────────────────
+
+def read_png(path):
+    """-> (w, h, bpp, rows) with rows a list of bytearrays (unfiltered pixel data)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:8] != _PNG_SIG:
+        raise ValueError("%s: not a PNG" % path)
+    pos, idat, w = 8, [], 0
+    while pos < len(data):
+        n, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + n]
+        pos += 12 + n
+        if kind == b"IHDR":
+            w, h, depth, ctype, _comp, _filt, interlace = struct.unpack(">IIBBBBB", body)
+            if depth != 8 or ctype not in _CHANNELS or interlace:
+                raise ValueError("%s: only 8-bit non-interlaced RGB/RGBA is supported" % path)
+            bpp = _CHANNELS[ctype]
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    if not w:
+        raise ValueError("%s: no IHDR" % path)
+    raw = zlib.decompress(b"".join(idat))
+    stride = w * bpp
+    rows, prev = [], bytearray(stride)
+    for y in range(h):
+        base = y * (stride + 1)
+        ft = raw[base]
+        cur = bytearray(raw[base + 1:base + 1 + stride])
+        if ft == 1:
+            for i in range(bpp, stride):
+                cur[i] = (cur[i] + cur[i - bpp]) & 0xFF
+        elif ft == 2:
+            for i in range(stride):
+                cur[i] = (cur[i] + prev[i]) & 0xFF
+        elif ft == 3:
+            for i in range(stride):
+                left = cur[i - bpp] if i >= bpp else 0
+                cur[i] = (cur[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ft == 4:
+            for i in range(stride):
+                a = cur[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                pr = a if (pa <= pb and pa <= pc) else (b if pb <= pc else c)
+                cur[i] = (cur[i] + pr) & 0xFF
+        rows.append(cur)
+        prev = cur
+    return w, h, bpp, rows
+
+
+def write_png(path, w, h, bpp, rows):
+    def chunk(kind, body):
+        return (struct.pack(">I", len(body)) + kind + body
+                + struct.pack(">I", zlib.crc32(kind + body) & 0xFFFFFFFF))
+    ctype = 2 if bpp == 3 else 6
+    raw = b"".join(b"\x00" + bytes(r) for r in rows)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PNG_SIG + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, ctype, 0, 0, 0))
+                + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+    os.replace(tmp, path)
+
+
+def _half(w, h, bpp, rows):
+    """2x2 box-filtered half-resolution image (odd edges repeat the last row/column)."""
+    nw, nh = (w + 1) // 2, (h + 1) // 2
+    out = []
+    for y in range(nh):
+        r0, r1 = rows[2 * y], rows[min(2 * y + 1, h - 1)]
+        o = bytearray(nw * bpp)
+        for x in range(nw):
+            i0 = 2 * x * bpp
+            i1 = min(2 * x + 1, w - 1) * bpp
+            for c in range(bpp):
+                o[x * bpp + c] = (r0[i0 + c] + r0[i1 + c] + r1[i0 + c] + r1[i1 + c] + 2) >> 2
+        out.append(o)
+    return nw, nh, out
+
+
+# ── pyramid build / load ────────────────────────────────────────────
+
+def _out_dir(src):
+    return os.path.join(CACHE_DIR, os.path.splitext(os.path.basename(src))[0])
+
+
+def _stamp(src):
+    st = os.stat(src)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def tile_path(pyr, level, tx, ty):
+    return "%s/L%d_%d_%d.png" % (pyr["dir"], level, tx, ty)
+
+
+def build(src=DEFAULT_SRC, tile=TILE):
+    """Slice `src` into the pyramid and write its manifest. Returns the manifest dict."""
+    out = _out_dir(src)
+    os.makedirs(out, exist_ok=True)
+    w, h, bpp, rows = read_png(src)
+    pyr = {"version": MANIFEST_VERSION, "source": _stamp(src), "img_w": w, "img_h": h,
+           "tile": tile, "dir": out.replace("\\", "/"), "levels": []}
+    lw, lh, lrows = w, h, rows
+    while True:
+        cols, nrows = -(-lw // tile), -(-lh // tile)
+        level = len(pyr["levels"])
+        for ty in range(nrows):
+            for tx in range(cols):
+                x0, y0 = tx * tile, ty * tile
+                tw, th = min(tile, lw - x0), min(tile, lh - y0)
+                trows = [lrows[y][x0 * bpp:(x0 + tw) * bpp] for y in range(y0, y0 + th)]
+                write_png(tile_path(pyr, level, tx, ty), tw, th, bpp, trows)
+        pyr["levels"].append({"w": lw, "h": lh, "cols": cols, "rows": nrows})
+        if cols == 1 and nrows == 1:
+            break
+        lw, lh, lrows = _half(lw, lh, bpp, lrows)
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(pyr, f, indent=1)
+    return pyr
+
+
+def load(src=DEFAULT_SRC, tile=TILE):
+    """The manifest if it is current for `src` (same stamp and tile size), else None."""
+    try:
+        with open(os.path.join(_out_dir(src), "manifest.json")) as f:
+            pyr = json.load(f)
+        if (pyr.get("version") != MANIFEST_VERSION or pyr.get("tile") != tile
+                or pyr.get("source") != _stamp(src)):
+            return None
+    except (OSError, ValueError):
+        return None
+    return pyr
+
+
+def ensure(src=DEFAULT_SRC, tile=TILE):
+    """load(), rebuilding when missing/stale. None if the source can't be sliced."""
+    pyr = load(src, tile)
+    if pyr is None:
+        try:
+            pyr = build(src, tile)
+        except (OSError, ValueError, zlib.error) as e:
+            print("[chart_tiles] %s" % e)
+            return None
+    return pyr
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    tile = TILE
+    if "--tile" in argv:
+        k = argv.index("--tile")
+        tile = int(argv[k + 1])
+        del argv[k:k + 2]
+    src = argv[0] if argv else DEFAULT_SRC
+    pyr = build(src, tile)
+    for i, lv in enumerate(pyr["levels"]):
+        print("L%d  %4dx%-4d  %dx%d tiles" % (i, lv["w"], lv["h"], lv["cols"], lv["rows"]))
+    print("-> %s" % pyr["dir"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+collision_bench.py — host-side benchmark for ww.collision_geo mesh decoding.
+
+Times decode_mesh_tables on the pure-struct path vs the NumPy path over one DZB and checks that
+both produce identical verts / tris / centroids / classes. The DZB is either a file extracted from
+a stage archive (Room*.dzb / *.dzb; the header's table pointers are file offsets there) or, with
+no argument, a synthetic large room (a bumpy heightfield with walls, ~31k triangles).
+
+No recorded room ships with the repo: to benchmark a real one, extract its DZB from the stage
+archive and pass it as `collision_bench.py <room.dzb>`.
+
+Examples
+--------
+  python collision_bench.py                    # synthetic room (30,998 tris)
+  python collision_bench.py Room0.dzb -n 10    # recorded DZB, best of 10
+"""
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+import struct
+import sys
+import time
+
+# Load ww/collision_geo.py directly (not `from ww import collision_geo`): the ww package
+# __init__ imports `dolphin`, which only exists inside the emulator runtime.
+_GEO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ww", "collision_geo.py")
+_spec = importlib.util.spec_from_file_location("ww_collision_geo", _GEO_PATH)
+geo = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(geo)
+
+
+def load_dzb(path):
+    """(vbytes, tbytes, v_num, t_num) from a DZB file (cBgD_t header, file-relative offsets)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    v_num, v_off, t_num, t_off = struct.unpack_from(">iIiI", data, 0)
+    return data[v_off:v_off + v_num * 12], data[t_off:t_off + t_num * 10], v_num, t_num
+
+
+def synthetic_room(n=125):
+    """An n x n heightfield (2*(n-1)^2 tris) plus a ring of vertical walls and an overhang roof."""
+    verts, tris = [], []
+    for i in range(n):
+        for j in range(n):
+            verts.append((i * 100.0, 80.0 * math.sin(i * 0.31) * math.cos(j * 0.17), j * 100.0))
+    for i in range(n - 1):
+        for j in range(n - 1):
+            a = i * n + j
+            tris.append((a, a + 1, a + n, 0, 0))
+            tris.append((a + 1, a + n + 1, a + n, 0, 0))
+    base = len(verts)
+    for k in range(n - 1):                   # wall along x = 0
+        verts += [(0.0, 0.0, k * 100.0), (0.0, 500.0, k * 100.0)]
+    for k in range(n - 2):
+        a = base + 2 * k
+        tris.append((a, a + 2, a + 1, 1, 0))
+        tris.append((a + 1, a + 2, a + 3, 1, 0))
+    vbytes = b"".join(struct.pack(">3f", *v) for v in verts)
+    tbytes = b"".join(struct.pack(">5H", *t) for t in tris)
+    return vbytes, tbytes, len(verts), len(tris)
+
+
+def _best(fn, n):
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    reps = 5
+    if "-n" in argv:
+        k = argv.index("-n")
+        reps = int(argv[k + 1])
+        del argv[k:k + 2]
+    vbytes, tbytes, v_num, t_num = load_dzb(argv[0]) if argv else synthetic_room()
+    print("%s: %d verts, %d tris" % (argv[0] if argv else "synthetic", v_num, t_num))
+
+    t_py, out_py = _best(lambda: geo.decode_mesh_tables(vbytes, tbytes, v_num, t_num, False), reps)
+    print("  pure   %8.1f ms" % (t_py * 1e3))
+    if geo.np is None:
+        print("  numpy  (not installed)")
+        return 0
+    t_np, out_np = _best(lambda: geo.decode_mesh_tables(vbytes, tbytes, v_num, t_num, True), reps)
+    same = out_py == out_np
+    print("  numpy  %8.1f ms   x%.1f   identical=%s" % (t_np * 1e3, t_py / t_np, same))
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
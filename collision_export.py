@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""collision_export.py - stream ww.collision_geo snapshots to disk for external tools.
+
+Three writers over a read_collision() snapshot (every mesh, world-space verts):
+  .wwcol  compact little-endian container, lossless for verts / DZB triangle rows, plus one flag
+          byte per triangle; read_wwcol() loads it back as a snapshot-shaped dict (verts / tris /
+          classes per mesh), so ww.collision_geo.CollisionQuery and diff() run on it offline,
+  .obj    one object per mesh, faces grouped by class (usemtl ground / wall / roof),
+  .ply    binary little-endian; per-face class, flags and manager slot as extra properties.
+All three stream mesh by mesh in CHUNK-sized blocks straight from the decoded lists (array /
+struct packing, and a single %-format per text block for OBJ), so memory stays bounded by one
+chunk and a full stage writes in a fraction of a second.
+
+.wwcol layout (little-endian):
+  file   "<4sHH16sii"  magic b"WWCS", version, mesh count, stage (NUL-padded), floor bg / poly (-1)
+  mesh   "<HBxII"      manager slot, flags (1 = GLOBAL static, 2 = MOVE_BG), v_num, t_num
+         v_num x 3 f32 world vertices
+         t_num x 5 u16 DZB triangle rows (vtx0, vtx1, vtx2, id, grp)
+         t_num x u8    triangle flags: class (0 wall / 1 ground / 2 roof) | 0x10 Link's floor
+                       | 0x20 movable BG
+
+No `dolphin` imports (collision_viewer's "Export snapshot" button calls export(); everything else
+runs offline):
+  python collision_export.py info  snap.wwcol
+  python collision_export.py obj   snap.wwcol [out.obj]     (also: ply)
+  python collision_export.py diff  a.wwcol b.wwcol          (e.g. two game versions / revisions)
+"""
+import itertools
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"WWCS"
+VERSION = 1
+CHUNK = 8192                     # triangles / vertices per streamed block
+
+_FILE_HDR = struct.Struct("<4sHH16sii")
+_MESH_HDR = struct.Struct("<HBxII")
+MESH_GLOBAL, MESH_MOVE_BG = 0x01, 0x02
+TRI_FLOOR, TRI_MOVE_BG = 0x10, 0x20
+CLASS_CODES = {"wall": 0, "ground": 1, "roof": 2}
+CLASS_NAMES = ("wall", "ground", "roof")
+_BIG = sys.byteorder == "big"
+
+
+def _le(arr):
+    """array -> little-endian bytes."""
+    if _BIG:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _meshes(snap):
+    return sorted(snap["meshes"].items())
+
+
+def _tri_flags(slot, m, floor):
+    """One flag byte per triangle: class code | floor / movable-BG bits."""
+    codes = bytes(map(CLASS_CODES.__getitem__, m["classes"]))
+    if m.get("is_movebg"):
+        codes = codes.translate(bytes((i | TRI_MOVE_BG) & 0xFF for i in range(256)))
+    if floor is not None and floor[0] == slot and 0 <= floor[1] < len(codes):
+        codes = bytearray(codes)
+        codes[floor[1]] |= TRI_FLOOR
+    return codes
+
+
+# ── writers ─────────────────────────────────────────────────────────
+
+def write_wwcol(snap, path):
+    floor = snap.get("floor")
+    fb, fp = floor if floor is not None else (-1, -1)
+    meshes = _meshes(snap)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_FILE_HDR.pack(MAGIC, VERSION, len(meshes),
+                               snap.get("stage", "").encode("ascii", "replace")[:16], fb, fp))
+        for slot, m in meshes:
+            verts, tris = m["verts"], m["tris"]
+            flags = (MESH_GLOBAL if m.get("is_global") else 0) | (MESH_MOVE_BG if m.get("is_movebg") else 0)
+            f.write(_MESH_HDR.pack(slot, flags, len(verts), len(tris)))
+            for i in range(0, len(verts), CHUNK):
+                f.write(_le(array("f", itertools.chain.from_iterable(verts[i:i + CHUNK]))))
+            for i in range(0, len(tris), CHUNK):
+                f.write(_le(array("H", itertools.chain.from_iterable(tris[i:i + CHUNK]))))
+            f.write(_tri_flags(slot, m, floor))
+    os.replace(tmp, path)
+
+
+def write_obj(snap, path):
+    floor = snap.get("floor")
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="\n") as f:
+        f.write("# stage %s  floor %s\n" % (snap.get("stage", ""), floor))
+        base = 1                                  # OBJ indices are 1-based and file-global
+        for slot, m in _meshes(snap):
+            verts, tris, classes = m["verts"], m["tris"], m["classes"]
+            f.write("o slot%d%s\n" % (slot, "_movebg" if m.get("is_movebg") else ""))
+            for i in range(0, len(verts), CHUNK):
+                part = verts[i:i + CHUNK]
+                f.write(("v %r %r %r\n" * len(part)) % tuple(itertools.chain.from_iterable(part)))
+            for cls in CLASS_NAMES:
+                sel = [t for t, c in zip(tris, classes) if c == cls]
+                if not sel:
+                    continue
+                f.write("usemtl %s\n" % cls)
+                for i in range(0, len(sel), CHUNK):
+                    part = sel[i:i + CHUNK]
+                    f.write(("f %d %d %d\n" * len(part))
+                            % tuple(v + base for t in part for v in t[:3]))
+            base += len(verts)
+    os.replace(tmp, path)
+
+
+def write_ply(snap, path):
+    floor = snap.get("floor")
+    meshes = _meshes(snap)
+    n_v = sum(len(m["verts"]) for _s, m in meshes)
+    n_t = sum(len(m["tris"]) for _s, m in meshes)
+    header = ("ply\nformat binary_little_endian 1.0\ncomment stage %s\n"
+              "element vertex %d\nproperty float x\nproperty float y\nproperty float z\n"
+              "element face %d\nproperty list uchar int vertex_indices\n"
+              "property uchar class\nproperty uchar flags\nproperty ushort slot\nend_header\n"
+              % (snap.get("stage", ""), n_v, n_t))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header.encode("ascii"))
+        for _slot, m in meshes:
+            verts = m["verts"]
+            for i in range(0, len(verts), CHUNK):
+                f.write(_le(array("f", itertools.chain.from_iterable(verts[i:i + CHUNK]))))
+        base = 0
+        for slot, m in meshes:
+            tris = m["tris"]
+            fl = _tri_flags(slot, m, floor)
+            for i in range(0, len(tris), CHUNK):
+                part = tris[i:i + CHUNK]
+                rec = struct.Struct("<" + "B3iBBH" * len(part))
+                f.write(rec.pack(*itertools.chain.from_iterable(
+                    (3, t[0] + base, t[1] + base, t[2] + base, fl[i + k] & 0x0F, fl[i + k] & 0xF0, slot)
+                    for k, t in enumerate(part))))
+            base += len(m["verts"])
+    os.replace(tmp, path)
+
+
+def export(snap, stem, formats=("wwcol", "obj", "ply")):
+    """Write `snap` as <stem>.<fmt> for each format. Returns the paths written."""
+    writers = {"wwcol": write_wwcol, "obj": write_obj, "ply": write_ply}
+    d = os.path.dirname(stem)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    out = []
+    for fmt in formats:
+        p = "%s.%s" % (stem, fmt)
+        writers[fmt](snap, p)
+        out.append(p)
+    return out
+
+
+# ── reader / diff ───────────────────────────────────────────────────
+
+def read_wwcol(path):
+    """Load a .wwcol back as {"stage", "floor", "meshes": {slot: mesh}}; each mesh has verts /
+    tris (lists of tuples), classes, is_global / is_movebg, v_num / t_num and the raw tri_flags."""
+    with open(path, "rb") as f:
+        magic, ver, n, stage, fb, fp = _FILE_HDR.unpack(f.read(_FILE_HDR.size))
+        if magic != MAGIC or ver != VERSION:
+            raise ValueError("%s: not a v%d .wwcol file" % (path, VERSION))
+        meshes = {}
+        for _ in range(n):
+            slot, flags, v_num, t_num = _MESH_HDR.unpack(f.read(_MESH_HDR.size))
+            vb = f.read(v_num * 12)
+            tb = f.read(t_num * 10)
+            fl = f.read(t_num)
+            meshes[slot] = {
+                "is_global": bool(flags & MESH_GLOBAL), "is_movebg": bool(flags & MESH_MOVE_BG),
+                "v_num": v_num, "t_num": t_num,
+                "verts": list(struct.iter_unpack("<3f", vb)),
+                "tris": list(struct.iter_unpack("<5H", tb)),
+                "classes": [CLASS_NAMES[c & 0x0F] for c in fl],
+                "tri_flags": fl,
+            }
+    return {"stage": stage.rstrip(b"\0").decode("ascii", "replace"),
+            "floor": (fb, fp) if fb >= 0 else None, "meshes": meshes}
+
+
+def diff(a, b, tol=1e-3):
+    """Per-slot differences between two snapshots: [(slot, what), ...]. Meshes are compared by
+    counts, triangle rows, classes and vertex positions (within `tol`)."""
+    out = []
+    ma, mb = a["meshes"], b["meshes"]
+    for slot in sorted(set(ma) | set(mb)):
+        x, y = ma.get(slot), mb.get(slot)
+        if x is None or y is None:
+            out.append((slot, "only in %s" % ("b" if x is None else "a")))
+            continue
+        if len(x["verts"]) != len(y["verts"]) or len(x["tris"]) != len(y["tris"]):
+            out.append((slot, "counts %d/%d verts, %d/%d tris"
+                        % (len(x["verts"]), len(y["verts"]), len(x["tris"]), len(y["tris"]))))
+            continue
+        moved = sum(1 for p, q in zip(x["verts"], y["verts"])
+                    if abs(p[0] - q[0]) > tol or abs(p[1] - q[1]) > tol or abs(p[2] - q[2]) > tol)
+        rows = sum(1 for p, q in zip(x["tris"], y["tris"]) if p != q)
+        cls = sum(1 for p, q in zip(x["classes"], y["classes"]) if p != q)
+        if moved or rows or cls:
+            out.append((slot, "%d verts moved, %d tri rows differ, %d classes differ"
+                        % (moved, rows, cls)))
+    return out
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if len(argv) < 2 or argv[0] not in ("info", "obj", "ply", "diff"):
+        print(__doc__)
+        return 2
+    cmd = argv[0]
+    if cmd == "diff":
+        if len(argv) < 3:
+            print(__doc__)
+            return 2
+        d = diff(read_wwcol(argv[1]), read_wwcol(argv[2]))
+        for slot, what in d:
+            print("slot %3d  %s" % (slot, what))
+        print("%d differing meshes" % len(d))
+        return 1 if d else 0
+    snap = read_wwcol(argv[1])
+    if cmd == "info":
+        print("stage %s  floor %s  %d meshes" % (snap["stage"], snap["floor"], len(snap["meshes"])))
+        for slot, m in sorted(snap["meshes"].items()):
+            print("slot %3d  %6d verts %6d tris%s" % (slot, m["v_num"], m["t_num"],
+                                                     "  movebg" if m["is_movebg"] else ""))
+        return 0
+    out = argv[2] if len(argv) > 2 else os.path.splitext(argv[1])[0] + "." + cmd
+    (write_obj if cmd == "obj" else write_ply)(snap, out)
+    print("-> %s" % out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
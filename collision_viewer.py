@@ -14,27 +14,43 @@ triangle it reports matches dBgS_LinkAcch's current ground poly. See knowledge/m
 Sibling to cull_viewer.py — reuses the same OrbitCam / mouse-orbit-pan-zoom scaffold. Since the
 canvas has no depth buffer, filled triangles are drawn back-to-front (painter's algorithm) with
 translucent fills; a distance filter around the orbit target keeps the drawn triangle count (and
-frame time) bounded on large rooms.
+frame time) bounded on large rooms, and triangles outside the orbit camera's view are culled before
+that budget is spent.
 
 Controls (mouse, over the canvas):
   Left-drag = ORBIT, right-drag = PAN (grab-toggle: click to grab, move, click to release). The
   "Pan mode" checkbox makes LEFT-drag pan too. Mouse wheel zooms. "Reset view" recenters.
-  Checkboxes toggle ground/wall/roof, filled vs wireframe, Follow-Link. The Radius slider limits
-  how far from the orbit target triangles are drawn (0 = no limit).
+  Checkboxes toggle ground/wall/roof, filled vs wireframe, Follow-Link, and Far LOD (distant room
+  geometry drawn from coarser, decimated copies so the whole room fits the triangle budget). The
+  Radius slider limits how far from the orbit target triangles are drawn (0 = no limit). "Export
+  snapshot" writes the current collision to .cache/collision_export/ as .wwcol / .obj / .ply
+  (collision_export.py).
 
 STABILITY: all work (memory read, input, draw) happens on the SINGLE on_frameadvance thread — no
 on_hostupdate (a second host-thread tick that crashed the core in this build). The view updates
 while the game is RUNNING; a full pause freezes it until the next frame advances.
 """
-import csv
+import bisect
 import heapq
 import math
 import os
 import struct
+import time
+from array import array
+from itertools import chain, compress
+
+try:
+    import numpy as np
+except ImportError:      # Dolphin's embedded Python usually lacks it; the per-triangle path covers it
+    np = None
 
 from dolphin import gui, event, memory
 
-from ww.collision_geo import read_collision
+from ww.collision_geo import mesh_lods, read_collision
+from ww.draw_budget import BudgetCanvas, DrawBudget, VERTS
+import seam_finder
+import seam_index
+import collision_export
 
 
 class DolphinReader:
@@ -48,17 +64,30 @@ LINK_X = 0x803D78FC   # three consecutive f32: X, Y, Z
 FACING = 0x803EA3D2   # u16 heading (0x10000 = 360deg). 0=north(-Z), 16384=east(+X), 49152=west(-X)
 # Player-cone dimensions (world units): apex(nose) forward, base back, base radius, lift, segments.
 CONE_NOSE, CONE_BACK, CONE_RADIUS, CONE_LIFT, CONE_SEGS = 70.0, 30.0, 31.0, 28.0, 16
-# HARD per-frame triangle cap — the canvas builds ONE ImGui draw list with 16-bit indices (65535
+# Per-frame triangle cap — the canvas builds ONE ImGui draw list with 16-bit indices (65535
 # vertex ceiling); filled + wireframe over a whole room can overrun it and CRASH the core. We draw
-# only the nearest N tris (see draw()); wireframe (line-quads) costs far more verts, so its cap is
-# lower. Keep well under the ceiling.
-MAX_DRAW_WIRE = 1100
-MAX_DRAW_FILL = 3200
+# only the nearest N tris (see draw()), with N set frame to frame by ww.draw_budget: it aims the
+# draw time at DRAW_TARGET_MS and keeps N x (a triangle's worst-case vertices) plus the HUD under
+# the ceiling (wireframe line-quads cost far more verts than fills, so N drops with Wireframe on).
+DRAW_TARGET_MS = 16.0
+DRAW_CAP = (1100, 100, 20000)    # start, floor, ceiling of N
+# Project the drawn set with one NumPy matrix multiply + argsort instead of per-vertex dot products
+# (set False to force the pure path, e.g. to compare).
+USE_NUMPY = np is not None
+CULL_BLOCK = 4         # frustum culling tests TriGrid cells in CULL_BLOCK^3 blocks before single cells
+# Far static geometry comes from ww.collision_geo.mesh_lods' coarser copies: a level takes over at
+# the distance from Link where its cluster cell shrinks to LOD_PIXELS on screen. When that still
+# overflows the cap, all bands are pulled in (by LOD_STEP, up to LOD_STEPS times) before the
+# nearest-`cap` cut applies, so the whole room stays on screen at a coarser grain.
+LOD_PIXELS = 12.0
+LOD_STEP, LOD_STEPS = 0.5 ** 0.5, 12
+_NO_LIMIT = 1.0e9      # "whole mesh" radius for the coarsest LOD band
+_lod = {"step": 0}     # last frame's band scale (LOD_STEP ** step); a frame starts one step wider
 
 # --- window / canvas / controls ------------------------------------------------------------
 W, H = 860, 560
 panel = gui.window("TWW Collision Viewer")
-cv = panel.canvas(W, H)
+cv = BudgetCanvas(panel.canvas(W, H))     # counts emitted vertices for _budget
 cb_panmode = panel.checkbox("Pan mode (drag pans)", False)
 cb_follow = panel.checkbox("Follow Link", True)
 cb_ground = panel.checkbox("Ground", True)
@@ -67,9 +96,12 @@ cb_roof = panel.checkbox("Roofs", False)
 cb_filled = panel.checkbox("Filled (painter)", True)
 cb_wire = panel.checkbox("Wireframe", True)
 cb_movebg = panel.checkbox("Movable BG", True)
+cb_lod = panel.checkbox("Far LOD", True)
 sld_radius = panel.slider_float("Draw radius", 0.0, 12000.0)
 btn_reset = panel.button("Reset view")
+btn_export = panel.button("Export snapshot")
 status = panel.text("")
+_budget = DrawBudget(cv, {"tri": DRAW_CAP}, DRAW_TARGET_MS)
 
 # view state, driven by mouse (all polled in on_frameadvance):
 _VIEW0 = {"az": 40.0, "el": 30.0, "zoom": 0.0}
@@ -102,11 +134,15 @@ _SHOW = {"ground": cb_ground, "wall": cb_wall, "roof": cb_roof}
 # tww_sim/harness/collision/export_seam_csv.py -> ww/data/seam_clips/<stage>/Room<N>__room.csv).
 # When "Show Seam Clips (N)" is on, each seam is a clickable dot in the 3D view; clicking one reveals
 # "Initial Position" / "Clip Position" buttons that teleport Link (clean-placement vs raw debug-xyz).
+# The CSVs are read through seam_index's packed, memory-mapped index (compiled into .cache/ on first
+# use), so a room change is a lookup, not a directory listing + CSV parse. Rooms without a CSV fall
+# back to seam_finder's geometric candidates over the live meshes.
 ROOM_NO_ADDR = 0x803E9F48       # u8 current room number
 PLAYER_PTR   = 0x803AD860       # [ptr] -> daPy_lk_c; the two cXyz pos triples are at +0x10c and +0x120
 POS_OFFS     = (0x10C, 0x120)
-ROLL_STAB_MAX = 49.2202
 _SEAM_DIR = os.path.join(os.path.dirname(__file__), "ww", "data", "seam_clips")
+# "Export snapshot" writes the current snapshot here as .wwcol / .obj / .ply (see collision_export).
+_EXPORT_DIR = os.path.join(os.path.dirname(__file__), ".cache", "collision_export")
 
 C_CLIP_RS    = 0xFF4CE07A       # roll-stab-reachable seam dot (green)
 C_CLIP_PUSH  = 0xFFFFA83C       # needs-push seam dot (amber)
@@ -132,7 +168,13 @@ CHK_TX, CHK_TY = 21.0, 12.0
 INFO_X, INFO_Y = 12.0, 85.0
 
 _seam = {"stage": None, "room": None, "clips": [], "on": False, "sel": None,
-         "dots": [], "cb_rect": None, "btn": {}}
+         "pick": {}, "cb_rect": None, "btn": {}, "pending": False}
+# Seams found live (rooms with no shipped CSV), per (stage, room, mesh key): seam_finder runs only
+# once the overlay is on, and once per room layout.
+_seam_found = {}
+_seam_idx = [None]              # seam_index.SeamIndex once opened (False if it can't be built)
+PICK_PX = 13                    # a click selects the nearest seam dot within this many pixels;
+                                # dots are bucketed in PICK_PX cells, so a click reads 3x3 cells
 
 
 def _room_no():
@@ -143,31 +185,21 @@ def _room_no():
 
 
 def _load_clips(stage, room):
-    """Load the current room's clippable seams. Falls back to the stage's only room CSV when the
-    exact Room<N> file is absent (single-room stages / boss arenas whose room id differs)."""
-    sdir = os.path.join(_SEAM_DIR, stage)
-    if not os.path.isdir(sdir):
-        return []
-    path = os.path.join(sdir, "Room%d__room.csv" % room)
-    if not os.path.exists(path):
-        rooms = [f for f in os.listdir(sdir) if f.endswith("__room.csv")]
-        if len(rooms) == 1:
-            path = os.path.join(sdir, rooms[0])
-        else:
-            return []
-    out = []
-    try:
-        with open(path, newline="") as f:
-            for row in csv.DictReader(f):
-                old = (float(row["init_x"]), float(row["init_y"]), float(row["init_z"]))
-                new = (float(row["dest_x"]), float(row["dest_y"]), float(row["dest_z"]))
-                disp = math.sqrt(sum((a - b) ** 2 for a, b in zip(old, new)))
-                out.append({"S": (float(row["seam_x"]), float(row["seam_y"]), float(row["seam_z"])),
-                            "old": old, "new": new, "ang": float(row["angle_deg"]),
-                            "rollstab": disp <= ROLL_STAB_MAX})
-    except Exception:
-        return []
-    return out
+    """Load the current room's clippable seams from the seam index. Falls back to the stage's only
+    room CSV when the exact Room<N> one is absent (single-room stages / boss arenas whose room id
+    differs)."""
+    if _seam_idx[0] is None:
+        _seam_idx[0] = seam_index.load(_SEAM_DIR) or False
+    return _seam_idx[0].room(stage, room) if _seam_idx[0] else []
+
+
+def _clip_from_row(row):
+    """One Room<N>__room.csv row (or seam_finder row) -> the overlay's clip dict."""
+    old = (float(row["init_x"]), float(row["init_y"]), float(row["init_z"]))
+    new = (float(row["dest_x"]), float(row["dest_y"]), float(row["dest_z"]))
+    return {"S": (float(row["seam_x"]), float(row["seam_y"]), float(row["seam_z"])),
+            "old": old, "new": new, "ang": float(row["angle_deg"]),
+            "rollstab": seam_index.rollstab(old, new)}
 
 
 def _write_pos(addr, p):
@@ -209,11 +241,15 @@ def _seam_click(pt):
         if _in(_seam["btn"].get("clip"), x, y):
             _tp_clip(clip["new"]); return True
     if _seam["on"]:
-        best, bd = None, 13 * 13                          # pick the nearest dot within ~13 px
-        for i, sx, sy in _seam["dots"]:
-            d = (sx - x) ** 2 + (sy - y) ** 2
-            if d < bd:
-                bd, best = d, i
+        best, bd = None, PICK_PX * PICK_PX                # pick the nearest dot within PICK_PX
+        gx, gy = int(x // PICK_PX), int(y // PICK_PX)
+        pick = _seam["pick"]
+        for kx in (gx - 1, gx, gx + 1):
+            for ky in (gy - 1, gy, gy + 1):
+                for i, sx, sy in pick.get((kx, ky), ()):
+                    d = (sx - x) ** 2 + (sy - y) ** 2
+                    if d < bd:
+                        bd, best = d, i
         if best is not None:
             _seam["sel"] = best
             return True
@@ -239,13 +275,18 @@ def _draw_seam_ui(oc):
     """Draw clickable seam dots (when enabled) + the HUD row (checkbox, and, once a seam is selected,
     the two teleport buttons to its right). Hit-rects are stashed in ``_seam`` for :func:`_seam_click`."""
     clips = _seam["clips"]
-    _seam["dots"] = []
+    pick = _seam["pick"] = {}                             # (x, y) // PICK_PX -> [(i, sx, sy)]
     if _seam["on"]:
         for i, c in enumerate(clips):
             sp = oc.screen(oc.cam(c["S"]))
             if not sp or not (0 <= sp[0] <= W and 0 <= sp[1] <= H):
                 continue
-            _seam["dots"].append((i, sp[0], sp[1]))
+            k = (int(sp[0] // PICK_PX), int(sp[1] // PICK_PX))
+            b = pick.get(k)
+            if b is None:
+                pick[k] = [(i, sp[0], sp[1])]
+            else:
+                b.append((i, sp[0], sp[1]))
             col = C_CLIP_RS if c["rollstab"] else C_CLIP_PUSH
             sel = (i == _seam["sel"])
             r = 6 if sel else 4
@@ -258,7 +299,7 @@ def _draw_seam_ui(oc):
     # the selected-seam info line (position via INFO_*) when a seam dot is selected.
     n = len(clips)
     bx, by, bs = CHK_X, CHK_Y, CHK_BOX
-    label = "Show Seam Clips (%d)" % n
+    label = "Show Seam Clips (%s)" % ("?" if _seam["pending"] else n)
     lw = 8 + bs + 6 + 7 * len(label)
     cv.rect_filled((bx - 6, by - 6), (bx - 6 + lw + 8, by + bs + 8), C_HUD_BG)
     cv.rect_filled((bx, by), (bx + bs, by + bs), 0xFF20242E)
@@ -304,6 +345,8 @@ class OrbitCam:
         self.right, self.up, self.fwd = _orbit_basis(az, el)
         self.pos = (target[0]-self.fwd[0]*dist, target[1]-self.fwd[1]*dist, target[2]-self.fwd[2]*dist)
         self.focal = _FOCAL
+        self._kx = math.hypot(self.focal, W * 0.5)      # side-plane normal lengths (sphere_vis)
+        self._ky = math.hypot(self.focal, H * 0.5)
 
     def cam(self, w):
         rel = _sub(w, self.pos)
@@ -314,6 +357,24 @@ class OrbitCam:
             return None
         return (W*0.5 + self.focal * c[0]/c[2], H*0.5 - self.focal * c[1]/c[2])
 
+    def sphere_vis(self, w, r):
+        """World sphere (center w, radius r) against the view frustum (near plane + the four canvas
+        edges; no far plane): 0 = outside, 1 = straddling, 2 = fully inside."""
+        px, py, pz = w[0] - self.pos[0], w[1] - self.pos[1], w[2] - self.pos[2]
+        f = self.fwd
+        z = px*f[0] + py*f[1] + pz*f[2]
+        if z + r < self.NEAR:
+            return 0
+        rt, up = self.right, self.up
+        ex = abs(px*rt[0] + py*rt[1] + pz*rt[2]) * self.focal - z * W * 0.5   # > 0: center beyond
+        ey = abs(px*up[0] + py*up[1] + pz*up[2]) * self.focal - z * H * 0.5   # a side plane
+        rx, ry = r * self._kx, r * self._ky
+        if ex > rx or ey > ry:
+            return 0
+        if z - r >= self.NEAR and ex <= -rx and ey <= -ry:
+            return 2
+        return 1
+
 
 def _dist():
     return max(150.0, min(90000.0, _BASE_DIST * (0.85 ** _view["zoom"])))
@@ -373,28 +434,131 @@ _last = [None]         # last (snap, link) for redraw
 _diag = [False]
 
 
-def _collect_tris(snap, link, radius, cap):
+class _CullBounds:
+    """Bounding spheres of one mesh's triangles for frustum culling. Built once per mesh dict and kept
+    in m["cull"], so read_collision's cache keeps it as long as the mesh is reused. With a TriGrid
+    the spheres are also rolled up per grid cell (a few triangles each, with per-class counts) and
+    per CULL_BLOCK^3 block of cells, so cell_states() settles whole blocks and only tests cells on
+    the view's edge; a gridded mesh is culled at cell granularity (an edge cell's triangles all
+    count as in view), the rest per triangle."""
+
+    def __init__(self, m):
+        verts, cents = m["verts"], m["centroids"]
+        rad = []
+        for (a, b, c, _id, _grp), cen in zip(m["tris"], cents):
+            cx, cy, cz = cen
+            r2 = 0.0
+            for v in (verts[a], verts[b], verts[c]):
+                d2 = (v[0]-cx)*(v[0]-cx) + (v[1]-cy)*(v[1]-cy) + (v[2]-cz)*(v[2]-cz)
+                if d2 > r2:
+                    r2 = d2
+            rad.append(math.sqrt(r2))
+        self.rad = rad
+        self.blocks = None
+        grid = m.get("grid")
+        if grid is None or not grid.cells:
+            return
+        clss = m["classes"]
+        s, B = grid.cell, CULL_BLOCK
+        half = s * 0.5 * math.sqrt(3.0)                 # cell center -> corner
+        n_cells = len(grid.cells)
+        self.cells = []                                 # (center, radius) per cell
+        self.cell_of = array("i", bytes(4 * len(rad)))
+        self.counts = {}                                # class -> per-cell triangle counts
+        groups = {}
+        for k, bucket in grid.cells.items():
+            ci = len(self.cells)
+            c = ((k[0] + 0.5) * s, (k[1] + 0.5) * s, (k[2] + 0.5) * s)
+            self.cells.append((c, half + max(rad[i] for i in bucket)))
+            for i in bucket:
+                self.cell_of[i] = ci
+                cnt = self.counts.get(clss[i])
+                if cnt is None:
+                    cnt = self.counts[clss[i]] = array("i", bytes(4 * n_cells))
+                cnt[ci] += 1
+            groups.setdefault((k[0] // B, k[1] // B, k[2] // B), []).append(ci)
+        self.blocks = []
+        for bk, cis in groups.items():
+            bc = ((bk[0] + 0.5) * B * s, (bk[1] + 0.5) * B * s, (bk[2] + 0.5) * B * s)
+            br = max(math.dist(bc, self.cells[ci][0]) + self.cells[ci][1] for ci in cis)
+            self.blocks.append((bc, br, cis))
+
+    def cell_states(self, oc):
+        """Per-cell OrbitCam.sphere_vis verdicts (0 out / 1 edge / 2 in) for a gridded mesh."""
+        test, cells = oc.sphere_vis, self.cells
+        state = bytearray(len(cells))
+        for bc, br, cis in self.blocks:
+            v = test(bc, br)
+            if v == 2:
+                for ci in cis:
+                    state[ci] = 2
+            elif v:
+                for ci in cis:
+                    state[ci] = test(*cells[ci])
+        return state
+
+    def count(self, state, shown):
+        """In-view triangles of the `shown` classes under cell_states()."""
+        return sum(sum(compress(self.counts[c], state)) for c in shown if c in self.counts)
+
+
+def _cull_bounds(m):
+    cb = m.get("cull")
+    if cb is None:
+        cb = m["cull"] = _CullBounds(m)
+    return cb
+
+
+def _accept(bounds, state, clss, shown, fp):
+    """TriGrid query filter: shown class (or Link's floor `fp`) in a cell that reaches the view."""
+    if 0 not in state:
+        return lambda i: clss[i] in shown or i == fp
+    cell_of = bounds.cell_of
+    return lambda i: (clss[i] in shown or i == fp) and state[cell_of[i]]
+
+
+def _lod_reach(level):
+    """Distance from Link past which `level` (a mesh_lods entry) is fine enough to draw."""
+    return level["cell"] * _FOCAL / LOD_PIXELS
+
+
+def _collect_tris(snap, link, radius, cap, oc):
     """Gather the triangles to draw, using each mesh's CACHED per-tri centroid + class (no per-frame
-    cross-product/sqrt or classify). Movable-BG tris are always kept (few, dynamic); static-room
+    cross-product/sqrt or classify). Triangles whose bounding sphere is outside the orbit camera's
+    view (behind it / off the canvas; see _CullBounds) are dropped first, so the cap is only spent
+    on geometry that can appear. Movable-BG tris in view are always kept (few, dynamic); static-room
     tris are pre-selected to the `cap` NEAREST LINK *before* projection, so we never project the
-    whole room. Selection is purely LINK-relative (no camera term) — the drawn set is invariant to
-    orbit/pan and changes only when Link moves. Returns (tris, total_shown) with
-    tris = [(v0,v1,v2,cen,cls,is_floor,is_move), ...] (already bounded to <= cap)."""
+    whole room. Static meshes carry a TriGrid (built once when the mesh is read), so the culling
+    and the radius / nearest-`cap` selection only visit cells in view / around Link rather than
+    every triangle in the room. With "Far LOD" on, a gridded mesh is drawn in distance bands from
+    its mesh_lods levels (full detail nearest Link, coarser further out; see LOD_PIXELS), so the
+    cap covers the whole room instead of the nearest part of it. Returns
+    (tris, total_shown, clipped, n_lod) with tris = [(v0,v1,v2,cen,cls,is_floor,is_move), ...]
+    (already bounded to <= cap), total_shown the full-detail in-view count before the cap, clipped
+    how many of those no drawn triangle stands for, and n_lod how many drawn tris are coarse."""
     floor = snap.get("floor")
     r2 = radius * radius
     lx, ly, lz = link
+    shown = {c for c, cb in _SHOW.items() if cb.checked}
     movebg = []
-    static = []                    # (d2link, v0, v1, v2, cen, cls, is_floor)
+    static = []                    # (d2link, v0, v1, v2, cen, cls, is_floor, is_lod)
+    indexed = []                   # (bg, mesh) static meshes answered by their grid below
     for bg, m in snap["meshes"].items():
         is_move = m["is_movebg"]
         if is_move and not cb_movebg.checked:
             continue
+        if not is_move and m.get("grid") is not None:
+            indexed.append((bg, m))
+            continue
         verts = m["verts"]; cents = m["centroids"]; clss = m["classes"]; tris = m["tris"]
+        rad = _cull_bounds(m).rad
         floor_poly = floor[1] if (floor and floor[0] == bg) else -1
         for pi in range(len(tris)):
             cls = clss[pi]
             is_floor = (pi == floor_poly)
-            if not _SHOW[cls].checked and not is_floor:
+            if cls not in shown and not is_floor:
+                continue
+            if not oc.sphere_vis(cents[pi], rad[pi]):
                 continue
             a, b, c = tris[pi][0], tris[pi][1], tris[pi][2]
             cen = cents[pi]
@@ -407,16 +571,91 @@ def _collect_tris(snap, link, radius, cap):
             d2 = dx*dx + dy*dy + dz*dz
             if radius > 0.0 and d2 > r2:
                 continue
-            static.append((d2, verts[a], verts[b], verts[c], cen, cls, is_floor))
+            static.append((d2, verts[a], verts[b], verts[c], cen, cls, is_floor, False))
 
-    total_shown = len(movebg) + len(static)
     keep_static = max(0, cap - len(movebg))
-    if len(static) > keep_static:
+    total_static = len(static)
+    s_top = max(0, _lod["step"] - 1)
+    f_top = LOD_STEP ** s_top
+    bands = []                     # LOD candidates: (sorted hits, inner, outer, mesh, floor_poly,
+                                   # nearest() ran out before `outer`, coarse?)
+    for bg, m in indexed:
+        verts = m["verts"]; cents = m["centroids"]; clss = m["classes"]; tris = m["tris"]
+        grid = m["grid"]
+        floor_poly = floor[1] if (floor and floor[0] == bg) else -1
+        bounds = _cull_bounds(m)
+        state = bounds.cell_states(oc)
+        accept = _accept(bounds, state, clss, shown, floor_poly)
+        lods = mesh_lods(m) if cb_lod.checked else []
+        if radius > 0.0:
+            hits = grid.radius(link, radius, accept)       # exact in-radius set (for the total)
+            total_static += len(hits)
+        else:
+            # no radius: only the nearest keep_static can be drawn; the total is every in-view tri
+            hits = grid.nearest(link, keep_static, accept,
+                                _lod_reach(lods[0]) * f_top if lods else 0.0)
+            n_in = bounds.count(state, shown)
+            if (0 <= floor_poly < len(clss) and clss[floor_poly] not in shown
+                    and state[bounds.cell_of[floor_poly]]):
+                n_in += 1
+            total_static += n_in
+        if not lods:
+            for d2, pi in hits:
+                t = tris[pi]
+                static.append((d2, verts[t[0]], verts[t[1]], verts[t[2]], cents[pi], clss[pi],
+                               pi == floor_poly, False))
+            continue
+        # Full detail out to the first level's reach, then each level out to the next one's (all
+        # scaled by f <= f_top below). nearest() stopped at keep_static hits, so past its last hit
+        # the full band is unknown.
+        hits.sort()
+        full = radius <= 0.0 and len(hits) >= keep_static
+        bands.append((hits, 0.0, _lod_reach(lods[0]), m, floor_poly, full, False))
+        for k, lvl in enumerate(lods):
+            outer = _lod_reach(lods[k + 1]) if k + 1 < len(lods) else _NO_LIMIT
+            lb = _cull_bounds(lvl)
+            acc = _accept(lb, lb.cell_states(oc), lvl["classes"], shown, -1)
+            reach = outer * f_top if outer < _NO_LIMIT else outer
+            lh = lvl["grid"].radius(link, min(reach, radius) if radius > 0.0 else reach, acc)
+            lh.sort()
+            bands.append((lh, _lod_reach(lvl), outer, lvl, -1, False, True))
+
+    n_lod = 0
+    if bands:
+        # Widest band scale whose candidates fit the cap next to the un-banded static tris.
+        room = keep_static - len(static)
+        for step in range(s_top, LOD_STEPS + 1):
+            f = LOD_STEP ** step
+            n = 0
+            for hits, inner, outer, _m, _fp, full, _c in bands:
+                hi2 = (outer * f) ** 2
+                if full and hits and hi2 > hits[-1][0]:
+                    n = room + 1                           # more full-detail tris than we fetched
+                    break
+                n += bisect.bisect_left(hits, (hi2,)) - bisect.bisect_left(hits, ((inner * f) ** 2,))
+            if n <= room:
+                break
+        for hits, inner, outer, lm, fp, _full, coarse in bands:
+            lv, lc, lcl, lt = lm["verts"], lm["centroids"], lm["classes"], lm["tris"]
+            for d2, pi in hits[bisect.bisect_left(hits, ((inner * f) ** 2,)):
+                               bisect.bisect_left(hits, ((outer * f) ** 2,))]:
+                t = lt[pi]
+                static.append((d2, lv[t[0]], lv[t[1]], lv[t[2]], lc[pi], lcl[pi], pi == fp, coarse))
+        _lod["step"] = step
+
+    total_shown = len(movebg) + total_static
+    dropped = max(0, len(static) - keep_static)
+    if dropped:
         # Nearest Link only. The floor tri Link stands on is ~0 distance away, so it's always in
-        # this set (no separate rescue needed).
+        # this set when it is in view (no separate rescue needed).
         static = heapq.nsmallest(keep_static, static, key=lambda t: t[0])
-    out = movebg + [(t[1], t[2], t[3], t[4], t[5], t[6], False) for t in static]
-    return out, total_shown
+    out = movebg
+    for t in static:
+        out.append((t[1], t[2], t[3], t[4], t[5], t[6], False))
+        n_lod += t[7]
+    # Coarse bands stand in for the far full-detail tris, so only the cut loses any of them then.
+    clipped = dropped if bands else total_shown - len(out)
+    return out, total_shown, clipped, n_lod
 
 
 _CYAN = (0x33, 0xE6, 0xFF)   # base color the prism faces are shaded from
@@ -506,6 +745,68 @@ def _clip_near_project(oc, cverts):
     return spts, sum(c[2] for c in out) / len(out)
 
 
+def _project(oc, tris):
+    """[(depth, screen_poly, cls, is_floor, is_move), ...] for the collected `tris`, far first."""
+    drawable = []
+    for v0, v1, v2, cen, cls, is_floor, is_move in tris:
+        spoly, depth = _clip_near_project(oc, (oc.cam(v0), oc.cam(v1), oc.cam(v2)))
+        if spoly is None:
+            continue
+        drawable.append((depth, spoly, cls, is_floor, is_move))
+    drawable.sort(key=lambda t: t[0], reverse=True)
+    return drawable
+
+
+def _project_np(oc, tris):
+    """_project in bulk: every vertex goes to camera space in one matrix multiply, triangles fully
+    in front of the near plane are projected and averaged as arrays, and only the (rare) straddlers
+    go through _clip_near_project. One argsort gives the painter order."""
+    n = len(tris)
+    if not n:
+        return []
+    flat = np.fromiter(chain.from_iterable(chain.from_iterable(t[:3] for t in tris)),
+                       dtype=np.float64, count=9 * n).reshape(n, 3, 3)
+    cam = (flat - oc.pos) @ np.array((oc.right, oc.up, oc.fwd), dtype=np.float64).T
+    z = cam[:, :, 2]
+    front = z >= oc.NEAR
+    full = front.all(axis=1)
+    idx = np.flatnonzero(full)
+    c = cam[idx]
+    inv = oc.focal / c[:, :, 2]
+    scr = np.empty((len(idx), 6))
+    scr[:, 0::2] = W * 0.5 + c[:, :, 0] * inv
+    scr[:, 1::2] = H * 0.5 - c[:, :, 1] * inv
+    polys = [((r[0], r[1]), (r[2], r[3]), (r[4], r[5])) for r in scr.tolist()]
+    src = idx.tolist()
+    depth = [z[idx].mean(axis=1)]
+    for i in np.flatnonzero(front.any(axis=1) & ~full).tolist():
+        spoly, d = _clip_near_project(oc, [tuple(v) for v in cam[i].tolist()])
+        if spoly is not None:
+            polys.append(spoly)
+            src.append(i)
+            depth.append(np.array((d,)))
+    depth = np.concatenate(depth)
+    order = np.argsort(-depth, kind="stable").tolist()
+    dl = depth.tolist()
+    return [(dl[k], polys[k]) + tris[src[k]][4:] for k in order]
+
+
+# Last drawn scene: its key, the mesh dicts it was built from (held so their ids stay unique while
+# the key compares them), the recorded draw calls and the header numbers.
+_scene = {"key": None, "hold": None, "ops": None, "info": None}
+
+
+def _scene_key(snap, link, fwd, target, radius):
+    """Everything the triangle + Link-marker draw depends on: mesh identities (read_collision hands
+    back the same dict while a mesh is unchanged -- movable ones per (bgw, pm_bgd), so several
+    instances of one actor stay reusable too), Link's floor / position / facing, the orbit view and
+    the display toggles."""
+    return (tuple((bg, id(m)) for bg, m in snap["meshes"].items()), snap.get("floor"), link, fwd,
+            target, _view["az"], _view["el"], _dist(), radius,
+            tuple(cb.checked for cb in (cb_ground, cb_wall, cb_roof, cb_filled, cb_wire, cb_movebg,
+                                        cb_lod)))
+
+
 def draw(payload):
     cv.clear()
     cv.rect_filled((0, 0), (W, H), C_BG)
@@ -513,57 +814,69 @@ def draw(payload):
         cv.text((16, 24), C_TXT, "waiting for game / stage collision...")
         cv.commit()
         return
+    _budget.begin()
     snap, link = payload[0], payload[1]
     base = link if cb_follow.checked else (0.0, 0.0, 0.0)
     target = (base[0]+_pan[0], base[1]+_pan[1], base[2]+_pan[2])
     oc = OrbitCam(target, _view["az"], _view["el"], _dist())
     radius = sld_radius.value
 
-    # Collect already caps to the nearest-Link `cap` (movable BG always kept) using cached centroids
-    # — so only ~cap triangles are ever projected, and the ImGui draw list can't overflow.
-    cap = MAX_DRAW_WIRE if cb_wire.checked else MAX_DRAW_FILL
-    tris, total_shown = _collect_tris(snap, link, radius, cap)
-
-    # Project to screen with near-plane clipping (large tris straddling the camera become 3-4 pt
-    # polygons instead of being dropped). Keep avg depth for the painter sort.
-    drawable = []
-    for v0, v1, v2, cen, cls, is_floor, is_move in tris:
-        spoly, depth = _clip_near_project(oc, (oc.cam(v0), oc.cam(v1), oc.cam(v2)))
-        if spoly is None:
-            continue
-        drawable.append((depth, spoly, cls, is_floor, is_move))
-
-    drawable.sort(key=lambda t: t[0], reverse=True)   # far first (painter's order)
-    clipped = total_shown - len(tris)
-
-    n = {"ground": 0, "wall": 0, "roof": 0}
-    n_move = 0
-    for depth, spoly, cls, is_floor, is_move in drawable:
-        n[cls] += 1
-        if is_move:
-            n_move += 1
-        if cb_filled.checked:
-            col = C_FLOOR_HL if is_floor else (C_MOVE if is_move else _FILL[cls])
-            for i in range(1, len(spoly) - 1):          # fan-triangulate the (clipped) polygon
-                cv.triangle_filled(spoly[0], spoly[i], spoly[i + 1], col)
-        # Always outline movable-BG + the floor tri (they're small / important); room edges follow
-        # the Wireframe toggle.
-        if cb_wire.checked or is_floor or is_move:
-            ec = C_FLOOR_HL if is_floor else (C_MOVE_EDGE if is_move else C_EDGE)
-            th = 2 if (is_floor or is_move) else 1
-            m = len(spoly)
-            for i in range(m):
-                cv.line(spoly[i], spoly[(i + 1) % m], ec, thickness=th)
-
-    # Link as a directional cone (apex = facing); fall back to a haloed dot if facing is unavailable.
+    # Idle frames (same meshes, Link, view and toggles as last frame) replay last frame's scene
+    # draw calls instead of collecting / projecting / sorting again.
     fwd = payload[2]
-    if fwd is not None:
-        _draw_player_cone(oc, link, fwd)
+    key = _scene_key(snap, link, fwd, target, radius)
+    if key == _scene["key"]:
+        cap, total_shown, n_drawn, n, n_move, clipped, n_lod, verts = _scene["info"]
+        cv.replay(_scene["ops"])
+        _budget.used("tri", n_drawn, verts, retune=False)
     else:
-        ls = oc.screen(oc.cam(link))
-        if ls:
-            cv.circle_filled(ls, 9, C_LINK_HALO)
-            cv.circle_filled(ls, 6, C_LINK)
+        # Collect already caps to the nearest-Link `cap` (movable BG always kept) using cached
+        # centroids — so only ~cap triangles are ever projected, and the ImGui draw list can't
+        # overflow. A near-clipped triangle is at most a quad: two fills and four edges.
+        per_tri = ((2 * VERTS["triangle_filled"] if cb_filled.checked else 0)
+                   + (4 * VERTS["line"] if cb_wire.checked else 0))
+        cap = _budget.cap("tri", per_tri)
+        tris, total_shown, clipped, n_lod = _collect_tris(snap, link, radius, cap, oc)
+
+        # Project to screen with near-plane clipping (large tris straddling the camera become 3-4
+        # pt polygons instead of being dropped), far first (painter's order).
+        drawable = _project_np(oc, tris) if USE_NUMPY and np is not None else _project(oc, tris)
+
+        n = {"ground": 0, "wall": 0, "roof": 0}
+        n_move = 0
+        v0 = cv.verts
+        cv.record()
+        for depth, spoly, cls, is_floor, is_move in drawable:
+            n[cls] += 1
+            if is_move:
+                n_move += 1
+            if cb_filled.checked:
+                col = C_FLOOR_HL if is_floor else (C_MOVE if is_move else _FILL[cls])
+                for i in range(1, len(spoly) - 1):          # fan-triangulate the (clipped) polygon
+                    cv.triangle_filled(spoly[0], spoly[i], spoly[i + 1], col)
+            # Always outline movable-BG + the floor tri (they're small / important); room edges
+            # follow the Wireframe toggle.
+            if cb_wire.checked or is_floor or is_move:
+                ec = C_FLOOR_HL if is_floor else (C_MOVE_EDGE if is_move else C_EDGE)
+                th = 2 if (is_floor or is_move) else 1
+                m = len(spoly)
+                for i in range(m):
+                    cv.line(spoly[i], spoly[(i + 1) % m], ec, thickness=th)
+        n_drawn = len(drawable)
+        verts = cv.verts - v0
+        _budget.used("tri", n_drawn, verts)
+
+        # Link as a directional cone (apex = facing); fall back to a haloed dot if facing is
+        # unavailable.
+        if fwd is not None:
+            _draw_player_cone(oc, link, fwd)
+        else:
+            ls = oc.screen(oc.cam(link))
+            if ls:
+                cv.circle_filled(ls, 9, C_LINK_HALO)
+                cv.circle_filled(ls, 6, C_LINK)
+        _scene.update(key=key, hold=list(snap["meshes"].values()), ops=cv.stop(),
+                      info=(cap, total_shown, n_drawn, n, n_move, clipped, n_lod, verts))
 
     _draw_seam_ui(oc)
 
@@ -571,13 +884,15 @@ def draw(payload):
     ftxt = f"floor tri {floor[1]} (slot {floor[0]})" if floor else "airborne / no floor"
     cliptxt = f"  CLIPPED {clipped} (lower Draw radius / zoom in to see all)" if clipped else ""
     cv.text((10, 16), C_TXT,
-            f"stage {snap['stage']}  meshes={len(snap['meshes'])}  drawn {len(drawable)}/{total_shown}vis"
-            f"  [G {n['ground']}  W {n['wall']}  R {n['roof']}  MoveBG {n_move}]  {ftxt}{cliptxt}")
+            f"stage {snap['stage']}  meshes={len(snap['meshes'])}  drawn {n_drawn}/{total_shown}vis"
+            f"  [G {n['ground']}  W {n['wall']}  R {n['roof']}  MoveBG {n_move}]  {ftxt}{cliptxt}"
+            f"  cap {cap} @ {_budget.ms:.1f}ms" + (f"  LOD {n_lod}" if n_lod else ""))
     mode = _drag["mode"]
     grab = f"   [{mode.upper()} — click to release]" if mode else ""
     cv.text((10, H-16), C_TXT,
             "L-drag: orbit   R-drag: pan   wheel: zoom   (green=ground red=wall blue=roof "
             "purple=movable BG, yellow=Link's floor, cyan cone=Link)" + grab)
+    _budget.end()
     cv.commit()
 
 
@@ -590,7 +905,20 @@ def on_frame():
         if (stg, rm) != (_seam["stage"], _seam["room"]):
             _seam["stage"], _seam["room"] = stg, rm
             _seam["clips"] = _load_clips(stg, rm)
+            _seam["pending"] = not _seam["clips"]
             _seam["sel"] = None
+        if _seam["pending"] and _seam["on"]:
+            key = (stg, rm, tuple((i, m["pm_bgd"], m["t_num"], m["is_movebg"])
+                                  for i, m in sorted(snap["meshes"].items())))
+            clips = _seam_found.get(key)
+            if clips is None:
+                clips = _seam_found[key] = [_clip_from_row(r) for r in
+                                            seam_finder.find_seams(snap["meshes"].values())]
+            _seam["clips"], _seam["pending"] = clips, False
+        if btn_export.clicked:
+            stem = os.path.join(_EXPORT_DIR, "%s_room%d_%s" % (stg, rm, time.strftime("%Y%m%d_%H%M%S")))
+            paths = collision_export.export(snap, stem)
+            print("[collision_viewer] exported " + ", ".join(paths))
         link = _link_pos()
         try:
             fwd = _link_facing_dir()
@@ -17,6 +17,7 @@ Controls (mouse, over the canvas):
   Left-drag = ORBIT, right-drag = PAN (grab-toggle: click to grab, move, click to release). The
   "Pan mode" checkbox makes LEFT-drag pan too (a right-click-free fallback). Mouse wheel zooms.
   "Reset view" recenters. Checkboxes toggle culled/visible boxes, the frustum, labels, Follow-Link.
+  Boxes outside the orbit view itself are skipped (counted as "off-view" in the header).
 
 IMPORTANT (stability): all work — memory read, input, draw — happens on the SINGLE on_frameadvance
 thread. We deliberately do NOT use on_hostupdate (a second, host-thread tick that runs while paused);
@@ -24,11 +25,13 @@ doing input/drawing there crashed the core in this build (that, not the mouse ca
 Consequence: the mouse controls and redraw work while the game is RUNNING; a full pause freezes the
 view until the next frame advances. That is the accepted trade for stability.
 """
+import heapq
 import math
 
 from dolphin import gui, event, memory
 
 from ww.cull import full_snapshot   # self-contained cull scanner (vendored port; see ww/cull.py)
+from ww.draw_budget import BudgetCanvas, DrawBudget, VERTS, TEXT_VERTS_PER_CHAR
 
 
 class DolphinReader:
@@ -42,7 +45,7 @@ RD = DolphinReader()
 # --- window / canvas / controls ------------------------------------------------------------
 W, H = 820, 520
 panel = gui.window("TWW Cull Viewer")
-cv = panel.canvas(W, H)
+cv = BudgetCanvas(panel.canvas(W, H))     # counts emitted vertices for _budget
 cb_panmode = panel.checkbox("Pan mode (drag pans)", False)
 cb_follow = panel.checkbox("Follow Link", True)
 cb_culled = panel.checkbox("Show culled", True)
@@ -52,6 +55,14 @@ cb_labels = panel.checkbox("Labels", False)
 btn_reset = panel.button("Reset view")
 status = panel.text("")
 
+# Actor boxes drawn per frame, set by ww.draw_budget: aims the draw time at DRAW_TARGET_MS and keeps
+# boxes x 12 edges (+ label) under the draw list's 65535-vertex ceiling; the boxes nearest the
+# orbit target win when there are more.
+DRAW_TARGET_MS = 4.0
+DRAW_CAP = (400, 20, 2000)       # start, floor, ceiling (boxes)
+LABEL_CHARS = 24                 # label length budgeted per box
+_budget = DrawBudget(cv, {"box": DRAW_CAP}, DRAW_TARGET_MS)
+
 # view state, driven by mouse (all polled in on_frameadvance):
 #   left-click grab = orbit (or pan while "Pan mode" is checked)   wheel = zoom
 _VIEW0 = {"az": 40.0, "el": 24.0, "zoom": 0.0}
@@ -101,6 +112,8 @@ class OrbitCam:
         self.right, self.up, self.fwd = _orbit_basis(az, el)
         self.pos = (target[0]-self.fwd[0]*dist, target[1]-self.fwd[1]*dist, target[2]-self.fwd[2]*dist)
         self.focal = _FOCAL
+        self._kx = math.hypot(self.focal, W * 0.5)      # side-plane normal lengths (sphere_vis)
+        self._ky = math.hypot(self.focal, H * 0.5)
 
     def cam(self, w):
         rel = _sub(w, self.pos)
@@ -111,6 +124,24 @@ class OrbitCam:
             return None
         return (W*0.5 + self.focal * c[0]/c[2], H*0.5 - self.focal * c[1]/c[2])
 
+    def sphere_vis(self, w, r):
+        """World sphere (center w, radius r) against the view frustum (near plane + the four canvas
+        edges; no far plane): 0 = outside, 1 = straddling, 2 = fully inside."""
+        px, py, pz = w[0] - self.pos[0], w[1] - self.pos[1], w[2] - self.pos[2]
+        f = self.fwd
+        z = px*f[0] + py*f[1] + pz*f[2]
+        if z + r < self.NEAR:
+            return 0
+        rt, up = self.right, self.up
+        ex = abs(px*rt[0] + py*rt[1] + pz*rt[2]) * self.focal - z * W * 0.5   # > 0: center beyond
+        ey = abs(px*up[0] + py*up[1] + pz*up[2]) * self.focal - z * H * 0.5   # a side plane
+        rx, ry = r * self._kx, r * self._ky
+        if ex > rx or ey > ry:
+            return 0
+        if z - r >= self.NEAR and ex <= -rx and ey <= -ry:
+            return 2
+        return 1
+
     def edge(self, w0, w1):
         """Project a world segment, clipped to the near plane. Returns (p0,p1) screen or None."""
         a, b = self.cam(w0), self.cam(w1)
@@ -174,12 +205,37 @@ def _draw_edges(oc, corners, edges, color, thickness=1):
             cv.line(e[0], e[1], color, thickness=thickness)
 
 
+def _bound_sphere(corners):
+    """(center, radius) enclosing a box's corners, for OrbitCam.sphere_vis."""
+    n = len(corners)
+    c = (sum(p[0] for p in corners) / n, sum(p[1] for p in corners) / n,
+         sum(p[2] for p in corners) / n)
+    return c, max(math.dist(c, p) for p in corners)
+
+
 def _draw_marker(oc, w, color, r=5):
     s = oc.screen(oc.cam(w))
     if s:
         cv.circle_filled(s, r, color)
 
 
+# Last drawn scene: its key, the recorded draw calls and the header counts.
+_scene = {"key": None, "ops": None, "info": None}
+
+
+def _scene_key(snap, target):
+    """Everything the scene draw depends on: the orbit view, the toggles, the game camera / frustum,
+    Link, and every actor's box, verdict and label."""
+    cam = snap["camera"]
+    return (target, _view["az"], _view["el"], _dist(),
+            tuple(cb.checked for cb in (cb_culled, cb_visible, cb_frustum, cb_labels)),
+            tuple(map(tuple, snap["frustum_corners"])), tuple(cam["eye"]), tuple(cam["center"]),
+            tuple(snap["link"]),
+            tuple((a["name"], a["our_culled"], a["agree"], tuple(a["pos"]),
+                   None if a["corners"] is None else tuple(map(tuple, a["corners"])))
+                  for a in snap["actors"]))
+
+
 def draw(snap):
     cv.clear()
     cv.rect_filled((0, 0), (W, H), C_BG)
@@ -189,6 +245,7 @@ def draw(snap):
         cv.commit()
         return
 
+    _budget.begin()
     cam, actors = snap["camera"], snap["actors"]
     eye = tuple(cam["eye"])
     link = tuple(snap["link"])
@@ -196,52 +253,84 @@ def draw(snap):
     target = (base[0] + _pan[0], base[1] + _pan[1], base[2] + _pan[2])
     oc = OrbitCam(target, _view["az"], _view["el"], _dist())
 
-    if cb_frustum.checked:
-        fc = [tuple(c) for c in snap["frustum_corners"]]
-        _draw_edges(oc, fc, [(0,1),(1,2),(2,3),(3,0),(0,4),(1,5),(2,6),(3,7)], C_FRUSTN, 1)
-        _draw_edges(oc, fc, [(4,5),(5,6),(6,7),(7,4)], C_FRUSTF, 1)
-
-    n_vis = n_cull = n_mism = 0
-    for a in actors:
-        culled = a["our_culled"]
-        if culled is None or a["corners"] is None:
-            continue
-        mism = a["agree"] is False
-        if culled:
-            n_cull += 1
-            if not cb_culled.checked and not mism:
+    # Idle frames (same snapshot contents, view and toggles as last frame) replay last frame's
+    # scene draw calls instead of re-testing and re-projecting every box.
+    key = _scene_key(snap, target)
+    if key == _scene["key"]:
+        n_vis, n_cull, n_mism, n_off, n_over, cap, n_boxes, verts = _scene["info"]
+        cv.replay(_scene["ops"])
+        _budget.used("box", n_boxes, verts, retune=False)
+    else:
+        cv.record()
+        if cb_frustum.checked:
+            fc = [tuple(c) for c in snap["frustum_corners"]]
+            _draw_edges(oc, fc, [(0,1),(1,2),(2,3),(3,0),(0,4),(1,5),(2,6),(3,7)], C_FRUSTN, 1)
+            _draw_edges(oc, fc, [(4,5),(5,6),(6,7),(7,4)], C_FRUSTF, 1)
+
+        n_vis = n_cull = n_mism = n_off = 0
+        boxes = []
+        for a in actors:
+            culled = a["our_culled"]
+            if culled is None or a["corners"] is None:
                 continue
-            color = C_MISM if mism else C_CULL
-        else:
-            n_vis += 1
-            if not cb_visible.checked and not mism:
+            mism = a["agree"] is False
+            if culled:
+                n_cull += 1
+                if not cb_culled.checked and not mism:
+                    continue
+                color = C_MISM if mism else C_CULL
+            else:
+                n_vis += 1
+                if not cb_visible.checked and not mism:
+                    continue
+                color = C_MISM if mism else C_VIS
+            if mism:
+                n_mism += 1
+            corners = [tuple(c) for c in a["corners"]]
+            center, radius = _bound_sphere(corners)
+            if not oc.sphere_vis(center, radius):
+                n_off += 1                              # outside the orbit view: nothing to draw
                 continue
-            color = C_MISM if mism else C_VIS
-        if mism:
-            n_mism += 1
-        corners = [tuple(c) for c in a["corners"]]
-        _draw_edges(oc, corners, _BOX_EDGES, color, 2 if mism else 1)
-        if cb_labels.checked:
-            s = oc.screen(oc.cam(tuple(a["pos"])))
-            if s:
-                cv.text((s[0]+4, s[1]-6), color, a["name"])
-
-    _draw_marker(oc, eye, C_EYE, 6)
-    ce = oc.edge(eye, tuple(cam["center"]))
-    if ce and ce[0] and ce[1]:
-        cv.line(ce[0], ce[1], C_EYE, thickness=1)
-    _draw_marker(oc, link, C_LINK, 4)
+            boxes.append((math.dist(center, target), corners, color, mism, a))
+
+        per_box = len(_BOX_EDGES) * VERTS["line"] + (LABEL_CHARS * TEXT_VERTS_PER_CHAR
+                                                     if cb_labels.checked else 0)
+        cap = _budget.cap("box", per_box)
+        n_over = max(0, len(boxes) - cap)
+        if n_over:
+            boxes = heapq.nsmallest(cap, boxes, key=lambda b: b[0])
+        v0 = cv.verts
+        for _d, corners, color, mism, a in boxes:
+            _draw_edges(oc, corners, _BOX_EDGES, color, 2 if mism else 1)
+            if cb_labels.checked:
+                s = oc.screen(oc.cam(tuple(a["pos"])))
+                if s:
+                    cv.text((s[0]+4, s[1]-6), color, a["name"][:LABEL_CHARS])
+        n_boxes, verts = len(boxes), cv.verts - v0
+        _budget.used("box", n_boxes, verts)
+
+        _draw_marker(oc, eye, C_EYE, 6)
+        ce = oc.edge(eye, tuple(cam["center"]))
+        if ce and ce[0] and ce[1]:
+            cv.line(ce[0], ce[1], C_EYE, thickness=1)
+        _draw_marker(oc, link, C_LINK, 4)
+
+        _scene.update(key=key, ops=cv.stop(),
+                      info=(n_vis, n_cull, n_mism, n_off, n_over, cap, n_boxes, verts))
 
     c = snap["counts"]
     cv.text((10, 16), C_TXT,
             f"cull_far={snap['cull_far']:.0f}  fov={cam['fovy']:.0f}  "
             f"actors {c['boxed']} box: {n_vis} visible / {n_cull} culled"
-            + (f"  MISMATCH={n_mism}" if n_mism else "  (all match game)"))
+            + (f"  MISMATCH={n_mism}" if n_mism else "  (all match game)")
+            + (f"  [{n_off} off-view]" if n_off else "")
+            + (f"  [{n_over} over cap {cap}]" if n_over else ""))
     mode = _drag["mode"]
     grab = f"   [{mode.upper()} — click to release]" if mode else ""
     cv.text((10, H-16), C_TXT,
             "L-drag: orbit   R-drag: pan   wheel: zoom   "
             "(yellow=cam eye, white=Link)" + grab)
+    _budget.end()
     cv.commit()
 
 
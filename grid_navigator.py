@@ -9,9 +9,16 @@ it drives Link's main stick straight at that world position — full deflection,
 camera-aware, so his facing swings onto the target as fast as the stick allows.
 
 This is *normal movement*, not superswim: no walk-speed model, no projection. It
-just keeps pointing the stick at the target (camera-derotated) and releases once
-Link is within STOP_DIST. Meant for closed rooms (~<=20k units across), so it
-opens zoomed in much further than ss_navigator.
+keeps pointing the stick (camera-derotated) at the next waypoint of a path over
+the room's walkable floor and releases once Link is within STOP_DIST. The path
+comes from a ww.navmesh.NavMesh built from the live ground collision triangles
+(cached per room; A* + funnel) and is replanned whenever the target moves or
+Link strays off it. The navmesh build and long searches run a slice per frame
+(NavMesh.begin / begin_path), so a room change or replan can take a few frames;
+until then, or with no navmesh/path, it falls back to a straight line (or the
+old path when only Link strayed).
+Meant for closed rooms (~<=20k units across), so it opens zoomed in much
+further than ss_navigator.
 
 - Scroll to zoom (toward the cursor). No panning — zoom out to see more.
 - Click the grid to set a target; or snap it to Link with the button.
@@ -22,11 +29,14 @@ from __future__ import annotations
 import math
 import os
 import sys
+import traceback
 from typing import Optional, Tuple
 
-from dolphin import event, gui, controller
+from dolphin import event, gui, controller, memory
 from ww import mathutils
 from ww.actors.player import Player
+from ww.collision_geo import read_collision, tri_mask
+from ww.navmesh import NavMesh, NavMeshBuild, PathSearch
 from ww.mathutils import deg_to_halfword, wrap_deg
 from ww.context.context import set_region
 from ww.context.detect import detect_region
@@ -38,6 +48,10 @@ import cam_sync
 DEFAULT_VIEW_SPAN = 20_000.0   # world units across the smaller canvas dimension at load
 CAM_PREDICT_STEPS = 1          # 1 = predict next-frame csangle (matches ss_navigator); 0 = stale read
 STOP_DIST         = 30.0       # world units: release the stick once Link is this close to the target
+USE_NAVMESH       = True       # path around walls over the collision navmesh (False = straight line)
+WAYPOINT_DIST     = 40.0       # world units: advance to the next path waypoint inside this radius
+REPLAN_DIST       = 150.0      # world units: replan once Link is this far off the current path leg
+NAV_SEARCH        = 300.0      # world units: snap an off-mesh start/target to a triangle this close
 GRID_TARGET_PX    = 70.0       # desired on-screen spacing between gridlines (drives the "nice" step)
 SCALE_MIN         = 1.0e-4     # px per world unit (zoom-out limit)
 SCALE_MAX         = 50.0       # px per world unit (zoom-in limit)
@@ -57,6 +71,7 @@ C_LABEL    = 0xFF6E7390   # coordinate labels
 C_LINK     = 0xFF00CC00   # Link dot
 C_FACING   = 0xFFFFFF00   # facing arrow
 C_DEST     = 0xFFFF2222   # target marker
+C_PATH     = 0xFF3CC8FF   # navmesh path
 C_MOVE     = 0xFF38E08A   # active "moving" pulse (green)
 C_PILL_BG  = 0xCC10101A   # status pill background
 
@@ -178,10 +193,23 @@ _dest_z: float = 0.0
 _dest_set: bool = False
 
 _cur_x: float = 0.0
+_cur_y: float = 0.0
 _cur_z: float = 0.0
 _facing_hw: Optional[int] = None
 _have_state: bool = False
 
+# navmesh path (emu thread builds/replans; host thread only reads _path/_path_i to draw)
+_coll = None                 # last read_collision snapshot (its cache for the next read)
+_nav: Optional[NavMesh] = None
+_nav_key = None              # static meshes the navmesh was built from
+_nav_build: Optional[NavMeshBuild] = None   # room navmesh being built (one slice per frame)
+_nav_error: Optional[str] = None            # first navmesh failure (printed once)
+_path: list = []             # [(x, z), ...] waypoints, Link's position first, target last
+_path_i: int = 0             # waypoint currently steered at
+_path_dest = None            # (x, z) target the path was planned for
+_path_from = (0.0, 0.0)      # (x, z) Link was at when it was planned
+_search: Optional[PathSearch] = None   # replan in progress (one slice per frame)
+
 _armed: bool = False         # host-thread latch of the "Move toward target" checkbox
 _at_target: bool = False     # set by the emu thread when within STOP_DIST (for the HUD)
 _anim: int = 0               # host-side tick for the canvas pulse
@@ -195,10 +223,74 @@ def _set_main(sx: int, sy: int) -> None:
     controller.set_gc_buttons(0, inp)
 
 
-def _drive_toward(cur_x: float, cur_z: float) -> None:
-    """Push the main stick full-deflection at the world bearing to the target,
-    de-rotated for the (predicted) camera. Emu-thread only (memory + controller)."""
-    global _at_target
+class _RAMReader:
+    """read_bytes(gc_addr, n) over Dolphin's emulated memory, for ww.collision_geo."""
+    def read_bytes(self, addr, n):
+        return bytes(memory.read_bytes(addr, n))
+
+
+_RD = _RAMReader()
+
+
+def _leg_dist(x: float, z: float, a, b) -> float:
+    """Distance from (x, z) to the path leg a-b."""
+    abx, abz = b[0] - a[0], b[1] - a[1]
+    l2 = abx * abx + abz * abz
+    t = 0.0 if l2 <= 0.0 else max(0.0, min(1.0, ((x - a[0]) * abx + (z - a[1]) * abz) / l2))
+    return math.hypot(x - a[0] - t * abx, z - a[1] - t * abz)
+
+
+def _update_path(cur_x: float, cur_y: float, cur_z: float) -> None:
+    """Refresh the room navmesh (rebuilt only when the static collision changes) and replan
+    when the target moved, the navmesh changed, or Link left the current leg. The build and a
+    replan each run one slice per call (NavMeshBuild / PathSearch) until done; meanwhile there
+    is no path and Link steers straight. Emu thread."""
+    global _coll, _nav, _nav_key, _nav_build, _path, _path_i, _path_dest, _path_from, _search
+    _coll = read_collision(_RD, cache=_coll)
+    static = sorted((i, m) for i, m in _coll["meshes"].items() if not m["is_movebg"])
+    key = tuple((i, m["pm_bgd"], m["t_num"]) for i, m in static)
+    if key != _nav_key:
+        ms = [m for _i, m in static]
+        _nav, _nav_key = None, key
+        _nav_build = NavMesh.begin(ms, [tri_mask(m, "void", ()) for m in ms]) if ms else None
+        _path, _path_i, _search = [], 0, None
+    rebuilt = False
+    if _nav_build is not None and _nav_build.step():
+        _nav, _nav_build = _nav_build.nav, None
+        rebuilt = True
+
+    dest = (_dest_x, _dest_z)
+    if _path:
+        off = _leg_dist(cur_x, cur_z, _path[_path_i - 1], _path[_path_i]) > REPLAN_DIST
+    else:   # no path last time (off the mesh / unreachable): retry once Link has moved a bit
+        off = mathutils.dist2d(cur_x, cur_z, _path_from[0], _path_from[1]) > REPLAN_DIST
+    if rebuilt or dest != _path_dest or (off and _search is None):
+        if rebuilt or dest != _path_dest:   # the old path is for another target / navmesh
+            _path, _path_i = [], 0
+        _search = None
+        if _nav is not None and len(_nav):
+            _search = _nav.begin_path((cur_x, cur_y, cur_z), (_dest_x, cur_y, _dest_z), NAV_SEARCH)
+        if _search is None:
+            _path, _path_i = [], 0
+        _path_dest = dest
+        _path_from = (cur_x, cur_z)
+    if _search is not None and _search.step():
+        path = _search.path
+        _search = None
+        _path = path if path and len(path) > 1 else []
+        _path_i = 1 if _path else 0
+
+    # Advance past waypoints already reached (the last one is the target: STOP_DIST handles it).
+    while _path and _path_i < len(_path) - 1 and \
+            mathutils.dist2d(cur_x, cur_z, _path[_path_i][0], _path[_path_i][1]) <= WAYPOINT_DIST:
+        _path_i += 1
+
+
+def _drive_toward(cur_x: float, cur_y: float, cur_z: float) -> None:
+    """Push the main stick full-deflection at the world bearing to the next path
+    waypoint (or straight at the target without a path), de-rotated for the
+    (predicted) camera. Emu-thread only (memory + controller)."""
+    global _at_target, _path, _search, _nav_build, _nav_error
     if not cam_sync.loaded:
         return
     if mathutils.dist2d(cur_x, cur_z, _dest_x, _dest_z) <= STOP_DIST:
@@ -206,7 +298,19 @@ def _drive_toward(cur_x: float, cur_z: float) -> None:
         return   # within threshold: leave the stick centred (set_gc_buttons auto-clears)
     _at_target = False
 
-    bearing_deg = wrap_deg(math.degrees(math.atan2(_dest_x - cur_x, _dest_z - cur_z)))
+    aim_x, aim_z = _dest_x, _dest_z
+    if USE_NAVMESH:
+        try:
+            _update_path(cur_x, cur_y, cur_z)
+        except Exception:
+            _path, _search, _nav_build = [], None, None
+            if _nav_error is None:
+                _nav_error = traceback.format_exc()
+                print("[grid_navigator] navmesh path failed, steering straight:\n" + _nav_error)
+        if _path:
+            aim_x, aim_z = _path[_path_i]
+
+    bearing_deg = wrap_deg(math.degrees(math.atan2(aim_x - cur_x, aim_z - cur_z)))
     bearing_hw  = deg_to_halfword(bearing_deg) & 0xFFFF
 
     inp = controller.get_gc_buttons(0)
@@ -218,7 +322,7 @@ def _drive_toward(cur_x: float, cur_z: float) -> None:
 # ── memory read + stick drive (emu thread only) ─────────────────────
 @event.on_frameadvance
 def _read_state() -> None:
-    global _cur_x, _cur_z, _facing_hw, _have_state, _at_target
+    global _cur_x, _cur_y, _cur_z, _facing_hw, _have_state, _at_target
 
     # Rebuild the Player each frame: its gptr is recreated across stage/room
     # transitions, so a cached instance would read a stale base. Cheap (one ptr read).
@@ -234,6 +338,7 @@ def _read_state() -> None:
 
     try:
         _cur_x = p.debug_x()
+        _cur_y = p.debug_y()
         _cur_z = p.debug_z()
         _facing_hw = p.angle_y
         _have_state = True
@@ -243,7 +348,7 @@ def _read_state() -> None:
 
     if _armed and _dest_set:
         try:
-            _drive_toward(_cur_x, _cur_z)
+            _drive_toward(_cur_x, _cur_y, _cur_z)
         except Exception:
             pass
 
@@ -330,6 +435,15 @@ def update() -> None:
                              (lx + 30.0 * math.sin(rad), ly + 30.0 * math.cos(rad)),
                              C_FACING, 2.0)
 
+        path, path_i = _path, _path_i
+        if _dest_set and _armed and len(path) > 1:
+            prev = _view.w2c(cur_x, cur_z) if have else _view.w2c(*path[0])
+            for wx, wz in path[max(1, path_i):]:
+                pt = _view.w2c(wx, wz)
+                _canvas.line(prev, pt, C_PATH, 2.0)
+                _canvas.circle_filled(pt, 3.0, C_PATH)
+                prev = pt
+
         if _dest_set:
             dx, dy = _view.w2c(_dest_x, _dest_z)
             R = 8.0
@@ -356,8 +470,11 @@ def update() -> None:
         dist = mathutils.dist2d(cur_x, cur_z, _dest_x, _dest_z)
         atd  = mathutils.angle2d_hw(cur_x, cur_z, _dest_x, _dest_z)
         state = ("AT TARGET" if _at_target else "MOVING") if _armed else "idle"
-        _status.set("Target X=%.0f Z=%.0f   dist=%.0f   angle=%d   [%s]"
-                    % (_dest_x, _dest_z, dist, atd, state))
+        route = ""
+        if _armed and USE_NAVMESH:
+            route = ("   path %d/%d" % (_path_i, len(_path) - 1)) if _path else "   direct"
+        _status.set("Target X=%.0f Z=%.0f   dist=%.0f   angle=%d   [%s]%s"
+                    % (_dest_x, _dest_z, dist, atd, state, route))
     else:
         _status.set("Click the grid to set a target")
 
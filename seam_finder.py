@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""seam_finder.py - in-repo seam-clip candidate finder over collision meshes.
+
+Finds the wall seams collision_viewer's seam-clip overlay lists, straight from the triangles, so
+rooms the external tww_sim export never covered (modded stages, movable geometry) still get
+candidates. A seam is where an edge shared by two wall triangles comes down onto a ground vertex:
+  - edges are matched through a hashed vertex-pair index (positions quantized to 1/QUANT units),
+    so walls from different meshes / duplicated vertices still pair up,
+  - the interior angle is the angle between the two walls on their open side (180 = coplanar
+    wall split, 90 = inside corner); convex corners (> 180) can't be clipped and are dropped, as
+    are angles outside [INTERIOR_MIN, INTERIOR_MAX],
+  - the placement follows the export's rule: init is WALL_RADIUS / sin(interior / 2) + INIT_MARGIN
+    out along the walls' bisector (Link's wall circle touching both walls, plus a margin), dest is
+    DEST_PAST just behind the seam, both at the seam's height.
+Rows use the Room<N>__room.csv schema (seam_*, init_*, dest_*, angle_deg). They are geometric
+candidates, not emulator-validated clips.
+
+No `dolphin` imports. collision_viewer calls find_seams() on the live snapshot when a room has no
+CSV; offline, a directory of extracted stage archives regenerates a whole dataset:
+  python seam_finder.py <stages_dir> [--out DIR] [--workers N]
+where <stages_dir>/<stage>/Room<N>.dzb are the rooms' collision files (default --out is
+.cache/seam_clips; pass ww/data/seam_clips to replace the shipped data).
+"""
+import csv
+import importlib.util
+import math
+import os
+import re
+import struct
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# Inside Dolphin use the package's collision_geo, so its toggles (USE_NUMPY, DISK_CACHE) and
+# caches are the ones collision_viewer sets. Headless, the ww package __init__ fails on `dolphin`
+# (emulator runtime only), so load ww/collision_geo.py directly by path instead.
+try:
+    from ww import collision_geo as geo
+except ImportError as e:
+    if e.name != "dolphin":
+        raise
+    _spec = importlib.util.spec_from_file_location("ww_collision_geo",
+                                                   os.path.join(_HERE, "ww", "collision_geo.py"))
+    geo = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(geo)
+
+FIELDS = ("seam_x", "seam_y", "seam_z", "init_x", "init_y", "init_z",
+          "dest_x", "dest_y", "dest_z", "angle_deg")
+DEFAULT_OUT = os.path.join(_HERE, ".cache", "seam_clips")
+
+QUANT = 64.0               # vertex hash grid: 1/64 world unit
+WALL_RADIUS = 35.0         # Link's wall-check circle
+INIT_MARGIN = 16.0         # extra stand-off of the initial position (matches the shipped CSVs)
+DEST_PAST = 0.1            # clip position: this far behind the seam
+INTERIOR_MIN = 15.0        # degrees
+INTERIOR_MAX = 180.0
+_MIN_RISE = 1.0            # an edge must climb at least this much off the ground vertex
+
+_ROOM_RE = re.compile(r"^room(\d+)\.dzb$", re.IGNORECASE)
+
+
+def _vkey(v):
+    return (int(round(v[0] * QUANT)), int(round(v[1] * QUANT)), int(round(v[2] * QUANT)))
+
+
+def _flat(n):
+    """Unit XZ part of a normal, or None for a (near-)horizontal face."""
+    m = math.hypot(n[0], n[2])
+    if m < 1e-6:
+        return None
+    return (n[0] / m, n[2] / m)
+
+
+def find_seams(meshes, interior_min=INTERIOR_MIN, interior_max=INTERIOR_MAX):
+    """Seam-clip candidates over `meshes` (mesh dicts with verts/tris/classes, e.g. the values of
+    a read_collision snapshot's "meshes"). Returns a list of row dicts keyed by FIELDS, sorted by
+    seam position."""
+    edges = {}          # (vkey, vkey) -> [(flat normal, flat centroid), ...] of wall tris
+    ground = set()      # vkeys of ground-triangle corners
+    pos = {}            # vkey -> a representative position
+    for m in meshes:
+        verts = m["verts"]
+        for (a, b, c, _tid, _grp), cls in zip(m["tris"], m["classes"]):
+            if cls == "roof":
+                continue
+            v = (verts[a], verts[b], verts[c])
+            ks = (_vkey(v[0]), _vkey(v[1]), _vkey(v[2]))
+            if cls == "ground":
+                ground.update(ks)
+                continue
+            n = _flat(geo.tri_normal(*v))
+            if n is None:
+                continue
+            cen = ((v[0][0] + v[1][0] + v[2][0]) / 3.0, (v[0][2] + v[1][2] + v[2][2]) / 3.0)
+            for i in range(3):
+                pos.setdefault(ks[i], v[i])
+                ka, kb = ks[i], ks[(i + 1) % 3]
+                if ka == kb:
+                    continue
+                key = (ka, kb) if ka < kb else (kb, ka)
+                edges.setdefault(key, []).append((n, cen))
+
+    rows = {}
+    for (ka, kb), walls in edges.items():
+        if len(walls) != 2:
+            continue                    # open edge or a fan of 3+ walls: not a simple seam
+        for k, other in ((ka, kb), (kb, ka)):
+            if k not in ground or pos[other][1] - pos[k][1] < _MIN_RISE:
+                continue
+            s = pos[k]
+            (n1, c1), (n2, c2) = walls
+            cos_between = max(-1.0, min(1.0, n1[0] * n2[0] + n1[1] * n2[1]))
+            between = math.degrees(math.acos(cos_between))
+            # Inside corner when the second wall sits in front of the first.
+            concave = n1[0] * (c2[0] - s[0]) + n1[1] * (c2[1] - s[2]) > 0.0
+            interior = 180.0 - between if concave or between < 1e-3 else 180.0 + between
+            if not (interior_min <= interior <= interior_max):
+                continue
+            bx, bz = n1[0] + n2[0], n1[1] + n2[1]
+            bm = math.hypot(bx, bz)
+            if bm < 1e-6:
+                continue
+            bx, bz = bx / bm, bz / bm
+            d = WALL_RADIUS / math.sin(math.radians(interior) * 0.5) + INIT_MARGIN
+            rows[(k, round(interior, 3))] = {
+                "seam_x": s[0], "seam_y": s[1], "seam_z": s[2],
+                "init_x": s[0] + bx * d, "init_y": s[1], "init_z": s[2] + bz * d,
+                "dest_x": s[0] - bx * DEST_PAST, "dest_y": s[1], "dest_z": s[2] - bz * DEST_PAST,
+                "angle_deg": round(interior, 3)}
+    return [rows[k] for k in sorted(rows)]
+
+
+def write_csv(path, rows):
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        w.writerows(rows)
+    os.replace(tmp, path)
+
+
+# ── offline dataset build ───────────────────────────────────────────
+
+def _load_room(path):
+    vbytes, tbytes, v_num, t_num = _load_dzb(path)
+    return geo.mesh_from_tables(vbytes, tbytes, v_num, t_num)
+
+
+def _load_dzb(path):
+    """(vbytes, tbytes, v_num, t_num) from a DZB file (header pointers are file offsets)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    v_num, v_off, t_num, t_off = struct.unpack_from(">iIiI", data, 0)
+    return data[v_off:v_off + v_num * 12], data[t_off:t_off + t_num * 10], v_num, t_num
+
+
+def process_stage(args):
+    """Pool job: every Room<N>.dzb of one stage -> <out>/<stage>/Room<N>__room.csv.
+    Returns (stage, rooms written, seams, errors)."""
+    stage_dir, out_root = args
+    stage = os.path.basename(os.path.normpath(stage_dir))
+    rooms = seams = 0
+    errors = []
+    for name in sorted(os.listdir(stage_dir)):
+        mt = _ROOM_RE.match(name)
+        if not mt:
+            continue
+        try:
+            rows = find_seams([_load_room(os.path.join(stage_dir, name))])
+        except (OSError, ValueError, IndexError, struct.error) as e:
+            errors.append("%s: %s" % (name, e))
+            continue
+        out = os.path.join(out_root, stage)
+        os.makedirs(out, exist_ok=True)
+        write_csv(os.path.join(out, "Room%d__room.csv" % int(mt.group(1))), rows)
+        rooms += 1
+        seams += len(rows)
+    return stage, rooms, seams, errors
+
+
+def build_dataset(stages_dir, out_root=DEFAULT_OUT, workers=None):
+    """Run process_stage over every stage directory, across a process pool when workers > 1
+    (None = os.cpu_count()). Yields each stage's result as it finishes."""
+    stage_dirs = sorted(os.path.join(stages_dir, d) for d in os.listdir(stages_dir)
+                        if os.path.isdir(os.path.join(stages_dir, d)))
+    jobs = [(d, out_root) for d in stage_dirs]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        for j in jobs:
+            yield process_stage(j)
+        return
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for fut in as_completed([ex.submit(process_stage, j) for j in jobs]):
+            yield fut.result()
+
+
+def main() -> int:
+    import time
+    argv = sys.argv[1:]
+    out, workers = DEFAULT_OUT, None
+    for flag in ("--out", "--workers"):
+        if flag in argv:
+            k = argv.index(flag)
+            if flag == "--out":
+                out = argv[k + 1]
+            else:
+                workers = int(argv[k + 1])
+            del argv[k:k + 2]
+    if not argv or not os.path.isdir(argv[0]):
+        print(__doc__)
+        return 2
+    t0 = time.perf_counter()
+    n_st = n_rm = n_sm = n_err = 0
+    for stage, rooms, seams, errors in build_dataset(argv[0], out, workers):
+        n_st += 1
+        n_rm += rooms
+        n_sm += seams
+        n_err += len(errors)
+        print("%-10s %3d rooms %6d seams%s" % (stage, rooms, seams,
+                                             "  (%s)" % "; ".join(errors) if errors else ""))
+    print("%d stages, %d rooms, %d seams, %d errors in %.1fs -> %s"
+          % (n_st, n_rm, n_sm, n_err, time.perf_counter() - t0, out))
+    return 0 if not n_err else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
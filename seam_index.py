@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""seam_index.py - the shipped seam-clip CSVs packed into one memory-mapped index.
+
+collision_viewer's seam overlay used to list the stage directory and csv-parse Room<N>__room.csv
+on every room change. This compiles every ww/data/seam_clips/<stage>/Room<N>__room.csv into one
+file (.cache/seam_index.bin) that the viewer maps once per session; a room change is then a dict
+lookup plus one float32 slice. The file is rebuilt on open whenever the CSVs' names / sizes /
+mtimes no longer match the signature it was built from, so editing or regenerating the CSVs
+(seam_finder.py --out ww/data/seam_clips) needs no extra step.
+
+Layout (native byte order, recorded in the header like ww.collision_geo's disk cache):
+  file  "=4sBBxx16sII"  magic b"WWSI", version, little-endian?, source signature, rooms, rows
+  room  "=16siII"       stage (NUL-padded), room number, first row, row count  (rooms sorted)
+        rows x 10 f32   seam xyz, init xyz, dest xyz, angle_deg
+        rows x u8       1 when the init -> dest displacement is within ROLL_STAB_MAX
+
+No `dolphin` imports:
+  python seam_index.py build [src_dir] [out.bin]
+  python seam_index.py info  [out.bin]
+"""
+import csv
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(_HERE, "ww", "data", "seam_clips")
+INDEX_PATH = os.path.join(_HERE, ".cache", "seam_index.bin")
+
+MAGIC = b"WWSI"
+VERSION = 1
+ROLL_STAB_MAX = 49.2202          # max init -> dest displacement a roll-stab covers
+FIELDS = ("seam_x", "seam_y", "seam_z", "init_x", "init_y", "init_z",
+          "dest_x", "dest_y", "dest_z", "angle_deg")
+ROW = len(FIELDS)
+
+_HDR = struct.Struct("=4sBBxx16sII")
+_ROOM = struct.Struct("=16siII")
+_ROOM_RE = re.compile(r"^Room(\d+)__room\.csv$")
+
+
+def rollstab(old, new):
+    """True when a roll-stab covers the init -> dest displacement."""
+    return math.dist(old, new) <= ROLL_STAB_MAX
+
+
+def _sources(src):
+    """[(stage, room, path, stat), ...] for every Room<N>__room.csv under src, sorted."""
+    out = []
+    try:
+        stages = sorted((e for e in os.scandir(src) if e.is_dir()), key=lambda e: e.name)
+    except OSError:
+        return out
+    for sd in stages:
+        for e in sorted(os.scandir(sd.path), key=lambda e: e.name):
+            m = _ROOM_RE.match(e.name)
+            if m:
+                out.append((sd.name, int(m.group(1)), e.path, e.stat()))
+    return out
+
+
+def _signature(sources):
+    h = hashlib.blake2b(digest_size=16)
+    for stage, room, _path, st in sources:
+        h.update(b"%s/%d:%d:%d;" % (stage.encode("utf-8", "replace"), room, st.st_size,
+                                    st.st_mtime_ns))
+    return h.digest()
+
+
+def compile_index(src=SRC_DIR, path=INDEX_PATH, sources=None):
+    """Pack every room CSV under `src` into `path` (tmp + replace). Returns (rooms, rows)."""
+    sources = _sources(src) if sources is None else sources
+    rooms, vals, flags = [], array("f"), bytearray()
+    for stage, room, p, _st in sources:
+        first = len(flags)
+        with open(p, newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    v = [float(row[k]) for k in FIELDS]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                vals.extend(v)
+                flags.append(rollstab(v[3:6], v[6:9]))
+        rooms.append((stage, room, first, len(flags) - first))
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HDR.pack(MAGIC, VERSION, sys.byteorder == "little", _signature(sources),
+                          len(rooms), len(flags)))
+        for stage, room, first, n in rooms:
+            f.write(_ROOM.pack(stage.encode("ascii", "replace")[:16], room, first, n))
+        vals.tofile(f)
+        f.write(flags)
+    os.replace(tmp, path)
+    return len(rooms), len(flags)
+
+
+class SeamIndex:
+    """A compiled index, mapped read-only. room() hands back the overlay's clip dicts."""
+
+    def __init__(self, path=INDEX_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mm = self._mm
+        if len(mm) < _HDR.size:
+            raise ValueError("%s: truncated seam index" % path)
+        magic, ver, little, self.signature, n_rooms, n_rows = _HDR.unpack_from(mm, 0)
+        if magic != MAGIC or ver != VERSION or bool(little) != (sys.byteorder == "little"):
+            raise ValueError("%s: not a v%d seam index for this byte order" % (path, VERSION))
+        off = _HDR.size + n_rooms * _ROOM.size
+        if len(mm) != off + n_rows * (4 * ROW + 1):
+            raise ValueError("%s: truncated seam index" % path)
+        self.rooms = {}                 # (stage, room) -> (first row, count)
+        self.stages = {}                # stage -> [room, ...]
+        for stage, room, first, n in _ROOM.iter_unpack(mm[_HDR.size:off]):
+            stage = stage.rstrip(b"\0").decode("ascii", "replace")
+            self.rooms[(stage, room)] = (first, n)
+            self.stages.setdefault(stage, []).append(room)
+        self.values = memoryview(mm)[off:off + n_rows * 4 * ROW].cast("f")
+        self.flags = memoryview(mm)[off + n_rows * 4 * ROW:]
+
+    def __len__(self):
+        return len(self.flags)
+
+    def span(self, stage, room):
+        """(first row, count) of the room's seams; a stage with a single room CSV answers for any
+        room number (single-room stages / boss arenas whose room id differs). None if absent."""
+        s = self.rooms.get((stage, room))
+        if s is None:
+            rooms = self.stages.get(stage, ())
+            if len(rooms) == 1:
+                s = self.rooms[(stage, rooms[0])]
+        return s
+
+    def room(self, stage, room):
+        """The room's seams as [{"S", "old", "new", "ang", "rollstab"}, ...] (file order)."""
+        s = self.span(stage, room)
+        if s is None:
+            return []
+        first, n = s
+        v = self.values[first * ROW:(first + n) * ROW].tolist()
+        fl = self.flags[first:first + n]
+        return [{"S": (v[j], v[j + 1], v[j + 2]), "old": (v[j + 3], v[j + 4], v[j + 5]),
+                 "new": (v[j + 6], v[j + 7], v[j + 8]), "ang": v[j + 9], "rollstab": bool(fl[k])}
+                for k, j in enumerate(range(0, n * ROW, ROW))]
+
+    def close(self):
+        self.values.release()
+        self.flags.release()
+        self._mm.close()
+
+
+def load(src=SRC_DIR, path=INDEX_PATH):
+    """The index for `src`, (re)compiled first when missing, unreadable or stale. None when it can
+    be neither read nor written."""
+    sources = _sources(src)
+    sig = _signature(sources)
+    try:
+        idx = SeamIndex(path)
+        if idx.signature == sig:
+            return idx
+        idx.close()
+    except (OSError, ValueError):
+        pass
+    try:
+        compile_index(src, path, sources)
+        return SeamIndex(path)
+    except (OSError, ValueError):
+        return None
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ("build", "info"):
+        print(__doc__)
+        return 2
+    if argv[0] == "build":
+        src = argv[1] if len(argv) > 1 else SRC_DIR
+        out = argv[2] if len(argv) > 2 else INDEX_PATH
+        rooms, rows = compile_index(src, out)
+        print("%d rooms, %d seams -> %s" % (rooms, rows, out))
+        return 0
+    idx = SeamIndex(argv[1] if len(argv) > 1 else INDEX_PATH)
+    n_rs = sum(idx.flags)
+    print("%d stages, %d rooms, %d seams (%d roll-stab)"
+          % (len(idx.stages), len(idx.rooms), len(idx), n_rs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""ss_charge.py - look-ahead superswim charge planner (the brain of ss_navigator._run_charge).
+
+Given the MODELED facing (where the last snap put Link), the charge axis and the arrow tilt, the
+per-frame decision is deterministic: target the axis end farther from the facing (+ drift); if that
+isn't a >TURNAROUND_SNAP snap, walk onto the axis with a cam_sync.reorient_targets chain first.
+Each frame's target becomes the next frame's facing, so ChargePlanner plans the whole sequence for
+`horizon` game frames at once and afterwards just pops the next target. It replans only when the
+plan runs out or its inputs move: mode / held axis / tilt, or the live Link->dest bearing drifting
+more than `bearing_tol_hw` from the one the plan was made with. The plan is pure world-angle math;
+the camera only enters the per-frame de-rotation (stick()), which stays live.
+
+No `dolphin` imports (cam_sync loads headless), so it runs offline against a trace recorded by
+ss_navigator (CHARGE_TRACE_PATH):
+  python ss_charge.py trace.csv     -> replays it and reports target/stick mismatches
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cam_sync
+from ss_route import bearing_hw
+
+CHARGE_HORIZON = 16     # game frames planned per (re)plan
+TRACE_FIELDS = ("frame", "armed", "snap_hw", "offset_hw", "cur_x", "cur_z", "dest_x", "dest_z",
+                "angle_mode", "arrow_hw", "facing", "cam_yaw", "cam_target", "csx", "csy",
+                "target", "phase", "sx", "sy")
+
+
+def plan_charge(expected, axis, dest_bearing, arrow_hw, angle_mode, snap_hw, n):
+    """[(target, phase), ...] for the next `n` game frames starting from modeled facing `expected`
+    -- the same per-frame rule _run_charge used, with each reorient chain taken whole."""
+    angdiff = cam_sync.angdiff_hw
+    e0, e1 = axis, (axis + 0x8000) & 0xFFFF
+    out = []
+    while len(out) < n:
+        far = e0 if abs(angdiff(expected, e0)) > abs(angdiff(expected, e1)) else e1
+        drift = 0 if angle_mode else (-arrow_hw if angdiff(dest_bearing, far) >= 0 else arrow_hw)
+        want = (far + drift) & 0xFFFF
+        if abs(angdiff(want, expected)) > snap_hw:
+            out.append((want, "CHARGE"))
+        else:
+            chain = cam_sync.reorient_targets(expected, axis)
+            if chain:
+                out.extend((t, "REORIENT %d" % (len(chain) - i)) for i, t in enumerate(chain))
+            else:
+                out.append((far, "CHARGE*"))
+        expected = out[-1][0]
+    return out[:n]
+
+
+class ChargePlanner:
+    """Owns the charge state _run_charge used to keep in module globals.
+
+    arm() seeds the modeled facing (and, in angle mode, the held axis); step() runs once per game
+    frame and returns (target, phase); stick() de-rotates the held target every callback."""
+
+    def __init__(self, snap_hw, offset_hw, horizon=CHARGE_HORIZON, bearing_tol_hw=0x20):
+        self.snap_hw = snap_hw
+        self.offset_hw = offset_hw
+        self.horizon = horizon
+        self.bearing_tol_hw = bearing_tol_hw
+        self.active = False
+        self.angle_mode = False
+        self.goal = 0             # angle mode: facing captured at arm time (the fixed axis)
+        self.expected = 0         # modeled facing: where the last snap put Link
+        self.target = 0
+        self.phase = ""
+        self.replans = 0
+        self._plan = []
+        self._key = None          # (mode, goal, arrow_hw) the plan was made for
+        self._bearing = 0         # dest bearing the plan was made with
+
+    def arm(self, facing_hw, angle_mode):
+        self.active = True
+        self.angle_mode = angle_mode
+        self.expected = facing_hw & 0xFFFF
+        if angle_mode:
+            self.goal = self.expected
+        self._plan = []
+
+    def reset(self):
+        self.active = False
+        self._plan = []
+
+    def step(self, cur_x, cur_z, dest_x, dest_z, arrow_hw):
+        """Advance one game frame; replan if needed. Returns (target, phase)."""
+        if self.angle_mode:
+            bearing = self.goal
+        else:
+            bearing = bearing_hw(cur_x, cur_z, dest_x, dest_z)
+        key = (self.angle_mode, self.goal, arrow_hw)
+        if (not self._plan or key != self._key
+                or abs(cam_sync.angdiff_hw(bearing, self._bearing)) > self.bearing_tol_hw):
+            # Charge axis. Dest mode: the OFFSET perpendicular arrow-swim axis only applies while
+            # a tilt is dialed in; at 0 the axis is the dest bearing itself. Angle mode: the goal.
+            axis = bearing
+            if not self.angle_mode and arrow_hw:
+                axis = (bearing + self.offset_hw) & 0xFFFF
+            self._plan = plan_charge(self.expected, axis, bearing, arrow_hw, self.angle_mode,
+                                     self.snap_hw, self.horizon)
+            self._plan.reverse()          # pop() from the end
+            self._key, self._bearing = key, bearing
+            self.replans += 1
+        self.target, self.phase = self._plan.pop()
+        self.expected = self.target       # the snap lands here by the next game frame
+        return self.target, self.phase
+
+    def stick(self, csx, csy, steps=1, cam=None):
+        """Main stick for the held target under the predicted camera: ((sx, sy), csangle)."""
+        return cam_sync.charge_stick(self.target, csx, csy, steps, cam)
+
+
+# ── trace replay ────────────────────────────────────────────────────
+
+def replay(rows, horizon=CHARGE_HORIZON, bearing_tol_hw=0x20, steps=1):
+    """Feed recorded trace rows (dicts of TRACE_FIELDS) through a fresh ChargePlanner. Returns
+    (frames, target mismatches, stick mismatches, replans). Rows flagged `armed` (the live
+    planner was (re)armed that frame) start a fresh planner from their recorded facing."""
+    pl = None
+    n = bad_t = bad_s = replans = 0
+    for r in rows:
+        if pl is None or int(r["armed"]):
+            if pl is not None:
+                replans += pl.replans
+            pl = ChargePlanner(int(r["snap_hw"]), int(r["offset_hw"]), horizon, bearing_tol_hw)
+            pl.arm(int(r["facing"]), bool(int(r["angle_mode"])))
+        pl.step(float(r["cur_x"]), float(r["cur_z"]), float(r["dest_x"]), float(r["dest_z"]),
+                int(r["arrow_hw"]))
+        (sx, sy), _ = pl.stick(int(r["csx"]), int(r["csy"]), steps,
+                               (int(r["cam_yaw"]), int(r["cam_target"])))
+        n += 1
+        bad_t += pl.target != int(r["target"])
+        bad_s += (sx, sy) != (int(r["sx"]), int(r["sy"]))
+    return n, bad_t, bad_s, replans + (pl.replans if pl is not None else 0)
+
+
+def main() -> int:
+    import csv
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 2
+    if not cam_sync.loaded:
+        print("cam_sync tables not loaded: %s" % cam_sync.load_error)
+        return 1
+    with open(sys.argv[1], newline="") as f:
+        rows = list(csv.DictReader(f))
+    n, bad_t, bad_s, replans = replay(rows)
+    print("%d frames  %d target mismatches  %d stick mismatches  %d replans"
+          % (n, bad_t, bad_s, replans))
+    return 0 if not (bad_t or bad_s) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""ss_charge_sim.py - headless superswim charge simulator + regression benchmark.
+
+Drives the real charge code (ss_charge.ChargePlanner + cam_sync.charge_stick) with a fake
+controller, one game frame per step:
+  - camera: the bit-exact omega model (target += omega(csx,csy); yaw += trunc(s16(target-yaw)/2))
+    under a C-stick schedule (none / spin / random holds); the stick is chosen from the camera
+    PREDICTION and applied under the camera actually reached that frame,
+  - facing: the stick's mMainStickAngle + csangle + 0x8000 gives the commanded world facing; the
+    instant-turnaround snap fires iff it's > 0x6000 (135 deg) from the current facing and then
+    sets facing := command; otherwise the turnaround is missed and facing stays,
+  - position: each fired snap is one projection step (SS_SPEED along whichever of facing /
+    facing+180 heads closer to the destination, ss_navigator.ss_projection_points' rule); a miss
+    drops the charge for that frame.
+Reports snap success rate, progress toward the destination and path length per frame, and the
+Python time the planner + stick take per frame, so TURNAROUND_SNAP_DEG can be tuned offline at
+thousands of frames per second.
+
+The arrow-swim drift (the sideways motion, perpendicular to the charge axis, that a tilted charge
+buys) is NOT modeled: its size per frame hasn't been measured live. --tilt still runs the
+planner's tilted targets, so snap rate / replans show how much of the 180 - TURNAROUND_SNAP_DEG
+budget a tilt eats, but progress under tilt only counts projection steps and can't rank
+ARROW_SWIM_DEG; --sweep therefore varies the snap angle alone (at the given --tilt).
+
+  python ss_charge_sim.py [--frames N] [--trials N] [--snap DEG] [--tilt DEG]
+                          [--cstick none|spin|random] [--seed N] [--sweep]
+Needs the cam_sync tables (see cam_sync._resolve_tables); no Dolphin.
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import cam_sync
+from ss_charge import ChargePlanner
+from ss_route import bearing_hw
+
+SS_SPEED = 7000.0                 # matches ss_navigator.SS_SPEED
+OFFSET_DEG = 90.0                 # matches ss_navigator.OFFSET_DEG
+GAME_SNAP_HW = cam_sync.SNAP_HW   # the game's DIR_BACKWARD cone (fixed; not a tuning knob)
+_HW_PER_DEG = 65536.0 / 360.0
+
+_stick_ang = None
+
+
+def _stick_angles():
+    """{(sx, sy): mMainStickAngle} for the full-deflection sticks charge_stick can return."""
+    global _stick_ang
+    if _stick_ang is None:
+        _stick_ang = {stk: ang for ang, stk in zip(cam_sync._ANG, cam_sync._STK)}
+    return _stick_ang
+
+
+def _cstick_schedule(kind, rng):
+    """f(frame) -> (csx, csy) held that frame."""
+    if kind == "none":
+        return lambda f: (128, 128)
+    if kind == "spin":
+        return lambda f: (255, 128)
+    if kind == "random":
+        held = {"until": -1, "cs": (128, 128)}
+
+        def f(frame):
+            if frame >= held["until"]:
+                held["until"] = frame + rng.randint(5, 30)
+                held["cs"] = rng.choice(((128, 128), (128, 128),
+                                         (rng.randint(0, 255), rng.randint(0, 255))))
+            return held["cs"]
+        return f
+    raise ValueError("unknown C-stick schedule %r" % kind)
+
+
+def simulate(frames=2000, snap_deg=134.0, tilt_deg=0.0, cstick="spin", seed=0,
+             start=None, dest=None, predict_steps=1):
+    """One run. Returns a dict of counters (see report())."""
+    rng = random.Random(seed)
+    sticks = _stick_angles()
+    s16 = cam_sync.s16
+    snap_hw = int(round(snap_deg * _HW_PER_DEG))
+    tilt_hw = int(round(tilt_deg * _HW_PER_DEG))
+    pl = ChargePlanner(snap_hw, int(OFFSET_DEG * _HW_PER_DEG) & 0xFFFF)
+    x, z = start if start is not None else (rng.uniform(-3e5, 3e5), rng.uniform(-3e5, 3e5))
+    dx, dz = dest if dest is not None else (rng.uniform(-3e5, 3e5), rng.uniform(-3e5, 3e5))
+    facing = rng.randrange(0x10000)
+    yaw = rng.randrange(0x10000)
+    target = (yaw + rng.randint(-0x400, 0x400)) & 0xFFFF
+    cs = _cstick_schedule(cstick, rng)
+    pl.arm(facing, False)
+
+    d0 = math.hypot(dx - x, dz - z)
+    snaps = misses = n = 0
+    path = plan_t = 0.0
+    arrived = None
+    for f in range(frames):
+        csx, csy = cs(f)
+        t0 = time.perf_counter()
+        pl.step(x, z, dx, dz, tilt_hw)
+        (sx, sy), _pred = pl.stick(csx, csy, predict_steps, (yaw, target))
+        plan_t += time.perf_counter() - t0
+        n += 1
+
+        # The camera moves under the held C-stick; the stick is read against where it lands.
+        target = (target + cam_sync.omega_cmd(csx, csy)) & 0xFFFF
+        yaw = (yaw + int(s16(target - yaw) / 2)) & 0xFFFF
+        cmd = (sticks[(sx, sy)] + yaw) & 0xFFFF      # stick + csangle + 0x8000, csangle = yaw + 0x8000
+
+        if abs(s16(cmd - facing)) > GAME_SNAP_HW:
+            facing = cmd
+            snaps += 1
+            to_dest = bearing_hw(x, z, dx, dz)
+            h = facing if abs(s16(facing - to_dest)) <= 0x4000 else (facing + 0x8000) & 0xFFFF
+            rad = h * (2.0 * math.pi / 65536.0)
+            x += SS_SPEED * math.sin(rad)
+            z += SS_SPEED * math.cos(rad)
+            path += SS_SPEED
+        else:
+            misses += 1
+        if math.hypot(dx - x, dz - z) < SS_SPEED:
+            arrived = f + 1
+            break
+
+    return {"frames": n, "snaps": snaps, "misses": misses, "replans": pl.replans,
+            "progress": d0 - math.hypot(dx - x, dz - z), "path": path,
+            "plan_s": plan_t, "arrived": arrived}
+
+
+def run(trials=20, **kw):
+    """Aggregate `trials` seeded runs (seed, seed+1, ...) plus wall time."""
+    seed = kw.pop("seed", 0)
+    agg = {"frames": 0, "snaps": 0, "misses": 0, "replans": 0, "progress": 0.0, "path": 0.0,
+           "plan_s": 0.0, "arrived": 0}
+    t0 = time.perf_counter()
+    for i in range(trials):
+        r = simulate(seed=seed + i, **kw)
+        for k in agg:
+            if k == "arrived":
+                agg[k] += r[k] is not None
+            else:
+                agg[k] += r[k]
+    agg["wall_s"] = time.perf_counter() - t0
+    agg["trials"] = trials
+    return agg
+
+
+def report(a):
+    n = max(1, a["frames"])
+    return ("snap %6.2f%%  progress/frame %7.0f  path/frame %7.0f  arrived %d/%d  "
+            "replans/frame %.3f  plan %5.1f us/frame  sim %6.0f frames/s"
+            % (100.0 * a["snaps"] / n, a["progress"] / n, a["path"] / n, a["arrived"],
+               a["trials"], a["replans"] / n, 1e6 * a["plan_s"] / n, n / max(1e-9, a["wall_s"])))
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    opts = {"--frames": 2000, "--trials": 20, "--snap": 134.0, "--tilt": 0.0,
+            "--cstick": "spin", "--seed": 0}
+    sweep = "--sweep" in argv
+    if sweep:
+        argv.remove("--sweep")
+    while argv:
+        k = argv.pop(0)
+        if k not in opts or not argv:
+            print(__doc__)
+            return 2
+        opts[k] = type(opts[k])(argv.pop(0))
+    if not cam_sync.loaded:
+        print("cam_sync tables not loaded: %s" % cam_sync.load_error)
+        return 1
+    kw = {"frames": opts["--frames"], "trials": opts["--trials"], "cstick": opts["--cstick"],
+          "seed": opts["--seed"]}
+    if not sweep:
+        print(report(run(snap_deg=opts["--snap"], tilt_deg=opts["--tilt"], **kw)))
+        return 0
+    tilt = opts["--tilt"]
+    for snap in (130.0, 132.0, 134.0, 135.0):
+        if abs(tilt) >= 180.0 - snap:
+            continue
+        print("snap %5.1f  tilt %4.1f  %s" % (snap, tilt, report(run(snap_deg=snap, tilt_deg=tilt, **kw))))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@
 Superswim Navigator — shows where Link is on the Great Sea, which way he is
 facing, and projects the expected superswim path toward a clicked destination.
 - Scroll to zoom. Click the map to set a destination.
+- Route mode: clicks add waypoints; "Plan route" orders them (ss_route) and the
+  destination then advances leg by leg as Link arrives.
 - Driven by on_hostupdate so it stays live while the game is paused.
 """
 from __future__ import annotations
@@ -13,18 +15,24 @@ from typing import Optional, Tuple
 from dolphin import event, gui, controller, memory
 from ww import mathutils, game
 from ww.actors.player import Player
-from ww.mathutils import deg_to_halfword, wrap_deg
+from ww.mathutils import deg_to_halfword
 from ww.context.context import set_region
 from ww.context.detect import detect_region
 from ww.game import current_stage
+from ww.polyline import PolylineLOD
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))   # so `import cam_sync` resolves
 import cam_sync
+import chart_tiles
+from ss_charge import ChargePlanner, TRACE_FIELDS
+from ss_projection import ProjectionCache
+import ss_route
 
 # ── configuration ───────────────────────────────────────────────────
 PROJECTION_MAX_STEPS    = 4000   # safety cap; actual length tracks distance-to-dest
 PROJECTION_BUFFER_STEPS = 6      # extra steps carried straight through the destination
 SS_SPEED                = 7000.0
+ROUTE_ARRIVE_DIST       = SS_SPEED   # route mode: within this of the current waypoint -> next leg
 
 # ── charge config (merged from ss_charge_destination / ss_charge_facing_dir) ──
 # Two armed modes steer the superswim charge straight off the clicked destination, both
@@ -37,6 +45,7 @@ SS_SPEED                = 7000.0
 OFFSET_DEG        = 90    # 90 = charge axis perpendicular to the dest bearing (arrow-swim toward it)
 ARROW_SWIM_DEG    = 0     # drift tilt toward the dest (0 = pure charge, no drift)
 CAM_PREDICT_STEPS = 1     # 1 = predict next-frame csangle; 0 reproduces the old stale read
+CHARGE_TRACE_PATH = None  # e.g. ".cache/charge_trace.csv": log each planned frame for ss_charge.py replay
 FACING_ADDR       = 0x803EA3D2   # shape_angle.y (u16) -- the facing the reorient snap operates on
 _ARROW_HW         = int(round(ARROW_SWIM_DEG * 65536 / 360.0))
 
@@ -52,6 +61,9 @@ if not cam_sync.loaded:
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MAP_PATH = os.path.join(_SCRIPT_DIR, "assets", "great_sea_chart.png").replace("\\", "/")
+# Mipmap tile pyramid of the chart (chart_tiles.py; built into .cache/ on first run or when the
+# PNG changes). None -> draw the full chart image as before.
+_MAP_TILES = chart_tiles.ensure(MAP_PATH)
 
 IMG_W = 624
 IMG_H = 593
@@ -80,6 +92,7 @@ C_FG     = 0xFFEEEEEE
 C_DIM    = 0xFF777777
 C_SWIM   = 0xFF38E08A   # charging pulse (green) — sonar ping around Link + status pill
 C_REORI  = 0xFFFFB638   # reorienting pulse (amber)
+C_ROUTE  = 0xFFFF8AD8   # planned route legs / waypoints (pink)
 # decorative frame around the chart
 C_SEA      = 0xFF12203A   # deep-sea backdrop behind/around the map
 C_SEA_DK   = 0xFF0A1424   # darker vignette toward the edges
@@ -102,6 +115,8 @@ class ViewTransform:
         self._scale = 1.0
         self._default_zoom = default_zoom
         self._zoom_set = False  # apply default_zoom on the first valid viewport
+        self._tiles_key = None  # (view_key, pyramid dir) of the cached tile_draws list
+        self._tiles: list = []
 
     def _fit_scale(self) -> float:
         # Scale at which the chart fits the viewport with `margin` px of backdrop.
@@ -167,6 +182,47 @@ class ViewTransform:
         size = (cx1 - max(0.0, cx0), cy1 - max(0.0, cy0))
         return pos, size, (sx0, sy0, sx1, sy1)
 
+    def tile_draws(self, pyr: dict) -> list:
+        """[(path, pos, size, src)] for the chart_tiles pyramid tiles intersecting the viewport,
+        from the level whose texels are nearest one canvas px (coarsest that isn't magnified
+        below that). Same (pos, size, src-UV) convention as src_crop; cached per view."""
+        key = (self.view_key, pyr["dir"])
+        if key == self._tiles_key:
+            return self._tiles
+        ix0, iy0 = self.canvas_to_img(0, 0)
+        ix1, iy1 = self.canvas_to_img(self._zw, self._zh)
+        ix0, iy0 = max(0.0, ix0), max(0.0, iy0)
+        ix1, iy1 = min(float(self._img_w), ix1), min(float(self._img_h), iy1)
+        out = []
+        if ix1 > ix0 and iy1 > iy0:
+            levels = pyr["levels"]
+            lvl = 0
+            while lvl + 1 < len(levels) and self._scale * (2 ** (lvl + 1)) <= 1.0:
+                lvl += 1
+            lv, t = levels[lvl], pyr["tile"]
+            fx, fy = self._img_w / lv["w"], self._img_h / lv["h"]   # chart px per level px
+            for ty in range(int(iy0 / (t * fy)), min(lv["rows"], int(iy1 / (t * fy)) + 1)):
+                for tx in range(int(ix0 / (t * fx)), min(lv["cols"], int(ix1 / (t * fx)) + 1)):
+                    tw, th = min(t, lv["w"] - tx * t), min(t, lv["h"] - ty * t)
+                    ox, oy = tx * t * fx, ty * t * fy                    # tile origin, chart px
+                    ax0, ay0 = max(ix0, ox), max(iy0, oy)
+                    ax1, ay1 = min(ix1, ox + tw * fx), min(iy1, oy + th * fy)
+                    if ax1 <= ax0 or ay1 <= ay0:
+                        continue
+                    cx0, cy0 = self.img_to_canvas(ax0, ay0)
+                    cx1, cy1 = self.img_to_canvas(ax1, ay1)
+                    src = ((ax0 - ox) / (tw * fx), (ay0 - oy) / (th * fy),
+                           (ax1 - ox) / (tw * fx), (ay1 - oy) / (th * fy))
+                    out.append((chart_tiles.tile_path(pyr, lvl, tx, ty), (cx0, cy0),
+                                (cx1 - cx0, cy1 - cy0), src))
+        self._tiles_key, self._tiles = key, out
+        return out
+
+    @property
+    def view_key(self) -> Tuple[float, float, float, float, float]:
+        """Everything img_to_canvas reads; changes iff the zoom/pan/viewport does."""
+        return (self._scale, self._pan_ix, self._pan_iy, self._zw, self._zh)
+
     def zoom(self, notches: float, cx: float, cy: float) -> None:
         ix, iy = self.canvas_to_img(cx, cy)
         self._scale = max(self._min_scale, min(40.0, self._scale * (1.15 ** notches)))
@@ -195,6 +251,9 @@ def ss_projection_points(sx, sz, facing_hw, dx, dz, max_steps, speed, buffer_ste
 
     Once the path reaches the destination the heading is locked so the line carries
     `buffer_steps` straight through the destination before stopping.
+
+    Step-by-step reference; the live overlay uses the closed-form equivalent in ss_projection
+    through _proj_cache, which only recomputes when start/facing/dest/speed change.
     """
     pts = [(sx, sz)]
     x, z = sx, sz
@@ -273,6 +332,12 @@ _status = _panel.text("Click the map to set a destination")
 _btn_here = _panel.button("Set destination to Link's position")
 _chk_proj = _panel.checkbox("Show projection", checked=True)
 
+# --- multi-destination route: clicks collect waypoints, "Plan route" orders them from Link's
+# position (ss_route), and the destination then follows the route leg by leg ---
+_chk_route = _panel.checkbox("Route mode (clicks add waypoints)")
+_btn_plan  = _panel.button("Plan route")
+_btn_clear = _panel.button("Clear route")
+
 # --- superswim charge (drives the controller toward the selected destination) ---
 # One checkbox per mode; they're kept mutually exclusive in update() (checking one
 # clears the other). Both unchecked = disarmed.
@@ -328,6 +393,11 @@ _dest_x: float = 0.0
 _dest_z: float = 0.0
 _dest_set: bool = False
 
+# Route (host thread only). _route holds the waypoints -- in click order until planned, then in
+# visiting order; _route_leg indexes the current destination (None = not following a route).
+_route: list = []
+_route_leg: Optional[int] = None
+
 # Cached game state — written on the emu thread (frameadvance), read on the host
 # thread (hostupdate). Reading emulated memory off the emu thread is unsafe and
 # crashes Dolphin, so all memory access stays in _read_state().
@@ -346,15 +416,14 @@ _armed: bool = False
 _angle_mode: bool = False
 _dest_prev: bool = False      # last-frame checkbox states, for the mutual-exclusion edge check
 _angle_prev: bool = False
-_chg_active: bool = False    # charging this frame (latch identity tracked by _chg_key)
-_chg_key = None             # plan identity -- recapture the held facing when this changes
-_chg_goal: int = 0          # angle mode: Link's facing captured at arm time (the fixed axis)
-_chg_expected: int = 0      # MODEL facing: where the last snap put Link. Drives the alternation
-                            # instead of laggy live facing (the snap manifests 1 game frame late).
+_charge = ChargePlanner(_TURNAROUND_SNAP_HW, deg_to_halfword(OFFSET_DEG) & 0xFFFF)
+_chg_key = None             # plan identity -- re-arm (recapture the held facing) when this changes
 _chg_last_frame = None      # game frame of the last plan advance (gate; None = advance now)
-_chg_target: int = 0        # current commanded world facing target (also HUD)
-_chg_phase: str = ""        # HUD: current charge phase
+_trace_f = None             # CHARGE_TRACE_PATH file (opened on first use, closed on disarm)
+_trace_w = None             # csv writer over _trace_f
 _anim: int = 0              # host-side frame tick for canvas animation (swim ping / pill blink)
+_proj_cache = ProjectionCache()   # last projection; host ticks while paused reuse it as-is
+_proj_lod = PolylineLOD()         # its simplified canvas draw list, per projection x zoom/pan
 
 SEA_STAGE = "sea"
 
@@ -367,8 +436,27 @@ def _set_main(sx: float, sy: float) -> None:
 
 
 def _reset_charge() -> None:
-    global _chg_active
-    _chg_active = False
+    global _trace_f, _trace_w
+    _charge.reset()
+    if _trace_f is not None:        # the charge stopped: close the trace (reopened on append)
+        _trace_f.close()
+        _trace_f = _trace_w = None
+
+
+def _trace_charge(frame, armed, facing, cur_x, cur_z, cam, csx, csy, msx, msy) -> None:
+    global _trace_f, _trace_w
+    if _trace_w is None:
+        import csv
+        new = not os.path.exists(CHARGE_TRACE_PATH)
+        _trace_f = open(CHARGE_TRACE_PATH, "a", newline="", buffering=1)
+        _trace_w = csv.writer(_trace_f)
+        if new:
+            _trace_w.writerow(TRACE_FIELDS)
+    yaw, target = cam if cam is not None else (0, 0)
+    _trace_w.writerow((frame, int(armed), _charge.snap_hw, _charge.offset_hw,
+                       "%.3f" % cur_x, "%.3f" % cur_z, "%.3f" % _dest_x, "%.3f" % _dest_z,
+                       int(_angle_mode), _ARROW_HW, facing, yaw, target, csx, csy,
+                       _charge.target, _charge.phase, msx, msy))
 
 
 def _run_charge(cur_x: float, cur_z: float) -> None:
@@ -381,83 +469,48 @@ def _run_charge(cur_x: float, cur_z: float) -> None:
     fires (the original open-loop bug). The stick itself is re-issued every callback so it
     de-rotates against the live camera (set_gc_buttons auto-clears).
 
-    Facing is MODELED (_chg_expected = where the last snap put Link), not read live: the
-    instant-turnaround snaps shape_angle exactly onto the commanded charge each game frame
-    but manifests in RAM a frame late, so live facing lags and breaks the alternation.
-    Seeded once from the real facing at arm time; thereafter it equals the last command.
-
-    Each game frame: pick the charge axis, take the end FARTHER from the modeled facing as
-    the turnaround target (auto-alternates 180°), and check it's inside the instant-snap
-    window -- |angdiff(target, facing)| > 135° (0x6000), the DIR_BACKWARD cone from the
-    decomp. If yes, snap it (clean charge). If NOT (the axis rotated near-perpendicular to
-    facing, or the arrow tilt pushed the target under the 45° budget) a single snap can't
-    reach it, so plan a chain of valid >135° snaps onto the axis with reorient_targets and
-    take step 1 -- re-planned each frame, exactly the start-of-script reorient, now applied
-    continuously to any turnaround that falls outside the window.
+    Facing is MODELED (where the last snap put Link), not read live: the instant-turnaround
+    snaps shape_angle exactly onto the commanded charge each game frame but manifests in RAM a
+    frame late, so live facing lags and breaks the alternation. Seeded once from the real
+    facing at arm time; thereafter it equals the last command.
+
+    The turnaround/reorient rule itself lives in ss_charge.ChargePlanner: it plans the next
+    CHARGE_HORIZON game frames of snap targets at once (far axis end + tilt when that's a
+    >TURNAROUND_SNAP snap, else a reorient_targets chain onto the axis) and replans only when
+    the mode, tilt or Link->dest bearing moves, so each game frame here is pop + de-rotate.
     """
-    global _chg_active, _chg_key, _chg_goal, _chg_expected, _chg_last_frame
-    global _chg_target, _chg_phase
+    global _chg_key, _chg_last_frame
 
     if not cam_sync.loaded:
         return
 
     inp = controller.get_gc_buttons(0)
     csx, csy = int(inp.get("CStickX", 128)), int(inp.get("CStickY", 128))
-    arrow_on = _ARROW_HW != 0
 
     # (Re)arm: seed the modeled facing from the real facing once, and force a plan advance
     # this callback. Angle mode also captures that facing as its fixed axis.
     key = ("angle",) if _angle_mode else ("dest",)
-    if (not _chg_active) or key != _chg_key:
+    armed = False
+    if (not _charge.active) or key != _chg_key:
         _chg_key = key
-        _chg_active = True
-        _chg_expected = memory.read_u16(FACING_ADDR) & 0xFFFF
-        if _angle_mode:
-            _chg_goal = _chg_expected
+        _charge.arm(memory.read_u16(FACING_ADDR), _angle_mode)
         _chg_last_frame = None
+        armed = True
 
     # Advance the plan once per game frame; otherwise hold the last command.
     frame = game.frame()
-    if _chg_last_frame is None or frame != _chg_last_frame:
+    advanced = _chg_last_frame is None or frame != _chg_last_frame
+    if advanced:
         _chg_last_frame = frame
-
-        # Charge axis. Dest mode: the OFFSET_DEG (90°) perpendicular arrow-swim axis applies
-        # only when a tilt is dialed in; at 0 the axis is the dest bearing itself (straight
-        # charge toward the dest, matching the projection). Angle mode: the captured facing.
-        if _angle_mode:
-            axis = _chg_goal
-            dest_bearing = _chg_goal           # no drift in angle mode; placeholder
-        else:
-            dest_bearing = deg_to_halfword(
-                wrap_deg(math.degrees(math.atan2(_dest_x - cur_x, _dest_z - cur_z)))) & 0xFFFF
-            offset = (deg_to_halfword(OFFSET_DEG) & 0xFFFF) if arrow_on else 0
-            axis = (dest_bearing + offset) & 0xFFFF
-        e0, e1 = axis, (axis + 0x8000) & 0xFFFF
-
-        # Turnaround target = axis end FARTHER from the modeled facing (the big-angle snap;
-        # after snapping to one end the other becomes the far one -> auto 180° alternation).
-        # Arrow tilt biases facing AWAY from the dest so the ⊥ drift heads toward it.
-        far = e0 if abs(cam_sync.angdiff_hw(_chg_expected, e0)) > abs(cam_sync.angdiff_hw(_chg_expected, e1)) else e1
-        drift = 0 if _angle_mode else (-_ARROW_HW if cam_sync.angdiff_hw(dest_bearing, far) >= 0 else _ARROW_HW)
-        want = (far + drift) & 0xFFFF
-
-        if abs(cam_sync.angdiff_hw(want, _chg_expected)) > _TURNAROUND_SNAP_HW:
-            _chg_target, _chg_phase = want, "CHARGE"
-        else:
-            # Outside the snap window -> plan a snap chain onto the axis, take step 1.
-            chain = cam_sync.reorient_targets(_chg_expected, axis)
-            if chain:
-                _chg_target, _chg_phase = chain[0], "REORIENT %d" % len(chain)
-            else:
-                # On-axis but the tilt pushed `want` under the 45° budget: snap the far end
-                # untilted this frame to keep charging (drops the drift bias, not the snap).
-                _chg_target, _chg_phase = far, "CHARGE*"
-
-        _chg_expected = _chg_target            # the snap lands here by the next game frame
+        facing = _charge.expected
+        _charge.step(cur_x, cur_z, _dest_x, _dest_z, _ARROW_HW)
 
     # Every callback: de-rotate the held target for the live camera and issue it.
-    (msx, msy), _pred = cam_sync.charge_stick(_chg_target, csx, csy, CAM_PREDICT_STEPS)
+    cam = cam_sync.read_cam_state()
+    (msx, msy), _pred = _charge.stick(csx, csy, CAM_PREDICT_STEPS, cam)
     _set_main(msx, msy)
+    if advanced and CHARGE_TRACE_PATH:
+        _trace_charge(frame, armed, facing, cur_x, cur_z, cam, csx, csy, msx, msy)
 
 # ── memory read (emu thread only) ───────────────────────────────────
 @event.on_frameadvance
@@ -505,7 +558,7 @@ def _read_state() -> None:
 # ── input + draw (host thread; safe while paused) ───────────────────
 @event.on_hostupdate
 def update() -> None:
-    global _dest_x, _dest_z, _dest_set, _cal_shown
+    global _dest_x, _dest_z, _dest_set, _cal_shown, _route, _route_leg
     global _armed, _angle_mode, _dest_prev, _angle_prev, _ARROW_HW, _anim
 
     _anim += 1
@@ -561,19 +614,43 @@ def update() -> None:
         _cal_shown = _chk_cal.checked
         _set_calibration_visible(_cal_shown)
 
+    # ── button: drop the route (on or off the sea) ───────────────
+    if _btn_clear.clicked:
+        _route, _route_leg = [], None
+
     if have and on_sea:
         # ── button: snap destination to Link's current position ───
         if _btn_here.clicked:
             _dest_x, _dest_z = cur_x, cur_z
             _dest_set = True
+            _route, _route_leg = [], None
 
-        # ── click: set destination ────────────────────────────────
+        # ── click: set destination (route mode: add a waypoint) ───
         click = _canvas.take_click()
         if click is not None:
             ix, iy = _view.canvas_to_img(click[0], click[1])
-            _dest_x = WORLD_LEFT + (ix - g_left) / (g_right - g_left) * (WORLD_RIGHT - WORLD_LEFT)
-            _dest_z = WORLD_TOP  + (iy - g_top)  / (g_bottom - g_top) * (WORLD_BOTTOM - WORLD_TOP)
-            _dest_set = True
+            wx = WORLD_LEFT + (ix - g_left) / (g_right - g_left) * (WORLD_RIGHT - WORLD_LEFT)
+            wz = WORLD_TOP  + (iy - g_top)  / (g_bottom - g_top) * (WORLD_BOTTOM - WORLD_TOP)
+            if _chk_route.checked:
+                if _route_leg is not None:        # editing a planned route starts a new one
+                    _route, _route_leg = [], None
+                _route.append((wx, wz))
+            else:
+                _dest_x, _dest_z = wx, wz
+                _dest_set = True
+                _route, _route_leg = [], None
+
+        # ── route: plan from Link's position, then follow it leg by leg ──
+        if _btn_plan.clicked and _route:
+            order, _legs = ss_route.plan_route((cur_x, cur_z), _route, SS_SPEED)
+            _route = [_route[i] for i in order]
+            _route_leg = 0
+            (_dest_x, _dest_z), _dest_set = _route[0], True
+        if _route_leg is not None and \
+                mathutils.dist2d(cur_x, cur_z, _dest_x, _dest_z) < ROUTE_ARRIVE_DIST and \
+                _route_leg + 1 < len(_route):
+            _route_leg += 1
+            _dest_x, _dest_z = _route[_route_leg]
     else:
         # consume inputs so they don't queue up
         _canvas.take_click()
@@ -587,7 +664,7 @@ def update() -> None:
     # Charging this frame? Mirror the emu-thread gate (in _read_state) so the on-canvas
     # swim indicator matches when the controller is actually being driven.
     charging = bool(_armed and have and on_sea and (_angle_mode or _dest_set))
-    _reorienting = charging and _chg_phase.startswith("REORIENT")
+    _reorienting = charging and _charge.phase.startswith("REORIENT")
     _swim_rgb = (C_REORI if _reorienting else C_SWIM) & 0x00FFFFFF
 
     # ── draw ──────────────────────────────────────────────────────
@@ -599,7 +676,11 @@ def update() -> None:
 
     pos, size, src = _view.src_crop()
     if size[0] > 0 and size[1] > 0:
-        _canvas.image(MAP_PATH, pos, size, src=src)
+        if _MAP_TILES is not None:
+            for path, tpos, tsize, tsrc in _view.tile_draws(_MAP_TILES):
+                _canvas.image(path, tpos, tsize, src=tsrc)
+        else:
+            _canvas.image(MAP_PATH, pos, size, src=src)
         # decorative double frame hugging the rendered chart
         x0, y0 = pos
         x1, y1 = pos[0] + size[0], pos[1] + size[1]
@@ -613,6 +694,18 @@ def update() -> None:
             _canvas.line((ax - 5 * sx, ay - 5 * sy), (ax - 5 * sx + cl * sx, ay - 5 * sy), C_CORNER, 2.5)
             _canvas.line((ax - 5 * sx, ay - 5 * sy), (ax - 5 * sx, ay - 5 * sy + cl * sy), C_CORNER, 2.5)
 
+    # Route: remaining legs from the current destination (planned) or the raw waypoints.
+    if _route and on_sea:
+        rest = _route[_route_leg:] if _route_leg is not None else _route
+        rpts = [w2c(wx, wz) for wx, wz in rest]
+        if _route_leg is not None:
+            for i in range(len(rpts) - 1):
+                _canvas.line(rpts[i], rpts[i + 1], C_ROUTE, 1.5)
+        first = _route_leg or 0
+        for k, rp in enumerate(rpts):
+            _canvas.circle(rp, 4.0, C_ROUTE, 1.5)
+            _canvas.text((rp[0] + 5, rp[1] - 14), C_ROUTE, str(first + k + 1))
+
     if have and on_sea:
         # Link dot + facing arrow
         lx, ly = w2c(cur_x, cur_z)
@@ -642,13 +735,17 @@ def update() -> None:
             if show_proj and facing_hw is not None:
                 need  = int(mathutils.dist2d(cur_x, cur_z, _dest_x, _dest_z) / SS_SPEED) + 2
                 steps = max(1, min(PROJECTION_MAX_STEPS, need + PROJECTION_BUFFER_STEPS))
-                pts   = ss_projection_points(cur_x, cur_z, facing_hw,
-                                             _dest_x, _dest_z, steps, SS_SPEED,
-                                             PROJECTION_BUFFER_STEPS)
-                cpts = [w2c(wx, wz) for wx, wz in pts]
-                for i in range(len(cpts) - 1):
-                    _canvas.line(cpts[i], cpts[i + 1], C_PROJ, 1.5)
-                for pt in cpts[1:]:
+                pts   = _proj_cache.get(cur_x, cur_z, facing_hw,
+                                        _dest_x, _dest_z, steps, SS_SPEED,
+                                        PROJECTION_BUFFER_STEPS)
+                # Screen-space LOD: only the segments/dots visible at this zoom (cached per
+                # projection x view), not one line + one dot per 7000-unit step.
+                segs, dots = _proj_lod.get(_proj_cache.version,
+                                           (_view.view_key, g_left, g_right, g_top, g_bottom),
+                                           pts, w2c, (0.0, 0.0, cw, ch))
+                for a, b in segs:
+                    _canvas.line(a, b, C_PROJ, 1.5)
+                for pt in dots:
                     _canvas.circle_filled(pt, 2, C_PROJ)
 
     # ── "waiting for sea" overlay (drawn on top of the dimmed map) ──
@@ -674,7 +771,7 @@ def update() -> None:
 
     # ── swim status pill (top-left of the canvas; fixed size, never resizes the window) ──
     if charging:
-        label = _chg_phase or "SWIM"
+        label = _charge.phase or "SWIM"
         pill_w = 30.0 + len(label) * 7.0
         _canvas.rect_filled((6, 6), (6 + pill_w, 25), 0xCC10101A, 5.0)
         _canvas.rect((6, 6), (6 + pill_w, 25), 0x66000000 | _swim_rgb, 5.0, 1.0)
@@ -692,10 +789,13 @@ def update() -> None:
     # here lengthened the QLabel and grew the whole window. Keep this line fixed-width-ish.
     if not on_sea:
         _status.set(f"Not on Great Sea  (stage: {_current_stage or '—'})")
+    elif _route and _route_leg is None:
+        _status.set(f"Route: {len(_route)} waypoints  (Plan route to order + follow)")
     elif _dest_set and have:
         atd = mathutils.angle2d_hw(cur_x, cur_z, _dest_x, _dest_z)
         qd  = mathutils.dist2d(cur_x, cur_z, _dest_x, _dest_z) / 100_000.0
-        _status.set(f"Dest  X={_dest_x:.0f}  Z={_dest_z:.0f}     "
+        leg = f"Leg {_route_leg + 1}/{len(_route)}  " if _route_leg is not None else ""
+        _status.set(f"{leg}Dest  X={_dest_x:.0f}  Z={_dest_z:.0f}     "
                     f"Angle to dest={atd}     Quadrants={qd:.4f}")
     else:
         _status.set("Click the map to set a destination")
@@ -0,0 +1,123 @@
+"""ss_projection.py - closed-form superswim path projection + a last-result cache.
+
+Same model as ss_navigator.ss_projection_points (the step-by-step reference): each step Link moves
+`speed` along whichever of his facing H / H+180 heads closer to the destination, and once a step
+lands within `speed` of it the heading locks and carries `buffer_steps` through. Because the two
+headings are opposite, every point lies on ONE line through the start along H, so the whole path is
+a function of two scalars -- the destination's along-line offset `tf` and its squared cross-line
+distance -- and the step count:
+  - approach: step toward tf until the step that crosses it,
+  - lock: the first approach step within `speed` of the destination (if any) then straight on,
+    or the bounce back onto the start when the very first step overshoots,
+  - otherwise: bounce between the two points straddling tf until max_steps.
+ss_projection_points_fast builds that from integer step counts (no per-step trig, atan2 or hypot);
+ProjectionCache keeps the last result so an unchanged (start, facing, dest, speed) is free.
+
+Pure math, no `dolphin` / `ww` imports, so it also loads in offline tools and worker processes.
+"""
+import math
+
+HW_TO_RAD = 2.0 * math.pi / 65536.0
+
+
+def _lock_step(tf_abs, e2, speed, n_app):
+    """First approach step k (1..n_app) whose point is within `speed` of the destination, else None.
+    Step k sits |tf| - k*speed from the foot of the destination (k < n_app), then crosses it."""
+    r2 = speed * speed - e2
+    if r2 <= 0.0:
+        return None
+    r = math.sqrt(r2)
+    k = max(1, int(math.floor((tf_abs - r) / speed)) + 1)
+    if k < n_app:
+        return k
+    over = n_app * speed - tf_abs
+    return n_app if over * over < r2 else None
+
+
+def _approach(tf, speed):
+    """(direction, steps until the approach crosses tf)."""
+    if tf >= 0.0:
+        return 1.0, int(tf // speed) + 1                  # forward while t <= tf (ties keep H)
+    return -1.0, max(1, int(math.ceil(-tf / speed)))     # backward while t > tf
+
+
+def lock_steps(tf, e2, speed):
+    """Steps until the projection locks onto the destination (the cost of reaching it), or None
+    when it never does and just bounces across it."""
+    if speed <= 0.0:
+        return None
+    _sgn, n_app = _approach(tf, speed)
+    k_lock = _lock_step(abs(tf), e2, speed, n_app)
+    if k_lock is not None:
+        return k_lock
+    if n_app == 1 and tf * tf + e2 < speed * speed:
+        return 2                                          # bounce-onto-start lock, see below
+    return None
+
+
+def projection_offsets(tf, e2, max_steps, speed, buffer_steps=0):
+    """Signed along-facing offsets of each projected step (list, start excluded). `tf` is the
+    destination's offset along the facing line, `e2` its squared distance off that line."""
+    if max_steps <= 0 or speed <= 0.0:
+        return []
+    sgn, n_app = _approach(tf, speed)
+    step = sgn * speed
+    k_lock = _lock_step(abs(tf), e2, speed, n_app)
+    if k_lock is not None:
+        n = min(max_steps, k_lock + max(0, buffer_steps - 1))
+        return [step * k for k in range(1, n + 1)]
+    if n_app >= max_steps:
+        return [step * k for k in range(1, max_steps + 1)]
+    if n_app == 1 and tf * tf + e2 < speed * speed:
+        # The first step overshoots and the bounce lands back on the start -- a point the reference
+        # never lock-checks on the way out -- so it locks there, heading back the other way.
+        n = min(max_steps, 2 + max(0, buffer_steps - 1))
+        return [step] + [-step * k for k in range(0, n - 1)]
+    out = [step * k for k in range(1, n_app + 1)]
+    near, far = step * (n_app - 1), step * n_app         # bounce across the foot of the dest
+    rest = max_steps - n_app
+    out.extend([near, far] * (rest // 2))
+    if rest % 2:
+        out.append(near)
+    return out
+
+
+def facing_frame(sx, sz, facing_hw, dx, dz):
+    """(unit facing x, z, tf, e): the facing line through the start and the destination's
+    along-line offset / signed cross-line distance."""
+    rad = (facing_hw & 0xFFFF) * HW_TO_RAD
+    ux, uz = math.sin(rad), math.cos(rad)
+    rx, rz = dx - sx, dz - sz
+    return ux, uz, rx * ux + rz * uz, rx * uz - rz * ux
+
+
+def ss_projection_points_fast(sx, sz, facing_hw, dx, dz, max_steps, speed, buffer_steps=0):
+    """Closed-form ss_navigator.ss_projection_points: same arguments, same [(x, z), ...] points."""
+    ux, uz, tf, e = facing_frame(sx, sz, facing_hw, dx, dz)
+    offs = projection_offsets(tf, e * e, max_steps, speed, buffer_steps)
+    pts = [(sx, sz)]
+    pts.extend((sx + t * ux, sz + t * uz) for t in offs)
+    return pts
+
+
+class ProjectionCache:
+    """Keeps the last projection and recomputes only when an input changes. `version` bumps on
+    every recompute so downstream caches (canvas transforms, LOD) can key on it."""
+
+    def __init__(self):
+        self._key = None
+        self.points = []
+        self.version = 0
+
+    def get(self, sx, sz, facing_hw, dx, dz, max_steps, speed, buffer_steps=0):
+        key = (sx, sz, facing_hw & 0xFFFF, dx, dz, max_steps, speed, buffer_steps)
+        if key != self._key:
+            self._key = key
+            self.points = ss_projection_points_fast(sx, sz, facing_hw, dx, dz,
+                                                    max_steps, speed, buffer_steps)
+            self.version += 1
+        return self.points
+
+    def clear(self):
+        self._key = None
+        self.points = []
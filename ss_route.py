@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""ss_route.py - multi-destination superswim route planner for the Great Sea.
+
+Orders a set of waypoints (sector centres, chart spots, islands) into the cheapest open route from
+a start position, using the same cost model as the navigator's projection:
+  - a leg A -> B is swum with the charge axis on the A->B bearing, quantized to the halfword the
+    charge actually commands (ss_navigator._run_charge), and
+  - costs steps x speed, where steps = ss_projection.lock_steps -- the approach along the
+    H / H+180 alternation until it locks onto B.
+The pairwise matrix is computed in-process, or across a process pool for large sets when the
+caller allows it (never from inside Dolphin: the embedded interpreter can't spawn workers).
+The visiting order is nearest-neighbour, then improved with 2-opt and Or-opt (chains of 1..3)
+until a pass finds nothing.
+
+Pure math, no `dolphin` / `ww` imports (offline use + worker processes). CLI:
+  python ss_route.py waypoints.csv [start_x start_z] [--workers N]
+where each CSV row is `x,z[,label]` (a header row is skipped). Prints the order and leg costs.
+"""
+import math
+import os
+import sys
+
+from ss_projection import facing_frame, lock_steps
+
+SS_SPEED = 7000.0          # matches ss_navigator.SS_SPEED
+POOL_MIN_POINTS = 400      # below this the pool's spawn/pickle overhead outweighs the matrix
+_HW_PER_DEG = 65536.0 / 360.0
+
+
+def bearing_hw(ax, az, bx, bz):
+    """Charge facing for the leg A -> B (same rounding as ss_navigator's dest_bearing)."""
+    return int((math.degrees(math.atan2(bx - ax, bz - az)) % 360.0) * _HW_PER_DEG) & 0xFFFF
+
+
+def leg_steps(ax, az, bx, bz, speed=SS_SPEED):
+    """Superswim steps from A until the projection locks onto B."""
+    if ax == bx and az == bz:
+        return 0
+    _ux, _uz, tf, e = facing_frame(ax, az, bearing_hw(ax, az, bx, bz), bx, bz)
+    n = lock_steps(tf, e * e, speed)
+    if n is None:   # only reachable through quantization at extreme range; plain step count
+        n = int(math.hypot(bx - ax, bz - az) // speed) + 1
+    return n
+
+
+def _cost_rows(args):
+    pts, speed, lo, hi = args
+    out = []
+    for i in range(lo, hi):
+        ax, az = pts[i]
+        out.append([0.0 if i == j else leg_steps(ax, az, bx, bz, speed) * speed
+                    for j, (bx, bz) in enumerate(pts)])
+    return out
+
+
+def cost_matrix(pts, speed=SS_SPEED, workers=0):
+    """n x n list of leg costs (world units) between `pts` [(x, z), ...]. `workers`: 0 = serial,
+    None = os.cpu_count(); the pool is only used from POOL_MIN_POINTS points up."""
+    n = len(pts)
+    pts = [(float(x), float(z)) for x, z in pts]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or n < POOL_MIN_POINTS:
+        return _cost_rows((pts, speed, 0, n))
+    from concurrent.futures import ProcessPoolExecutor
+    chunk = max(1, -(-n // (workers * 4)))
+    jobs = [(pts, speed, lo, min(n, lo + chunk)) for lo in range(0, n, chunk)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for part in ex.map(_cost_rows, jobs):
+            rows.extend(part)
+    return rows
+
+
+def route_cost(c, tour):
+    return sum(c[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+
+
+def _nearest_neighbour(c, n):
+    tour, left = [0], set(range(1, n))
+    while left:
+        row = c[tour[-1]]
+        nxt = min(left, key=row.__getitem__)
+        tour.append(nxt)
+        left.discard(nxt)
+    return tour
+
+
+def _two_opt(c, tour):
+    """One 2-opt pass over the open path (index 0 fixed). Leg costs are symmetric up to the
+    bearing quantization, so a reversed segment keeps its internal cost."""
+    n = len(tour)
+    improved = False
+    for i in range(1, n - 1):
+        a = tour[i - 1]
+        for k in range(i + 1, n):
+            b, d = tour[i], tour[k]
+            delta = c[a][d] - c[a][b]
+            if k + 1 < n:
+                e = tour[k + 1]
+                delta += c[b][e] - c[d][e]
+            if delta < -1e-6:
+                tour[i:k + 1] = tour[i:k + 1][::-1]
+                improved = True
+    return improved
+
+
+def _or_opt(c, tour):
+    """One Or-opt pass: move chains of 1..3 stops to the cheapest other gap (or the end)."""
+    improved = False
+    for seg in (1, 2, 3):
+        i = 1
+        while i + seg <= len(tour):
+            n = len(tour)
+            p, f, l = tour[i - 1], tour[i], tour[i + seg - 1]
+            q = tour[i + seg] if i + seg < n else None
+            gain = c[p][f] + (c[l][q] - c[p][q] if q is not None else 0.0)
+            rest = tour[:i] + tour[i + seg:]
+            best, at = 1e-6, -1
+            for j in range(len(rest)):
+                if j == i - 1:
+                    continue
+                u = rest[j]
+                v = rest[j + 1] if j + 1 < len(rest) else None
+                add = c[u][f] + (c[l][v] - c[u][v] if v is not None else 0.0)
+                if gain - add > best:
+                    best, at = gain - add, j
+            if at >= 0:
+                tour[:] = rest[:at + 1] + tour[i:i + seg] + rest[at + 1:]
+                improved = True
+            else:
+                i += 1
+    return improved
+
+
+def solve_order(c, max_passes=50):
+    """Open-path visiting order over matrix `c`, starting at index 0."""
+    n = len(c)
+    if n <= 2:
+        return list(range(n))
+    tour = _nearest_neighbour(c, n)
+    for _ in range(max_passes):
+        if not (_two_opt(c, tour) | _or_opt(c, tour)):
+            break
+    return tour
+
+
+def plan_route(start, waypoints, speed=SS_SPEED, workers=0):
+    """Order `waypoints` [(x, z), ...] from `start` (x, z). Returns (order, legs): `order` indexes
+    into `waypoints`, `legs[k]` is the cost (world units) of reaching order[k]."""
+    pts = [tuple(start)] + [tuple(w) for w in waypoints]
+    c = cost_matrix(pts, speed, workers)
+    tour = solve_order(c)
+    legs = [c[tour[k]][tour[k + 1]] for k in range(len(tour) - 1)]
+    return [t - 1 for t in tour[1:]], legs
+
+
+# ── CLI ─────────────────────────────────────────────────────────────
+
+def _load_waypoints(path):
+    import csv
+    pts, labels = [], []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            try:
+                x, z = float(row[0]), float(row[1])
+            except (ValueError, IndexError):
+                continue                      # header / malformed row
+            pts.append((x, z))
+            labels.append(row[2].strip() if len(row) > 2 else str(len(pts)))
+    return pts, labels
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    workers = None
+    if "--workers" in argv:
+        k = argv.index("--workers")
+        workers = int(argv[k + 1])
+        del argv[k:k + 2]
+    if not argv:
+        print(__doc__)
+        return 2
+    pts, labels = _load_waypoints(argv[0])
+    if not pts:
+        print("no waypoints in %s" % argv[0])
+        return 1
+    if len(argv) >= 3:
+        start = (float(argv[1]), float(argv[2]))
+    else:
+        start, pts, labels = pts[0], pts[1:], labels[1:]
+    order, legs = plan_route(start, pts, SS_SPEED, workers)
+    total = 0.0
+    for k, (i, cost) in enumerate(zip(order, legs)):
+        total += cost
+        print("%3d  %-16s x=%9.0f z=%9.0f  leg=%7.0f steps  total=%8.0f"
+              % (k + 1, labels[i], pts[i][0], pts[i][1], cost / SS_SPEED, total / SS_SPEED))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,14 @@ surfaces the game tests against.
 Self-contained on purpose (mirrors `ww/cull.py`): the caller passes a reader object exposing a
 single `read_bytes(gc_addr, n) -> bytes` method over big-endian GC RAM; all typed reads are built
 on top of it with `struct`. No dependency on `ww.memory` or the `dolphin` module, so it imports and
-type-checks outside Dolphin.
+type-checks outside Dolphin. NumPy is optional: when importable, the vertex/triangle tables are
+decoded vectorized (decode_mesh_tables); otherwise the pure-struct path runs, with identical output.
+Decoded static meshes (centroids, classes, spatial grid) are also kept on disk under
+.cache/collision/, keyed by stage + a hash of the live table bytes, so revisiting a room skips the
+decode (see _load_mesh / _save_mesh). CollisionQuery answers ground-height / raycast / wall-sweep
+queries against the triangles of a snapshot (or of a DZB file via mesh_from_tables), so brute-force
+scripts can screen candidates offline in microseconds instead of emulating frames. mesh_lods builds
+a few vertex-clustered copies of a static mesh (class boundaries kept) for drawing far geometry.
 
 RAM model (JP/GZLJ01, validated live 2026-07-06 on stage H_test; see knowledge/mechanics/collision.md):
 
@@ -25,12 +32,35 @@ RAM model (JP/GZLJ01, validated live 2026-07-06 on stage H_test; see knowledge/m
         +0x00 s32 m_v_num   +0x04 Vtx* m_v_tbl   (local verts; 12B: f32 x,y,z)
         +0x08 s32 m_t_num   +0x0C Tri* m_t_tbl   (10B: u16 vtx0,vtx1,vtx2,id,grp)
         +0x20 s32 m_g_num   +0x24 Grp* m_g_tbl   (0x34 each)
-        +0x28 s32 m_ti_num  +0x2C Ti*  m_ti_tbl  (16B property records)
+        +0x28 s32 m_ti_num  +0x2C Ti*  m_ti_tbl  (16B property records, indexed by Tri.id;
+                                                decoded per triangle into mesh["props"])
 
 Link's current floor triangle: dBgS_LinkAcch ptr @ 0x803BD910 → +0x554 u16 polyIndex,
 +0x556 u16 bgIndex (the manager slot). roof at +0x594. 0xFFFF / 0x100 = none.
 """
+import hashlib
+import heapq
+import math
+import os
 import struct
+import sys
+from array import array
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:      # Dolphin's embedded Python usually lacks it; the struct path covers it
+    np = None
+
+USE_NUMPY = np is not None   # set False to force the pure path (e.g. to compare / benchmark)
+
+DISK_CACHE = True            # persist decoded static meshes across sessions (set False to disable)
+DISK_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              ".cache", "collision")
+_DISK_MAGIC = b"WWCG"
+_DISK_VERSION = 1
+_DISK_HDR = struct.Struct("<4sBBxxii16sdi")  # magic, version, little-endian?, v_num, t_num, key, cell, n_cells
+DISK_CACHE_MAX_BYTES = 128 << 20  # size cap; least recently used files are pruned after each save
 
 # --- JP/GZLJ01 addresses ------------------------------------------------------------------
 DBGS               = 0x803B93A8   # dBgS collision manager (cBgS_ChkElm m_chk_element[256] @ +0)
@@ -49,6 +79,13 @@ FLAG_GLOBAL        = 0x20
 OFF_GND_POLYIDX    = 0x554
 OFF_GND_BGIDX      = 0x556
 
+# Bulk-read layouts: the whole slot table in one read, then one cBgW + one cBgD_t header read per
+# used slot -- everything read_collision needs to validate its cache.
+_SLOT     = struct.Struct(">II12x")     # m_chk_element[i]: cBgW*, m_flags
+_BGW_HDR  = struct.Struct(">B35xII")    # cBgW +0x6C mFlags .. +0x90 pm_vtx_tbl, +0x94 pm_bgd
+_BGD_HDR  = struct.Struct(">iIiI24xiI")  # cBgD_t +0x00 m_v_num, m_v_tbl, m_t_num, m_t_tbl,
+                                        #        +0x28 m_ti_num, m_ti_tbl
+
 _RAM_MIN = 0x80000000
 _RAM_MAX = 0x81800000
 
@@ -96,44 +133,52 @@ def link_floor_tri(rd):
     return (bg, poly)
 
 
-def _read_mesh(r, bgw):
-    """Read one cBgW into a mesh dict, or None if malformed. Uses WORLD-space verts (+0x90)."""
-    pm_bgd = r.u32(bgw + OFF_CBGW_PM_BGD)
+def _mesh_header(r, bgw):
+    """(cbgw_flags, v_tbl, pm_bgd, v_num, t_num, t_tbl, ti_num, ti_tbl) for one cBgW in two
+    reads, or None if pm_bgd is bad. v_tbl is the WORLD-space vertex table (+0x90)."""
+    cbgw_flags, v_tbl, pm_bgd = _BGW_HDR.unpack(r.block(bgw + OFF_CBGW_FLAGS, _BGW_HDR.size))
     if not _valid(pm_bgd):
         return None
-    v_num = r.s32(pm_bgd + 0x00)
-    t_num = r.s32(pm_bgd + 0x08)
-    t_tbl = r.u32(pm_bgd + 0x0C)
-    v_tbl = r.u32(bgw + OFF_CBGW_PM_VTX)   # world-space vertex table
+    v_num, _local_vtx, t_num, t_tbl, ti_num, ti_tbl = _BGD_HDR.unpack(r.block(pm_bgd, _BGD_HDR.size))
+    return cbgw_flags, v_tbl, pm_bgd, v_num, t_num, t_tbl, ti_num, ti_tbl
+
+
+def _read_mesh(r, bgw, stage="", hdr=None):
+    """Read one cBgW into a mesh dict, or None if malformed. Uses WORLD-space verts (+0x90).
+    Static meshes go through the on-disk cache (keyed by `stage` + table-bytes hash). `hdr` is the
+    _mesh_header tuple when the caller already has it."""
+    if hdr is None:
+        hdr = _mesh_header(r, bgw)
+        if hdr is None:
+            return None
+    cbgw_flags, v_tbl, pm_bgd, v_num, t_num, t_tbl, ti_num, ti_tbl = hdr
     if not (0 < v_num < 300000 and 0 < t_num < 600000):
         return None
     if not (_valid(v_tbl) and _valid(t_tbl)):
         return None
-    cbgw_flags = r.u8(bgw + OFF_CBGW_FLAGS)
 
     # Bulk-read the whole vertex + triangle tables (2 reads, not thousands).
     vbytes = r.block(v_tbl, v_num * 12)
-    verts = list(struct.unpack(">%df" % (v_num * 3), vbytes[: v_num * 12]))
-    verts = [(verts[i], verts[i + 1], verts[i + 2]) for i in range(0, len(verts), 3)]
-
     tbytes = r.block(t_tbl, t_num * 10)
-    tris = []
-    for i in range(t_num):
-        a, b, c, tid, grp = struct.unpack_from(">5H", tbytes, i * 10)
-        tris.append((a, b, c, tid, grp))
-
-    # Precompute per-triangle centroid + surface class ONCE (they don't change for a given mesh
-    # state). For the static room this is cached across frames with the mesh; for movable BG it is
-    # recomputed each frame (few tris). This keeps the per-frame viewer off the cross-product+sqrt
-    # (tri_normal) and classify path for thousands of static triangles.
-    centroids = []
-    classes = []
-    for a, b, c, tid, grp in tris:
-        v0 = verts[a]; v1 = verts[b]; v2 = verts[c]
-        centroids.append(((v0[0]+v1[0]+v2[0]) / 3.0,
-                          (v0[1]+v1[1]+v2[1]) / 3.0,
-                          (v0[2]+v1[2]+v2[2]) / 3.0))
-        classes.append(classify(tri_normal(v0, v1, v2)[1]))
+    static = bool(cbgw_flags & FLAG_GLOBAL) and not (cbgw_flags & FLAG_MOVE_BG)
+    hit = None
+    if static and DISK_CACHE:
+        # The key is a hash of the bytes just read, so a stale/foreign file can never validate.
+        key = _mesh_key(v_num, t_num, vbytes, tbytes)
+        path = _disk_path(stage, key)
+        hit = _load_mesh(path, key, v_num, t_num)
+    if hit is not None:
+        centroids, classes, grid = hit
+        verts = list(struct.iter_unpack(">3f", vbytes[: v_num * 12]))
+        tris = list(struct.iter_unpack(">5H", tbytes[: t_num * 10]))
+    else:
+        verts, tris, centroids, classes = decode_mesh_tables(vbytes, tbytes, v_num, t_num)
+        grid = TriGrid(centroids, classes) if static else None
+        if static and DISK_CACHE:
+            _save_mesh(path, key, v_num, t_num, centroids, classes, grid)
+    props = None
+    if 0 < ti_num < 0x10000 and _valid(ti_tbl):
+        props = decode_properties(r.block(ti_tbl, ti_num * 16), ti_num, tris)
 
     return {
         "bgw": bgw,
@@ -147,9 +192,113 @@ def _read_mesh(r, bgw):
         "centroids": centroids,
         "classes": classes,
         "v_tbl": v_tbl,
+        "t_tbl": t_tbl,
+        # non-static (movable BG / un-flagged): the raw world-vertex bytes, so next frame's read can
+        # tell "didn't move" and hand back this same dict
+        "vbytes": None if static else vbytes,
+        # static room meshes are reused across frames (read_collision's cache), so index them once
+        "grid": grid,
+        # per-triangle surface properties from m_ti_tbl ({field: bytes}), None if absent
+        "props": props,
     }
 
 
+def _update_movebg(r, bgw, prev, hdr):
+    """Re-read of a non-static mesh (movable BG, or neither GLOBAL nor MOVE_BG) reusing `prev` (same
+    bgw and pm_bgd) for everything but the world verts.
+
+    The DZB topology (triangle table, ids, groups) never changes for a given pm_bgd -- only
+    pm_vtx_tbl moves with the actor's base matrix -- so this re-reads just the vertex block. If its
+    bytes equal last frame's (platform standing still) prev is returned as-is; otherwise only the
+    centroids/classes are recomputed over the cached tris. Falls back to _read_mesh on any change
+    in the header (counts / triangle table) or a first sighting. `hdr` is the _mesh_header tuple."""
+    flags, v_tbl, pm_bgd, v_num, t_num, t_tbl, _ti_num, _ti_tbl = hdr
+    if (prev is None or prev.get("vbytes") is None or prev["pm_bgd"] != pm_bgd
+            or prev["is_movebg"] != bool(flags & FLAG_MOVE_BG) or not _valid(v_tbl)
+            or v_num != prev["v_num"] or t_num != prev["t_num"] or t_tbl != prev["t_tbl"]):
+        return _read_mesh(r, bgw, hdr=hdr)
+    vbytes = r.block(v_tbl, prev["v_num"] * 12)
+    if vbytes == prev["vbytes"]:
+        if prev["bgw"] == bgw and prev["v_tbl"] == v_tbl:
+            return prev
+        return dict(prev, bgw=bgw, v_tbl=v_tbl)
+    verts = list(struct.iter_unpack(">3f", vbytes))
+    centroids, classes = _derive_py(verts, prev["tris"])
+    return dict(prev, bgw=bgw, v_tbl=v_tbl, verts=verts, centroids=centroids, classes=classes,
+                vbytes=vbytes, is_global=bool(flags & FLAG_GLOBAL), surf=None)
+
+
+def _derive_py(verts, tris):
+    """Per-triangle (centroids, classes) over decoded verts/tris."""
+    centroids = []
+    classes = []
+    for a, b, c, tid, grp in tris:
+        v0 = verts[a]; v1 = verts[b]; v2 = verts[c]
+        centroids.append(((v0[0]+v1[0]+v2[0]) / 3.0,
+                          (v0[1]+v1[1]+v2[1]) / 3.0,
+                          (v0[2]+v1[2]+v2[2]) / 3.0))
+        classes.append(classify(tri_normal(v0, v1, v2)[1]))
+    return centroids, classes
+
+
+def _decode_py(vbytes, tbytes, v_num, t_num):
+    verts = list(struct.unpack(">%df" % (v_num * 3), vbytes[: v_num * 12]))
+    verts = [(verts[i], verts[i + 1], verts[i + 2]) for i in range(0, len(verts), 3)]
+
+    tris = []
+    for i in range(t_num):
+        a, b, c, tid, grp = struct.unpack_from(">5H", tbytes, i * 10)
+        tris.append((a, b, c, tid, grp))
+
+    centroids, classes = _derive_py(verts, tris)
+    return verts, tris, centroids, classes
+
+
+_CLASS_NAMES = ("wall", "ground", "roof")
+
+
+def _decode_np(vbytes, tbytes, v_num, t_num):
+    # float64 from the big-endian f32s, then the same operation order as tri_normal / the centroid
+    # sums above, so every value (and therefore every class) matches the struct path exactly.
+    v = np.frombuffer(vbytes, ">f4", v_num * 3).astype(np.float64).reshape(v_num, 3)
+    t = np.frombuffer(tbytes, ">u2", t_num * 5).reshape(t_num, 5)
+    if t_num and int(t[:, :3].max()) >= v_num:
+        raise IndexError("triangle vertex index out of range")
+    v0 = v[t[:, 0]]; v1 = v[t[:, 1]]; v2 = v[t[:, 2]]
+    cen = (v0 + v1 + v2) / 3.0
+    a = v1 - v0
+    b = v2 - v0
+    nx = a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1]
+    ny = a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2]
+    nz = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    m = np.sqrt(nx * nx + ny * ny + nz * nz)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        uy = np.where(m < 1e-9, 0.0, ny / m)
+    cls = np.where(uy >= 0.5, 1, np.where(uy < -0.8, 2, 0))
+    names = _CLASS_NAMES
+    # Back to the shared list-of-tuples layout; iter_unpack / zip build the tuples in C.
+    verts = list(struct.iter_unpack(">3f", vbytes[: v_num * 12]))
+    tris = list(struct.iter_unpack(">5H", tbytes[: t_num * 10]))
+    centroids = list(zip(cen[:, 0].tolist(), cen[:, 1].tolist(), cen[:, 2].tolist()))
+    return verts, tris, centroids, [names[k] for k in cls.tolist()]
+
+
+def decode_mesh_tables(vbytes, tbytes, v_num, t_num, use_numpy=None):
+    """Decode raw DZB vertex (12B f32 x,y,z) + triangle (10B u16 a,b,c,id,grp) tables into
+    (verts, tris, centroids, classes) -- lists of tuples / class names, whichever path runs.
+
+    Precomputes per-triangle centroid + surface class ONCE (they don't change for a given mesh
+    state). For the static room this is cached across frames with the mesh; for movable BG it is
+    recomputed each frame (few tris). This keeps the per-frame viewer off the cross-product+sqrt
+    (tri_normal) and classify path for thousands of static triangles. `use_numpy` None follows
+    USE_NUMPY."""
+    if use_numpy is None:
+        use_numpy = USE_NUMPY
+    if use_numpy and np is not None:
+        return _decode_np(vbytes, tbytes, v_num, t_num)
+    return _decode_py(vbytes, tbytes, v_num, t_num)
+
+
 def read_collision(rd, cache=None):
     """Scan dBgS.m_chk_element[256] and return a snapshot of all registered collision meshes.
 
@@ -159,29 +308,30 @@ def read_collision(rd, cache=None):
          "meshes": {bg_index: mesh_dict, ...}}    # keyed by manager slot (== poly_info bgIndex)
 
     `cache` (the previous return value) lets STATIC (GLOBAL_e) room meshes be reused across frames
-    without re-reading their (large, unchanging) vertex/triangle tables. Movable-BG meshes have
-    world-space verts that change every frame, so they are always re-read. Cache validity keys on
+    without re-reading their (large, unchanging) vertex/triangle tables. Cache validity keys on
     (bgw ptr, pm_bgd ptr, v_num, t_num, v_tbl ptr) so a stage change or slot reuse invalidates it.
+    Every other mesh (movable BG, or one with neither flag) keeps its topology by (bgw, pm_bgd) and
+    only re-reads the world-space vertex block (see _update_movebg): a byte compare that returns
+    the same mesh dict when the vertices haven't moved. Not pm_bgd alone: two instances of one
+    actor share its DZB but each has its own pm_vtx_tbl.
+
+    The slot table is read in one block and each used slot costs two small header reads
+    (_mesh_header), so an unchanged frame is ~2 reads per registered mesh plus a few fixed ones.
     """
     r = _R(rd)
     old = (cache or {}).get("meshes", {}) if cache else {}
+    old_move = {(m["bgw"], m["pm_bgd"]): m for m in old.values() if m.get("vbytes") is not None}
+    stage = stage_name(rd)
     meshes = {}
-    for i in range(CHK_ELEM_COUNT):
-        e = DBGS + i * CHK_ELEM_STRIDE
-        flags = r.u32(e + OFF_BGW_FLAGS)
-        if not (flags & 1):
-            continue
-        bgw = r.u32(e + OFF_BGW_PTR)
-        if not _valid(bgw):
+    table = r.block(DBGS, CHK_ELEM_COUNT * CHK_ELEM_STRIDE)
+    for i, (bgw, flags) in enumerate(_SLOT.iter_unpack(table)):
+        if not (flags & 1) or not _valid(bgw):
             continue
-        pm_bgd = r.u32(bgw + OFF_CBGW_PM_BGD)
-        if not _valid(pm_bgd):
+        hdr = _mesh_header(r, bgw)
+        if hdr is None:
             continue
-        v_tbl = r.u32(bgw + OFF_CBGW_PM_VTX)
-        v_num = r.s32(pm_bgd + 0x00)
-        t_num = r.s32(pm_bgd + 0x08)
+        cbgw_flags, v_tbl, pm_bgd, v_num, t_num = hdr[:5]
         prev = old.get(i)
-        cbgw_flags = r.u8(bgw + OFF_CBGW_FLAGS)
         static = bool(cbgw_flags & FLAG_GLOBAL) and not (cbgw_flags & FLAG_MOVE_BG)
         if (static and prev is not None
                 and prev["bgw"] == bgw and prev["pm_bgd"] == pm_bgd
@@ -189,17 +339,274 @@ def read_collision(rd, cache=None):
                 and prev["v_tbl"] == v_tbl):
             meshes[i] = prev            # unchanged static room mesh — reuse cached tables
             continue
-        m = _read_mesh(r, bgw)
+        if static:
+            m = _read_mesh(r, bgw, stage, hdr)
+        else:
+            m = _update_movebg(r, bgw, old_move.get((bgw, pm_bgd)), hdr)
         if m is not None:
             meshes[i] = m
 
     return {
-        "stage": stage_name(rd),
+        "stage": stage,
         "floor": link_floor_tri(rd),
         "meshes": meshes,
     }
 
 
+# --- on-disk mesh cache -------------------------------------------------------------------
+# One file per decoded static mesh: header, centroids (f64 x3), class codes (u8), then the grid
+# (cell size + per-cell (ix,iy,iz,count) i32 and the tri indices u32). Native byte order, recorded
+# in the header; verts/tris aren't stored -- they're re-decoded from the live bytes (cheap) that
+# the key was hashed from anyway.
+
+def _mesh_key(v_num, t_num, vbytes, tbytes):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack(">ii", v_num, t_num))
+    h.update(vbytes)
+    h.update(tbytes)
+    return h.digest()
+
+
+def _disk_path(stage, key):
+    safe = "".join(ch if ch.isalnum() or ch in "_-" else "_" for ch in stage) or "_"
+    return os.path.join(DISK_CACHE_DIR, safe, key.hex() + ".bin")
+
+
+def _save_mesh(path, key, v_num, t_num, centroids, classes, grid):
+    """Best-effort write (tmp + replace); a failure just means the next visit decodes again."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        cen = array("d", [c for xyz in centroids for c in xyz])
+        code = {n: i for i, n in enumerate(_CLASS_NAMES)}
+        cls = bytes(code[c] for c in classes)
+        keys, idx = array("i"), array("I")
+        for k, bucket in grid.cells.items():
+            keys.extend((k[0], k[1], k[2], len(bucket)))
+            idx.extend(bucket)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_DISK_HDR.pack(_DISK_MAGIC, _DISK_VERSION, sys.byteorder == "little",
+                                   v_num, t_num, key, grid.cell, len(grid.cells)))
+            cen.tofile(f)
+            f.write(cls)
+            keys.tofile(f)
+            idx.tofile(f)
+        os.replace(tmp, path)
+    except (OSError, KeyError):
+        return
+    _prune_disk_cache(DISK_CACHE_MAX_BYTES)
+
+
+def _load_mesh(path, key, v_num, t_num):
+    """(centroids, classes, grid) from the cache file if it matches key/counts, else None."""
+    try:
+        with open(path, "rb") as f:
+            hdr = f.read(_DISK_HDR.size)
+            if len(hdr) != _DISK_HDR.size:
+                return None
+            magic, ver, little, fv, ft, fkey, cell, n_cells = _DISK_HDR.unpack(hdr)
+            if (magic != _DISK_MAGIC or ver != _DISK_VERSION
+                    or bool(little) != (sys.byteorder == "little")
+                    or fv != v_num or ft != t_num or fkey != key):
+                return None
+            cen = array("d")
+            cen.fromfile(f, t_num * 3)
+            cls = f.read(t_num)
+            keys = array("i")
+            keys.fromfile(f, n_cells * 4)
+            idx = array("I")
+            idx.fromfile(f, t_num)
+    except (OSError, EOFError, struct.error):
+        return None
+    if len(cls) != t_num:
+        return None
+    try:
+        os.utime(path)   # mtime = last use, for _prune_disk_cache's LRU order
+    except OSError:
+        pass
+    centroids = list(zip(cen[0::3], cen[1::3], cen[2::3]))
+    names = _CLASS_NAMES
+    classes = [names[c] for c in cls]
+    counts = {n: cls.count(i) for i, n in enumerate(names) if cls.count(i)}
+    idx = idx.tolist()
+    cells, pos = {}, 0
+    for j in range(0, len(keys), 4):
+        n = keys[j + 3]
+        cells[(keys[j], keys[j + 1], keys[j + 2])] = idx[pos:pos + n]
+        pos += n
+    return centroids, classes, TriGrid.restore(centroids, counts, cell, cells)
+
+
+def _prune_disk_cache(limit):
+    """Delete the least recently used cache files until DISK_CACHE_DIR holds at most `limit` bytes."""
+    files, total = [], 0
+    for root, _dirs, names in os.walk(DISK_CACHE_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+    files.sort()
+    for _mtime, size, path in files:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def clear_disk_cache():
+    """Delete every persisted mesh (DISK_CACHE_DIR); the next visit to each room decodes again."""
+    _prune_disk_cache(-1)
+
+
+# --- spatial index -----------------------------------------------------------------------
+
+GRID_TRIS_PER_CELL = 8       # target centroids per occupied cell
+GRID_CELL_MIN      = 50.0    # world units; floor for tiny/dense meshes
+
+
+class TriGrid:
+    """Uniform 3D hash grid over a mesh's triangle centroids, for radius / nearest-N queries that
+    only visit cells near the query point instead of every triangle in the room.
+
+    Cell size comes from the XZ footprint (rooms are wide and flat) so an occupied cell holds
+    ~GRID_TRIS_PER_CELL centroids. Built once per static mesh in _read_mesh and carried in the
+    mesh dict, so read_collision's cache keeps it for as long as the mesh is reused. Also keeps
+    per-class triangle counts (`class_counts`) for callers that report totals without scanning."""
+
+    def __init__(self, centroids, classes=None, tris_per_cell=GRID_TRIS_PER_CELL):
+        self.centroids = centroids
+        n = len(centroids)
+        if n:
+            xs = [c[0] for c in centroids]
+            zs = [c[2] for c in centroids]
+            area = max(1.0, max(xs) - min(xs)) * max(1.0, max(zs) - min(zs))
+        else:
+            area = 1.0
+        self.cell = max(GRID_CELL_MIN, math.sqrt(area * tris_per_cell / max(1, n)))
+        inv = 1.0 / self.cell
+        cells = {}
+        for i, (x, y, z) in enumerate(centroids):
+            k = (int(math.floor(x * inv)), int(math.floor(y * inv)), int(math.floor(z * inv)))
+            b = cells.get(k)
+            if b is None:
+                cells[k] = [i]
+            else:
+                b.append(i)
+        self.cells = cells
+        if cells:
+            self.lo = tuple(min(k[a] for k in cells) for a in range(3))
+            self.hi = tuple(max(k[a] for k in cells) for a in range(3))
+        else:
+            self.lo = self.hi = (0, 0, 0)
+        self.class_counts = {}
+        for c in classes or ():
+            self.class_counts[c] = self.class_counts.get(c, 0) + 1
+
+    @classmethod
+    def restore(cls, centroids, class_counts, cell, cells):
+        """Rebuild from saved cell buckets (the on-disk cache) without re-hashing centroids."""
+        g = cls.__new__(cls)
+        g.centroids = centroids
+        g.cell = cell
+        g.cells = cells
+        if cells:
+            g.lo = tuple(min(k[a] for k in cells) for a in range(3))
+            g.hi = tuple(max(k[a] for k in cells) for a in range(3))
+        else:
+            g.lo = g.hi = (0, 0, 0)
+        g.class_counts = dict(class_counts)
+        return g
+
+    def _key(self, p):
+        inv = 1.0 / self.cell
+        return (int(math.floor(p[0] * inv)), int(math.floor(p[1] * inv)),
+                int(math.floor(p[2] * inv)))
+
+    def _scan(self, bucket, p, out, r2, accept):
+        cen = self.centroids
+        px, py, pz = p
+        for i in bucket:
+            c = cen[i]
+            dx = c[0] - px; dy = c[1] - py; dz = c[2] - pz
+            d2 = dx * dx + dy * dy + dz * dz
+            if d2 <= r2 and (accept is None or accept(i)):
+                out.append((d2, i))
+
+    def radius(self, p, r, accept=None):
+        """[(d2, tri_index), ...] (unordered) for centroids within `r` of p that pass `accept`."""
+        out = []
+        if not self.cells:
+            return out
+        r2 = r * r
+        inv = 1.0 / self.cell
+        lo = [max(self.lo[a], int(math.floor((p[a] - r) * inv))) for a in range(3)]
+        hi = [min(self.hi[a], int(math.floor((p[a] + r) * inv))) for a in range(3)]
+        span = [hi[a] - lo[a] + 1 for a in range(3)]
+        if min(span) <= 0:
+            return out
+        if span[0] * span[1] * span[2] > len(self.cells):
+            # a huge radius covers more cells than exist: walk the occupied ones instead
+            for k, bucket in self.cells.items():
+                if (lo[0] <= k[0] <= hi[0] and lo[1] <= k[1] <= hi[1]
+                        and lo[2] <= k[2] <= hi[2]):
+                    self._scan(bucket, p, out, r2, accept)
+            return out
+        cells = self.cells
+        for ix in range(lo[0], hi[0] + 1):
+            for iy in range(lo[1], hi[1] + 1):
+                for iz in range(lo[2], hi[2] + 1):
+                    bucket = cells.get((ix, iy, iz))
+                    if bucket:
+                        self._scan(bucket, p, out, r2, accept)
+        return out
+
+    def _shell(self, c, k):
+        """Occupied buckets whose cell is exactly Chebyshev distance k from cell c (clipped)."""
+        cells, lo, hi = self.cells, self.lo, self.hi
+        cx, cy, cz = c
+        y0, y1 = max(lo[1], cy - k), min(hi[1], cy + k)
+        z0, z1 = max(lo[2], cz - k), min(hi[2], cz + k)
+        for ix in range(max(lo[0], cx - k), min(hi[0], cx + k) + 1):
+            face_x = abs(ix - cx) == k
+            for iy in range(y0, y1 + 1):
+                if face_x or abs(iy - cy) == k:
+                    zs = range(z0, z1 + 1)
+                else:
+                    zs = [z for z in (cz - k, cz + k) if z0 <= z <= z1]
+                for iz in zs:
+                    b = cells.get((ix, iy, iz))
+                    if b:
+                        yield b
+
+    def nearest(self, p, n, accept=None, max_r=0.0):
+        """Up to `n` nearest centroids to p as [(d2, tri_index), ...] ascending, among those that
+        pass `accept` and (max_r > 0) lie within max_r. Grows cube shells around p's cell until
+        n candidates are inside the radius the shells are guaranteed to cover."""
+        if n <= 0 or not self.cells:
+            return []
+        r2 = max_r * max_r if max_r > 0.0 else float("inf")
+        c = self._key(p)
+        k_max = max(max(abs(c[a] - self.lo[a]), abs(self.hi[a] - c[a])) for a in range(3))
+        cand = []
+        for k in range(k_max + 1):
+            for bucket in self._shell(c, k):
+                self._scan(bucket, p, cand, r2, accept)
+            cov = k * self.cell                 # every centroid closer than this is in `cand`
+            if max_r > 0.0 and cov >= max_r:
+                break
+            cov2 = cov * cov
+            if len(cand) >= n and sum(1 for d2, _ in cand if d2 <= cov2) >= n:
+                break
+        return heapq.nsmallest(n, cand)
+
+
 # --- geometry helpers (pure, no reader) ---------------------------------------------------
 
 def tri_normal(v0, v1, v2):
@@ -222,3 +629,545 @@ def classify(ny):
     if ny < -0.8:
         return "roof"
     return "wall"
+
+
+# --- surface properties -------------------------------------------------------------------
+# cBgD_Ti_t: 16-byte records of four u32 info words, indexed by each triangle's `id` column.
+# Field = (name, word, shift, mask), per the DZB property layout the community collision tools
+# use; not yet validated live. Every field fits a byte, so each decodes to one `bytes` of t_num
+# codes (0xFF where a triangle's id is past the table).
+TI_FIELDS = (
+    ("cam",        0, 0,  0xFF),
+    ("sound",      0, 8,  0x1F),
+    ("exit",       0, 13, 0x3F),
+    ("poly_color", 0, 19, 0xFF),
+    ("link_no",    1, 0,  0xFF),
+    ("wall",       1, 8,  0x0F),
+    ("special",    1, 12, 0x0F),
+    ("attr",       1, 16, 0x1F),
+    ("ground",     1, 21, 0x1F),
+)
+# Named surface flags -> (field, codes). Provisional (decomp attribute / ground-code names); edit
+# here once confirmed live. No "water": it is not a Ti attr / ground code. The game's water check
+# (dBgS_WtrChk) picks water polys by their collision group (the water-group bit of the cBgD_Grp_t
+# info word), and the group table is not decoded here, so a Ti-code entry would match nothing.
+SURFACE_FLAGS = {
+    "lava":   ("attr", (6,)),
+    "damage": ("attr", (10,)),
+    "ice":    ("attr", (11,)),
+    "void":   ("ground", (4,)),
+}
+_TI = struct.Struct(">4I")
+
+
+def decode_properties(tibytes, ti_num, tris):
+    """{field: bytes} per triangle from the raw m_ti_tbl bytes. Each record is decoded once into a
+    packed row of field bytes; the per-triangle gather and the field split are a bytes join and
+    stride slices, so there is no per-triangle Python work."""
+    nf = len(TI_FIELDS)
+    rows = []
+    for words in _TI.iter_unpack(tibytes[: ti_num * 16]):
+        rows.append(bytes((words[w] >> sh) & mk for _name, w, sh, mk in TI_FIELDS))
+    ids = list(map(itemgetter(3), tris))
+    top = max(ids) + 1 if ids else 0
+    if top > len(rows):
+        rows.extend([b"\xff" * nf] * (top - len(rows)))
+    packed = b"".join(map(rows.__getitem__, ids))
+    return {name: packed[k::nf] for k, (name, _w, _sh, _mk) in enumerate(TI_FIELDS)}
+
+
+def tri_mask(mesh, field, codes):
+    """Per-triangle 0/1 `bytes` (t_num long): 1 where mesh's `field` code is in `codes`. A single
+    bytes.translate over the field, so filtering costs no per-triangle Python; with NumPy,
+    np.frombuffer(mask, np.bool_) views it as a bool array. All zeros if the mesh has no props.
+    `field` may also be a SURFACE_FLAGS name (codes is then ignored)."""
+    if field in SURFACE_FLAGS:
+        field, codes = SURFACE_FLAGS[field]
+    props = mesh.get("props")
+    if not props:
+        return bytes(len(mesh["tris"]))
+    table = bytearray(256)
+    for c in codes:
+        table[c & 0xFF] = 1
+    return props[field].translate(bytes(table))
+
+
+# --- geometric queries --------------------------------------------------------------------
+# Ray / ground / wall tests against the real triangles (not centroids), for offline screening
+# (e.g. corner_clip_bruteforce / rng_dtcs candidates) without emulating frames. Each mesh gets a
+# SurfaceGrid -- an XZ grid of triangle footprints -- built on first query and kept in the mesh
+# dict, so read_collision's reuse of static meshes keeps it too.
+
+SURF_TRIS_PER_CELL = 4       # target triangles per XZ cell
+SURF_BIG_CELLS     = 64      # triangles spanning more cells than this go on the always-tested list
+_EPS               = 1e-7
+
+
+class SurfaceGrid:
+    """Uniform XZ grid over one mesh's triangles. Each triangle is listed in every cell its XZ
+    bounding box touches (rooms are wide and flat, so a column lookup finds the few triangles
+    above/below a point); huge ones (sea planes, skybox floors) sit on `big` instead.
+
+    Per triangle it precomputes the three corners and the unit-normal plane (nx, ny, nz, d) with
+    n.p + d = 0; `classes` is the mesh's ground/wall/roof list (same classify() thresholds)."""
+
+    def __init__(self, verts, tris, classes, tris_per_cell=SURF_TRIS_PER_CELL):
+        corners = []
+        planes = []
+        for a, b, c, _tid, _grp in tris:
+            v0 = verts[a]; v1 = verts[b]; v2 = verts[c]
+            corners.append((v0, v1, v2))
+            n = tri_normal(v0, v1, v2)
+            planes.append((n[0], n[1], n[2], -(n[0] * v0[0] + n[1] * v0[1] + n[2] * v0[2])))
+        self.corners = corners
+        self.planes = planes
+        self.classes = classes
+        n = len(corners)
+        if n:
+            xs = [v[0] for v in verts]
+            zs = [v[2] for v in verts]
+            area = max(1.0, max(xs) - min(xs)) * max(1.0, max(zs) - min(zs))
+        else:
+            area = 1.0
+        self.cell = max(GRID_CELL_MIN, math.sqrt(area * tris_per_cell / max(1, n)))
+        inv = 1.0 / self.cell
+        cells = {}
+        big = []
+        for i, (v0, v1, v2) in enumerate(corners):
+            x0 = int(math.floor(min(v0[0], v1[0], v2[0]) * inv))
+            x1 = int(math.floor(max(v0[0], v1[0], v2[0]) * inv))
+            z0 = int(math.floor(min(v0[2], v1[2], v2[2]) * inv))
+            z1 = int(math.floor(max(v0[2], v1[2], v2[2]) * inv))
+            if (x1 - x0 + 1) * (z1 - z0 + 1) > SURF_BIG_CELLS:
+                big.append(i)
+                continue
+            for ix in range(x0, x1 + 1):
+                for iz in range(z0, z1 + 1):
+                    b = cells.get((ix, iz))
+                    if b is None:
+                        cells[(ix, iz)] = [i]
+                    else:
+                        b.append(i)
+        self.cells = cells
+        self.big = big
+        if cells:
+            self.lo = (min(k[0] for k in cells), min(k[1] for k in cells))
+            self.hi = (max(k[0] for k in cells), max(k[1] for k in cells))
+        else:
+            self.lo = self.hi = (0, 0)
+
+    def column(self, x, z):
+        """Triangle indices whose footprint cell contains (x, z), plus the big list."""
+        inv = 1.0 / self.cell
+        b = self.cells.get((int(math.floor(x * inv)), int(math.floor(z * inv))))
+        return (b + self.big) if b else self.big
+
+    def box(self, x0, z0, x1, z1):
+        """Set of triangle indices listed in any cell overlapping the XZ box, plus the big list."""
+        inv = 1.0 / self.cell
+        out = set(self.big)
+        lx = max(self.lo[0], int(math.floor(x0 * inv)))
+        hx = min(self.hi[0], int(math.floor(x1 * inv)))
+        lz = max(self.lo[1], int(math.floor(z0 * inv)))
+        hz = min(self.hi[1], int(math.floor(z1 * inv)))
+        if (hx - lx + 1) * (hz - lz + 1) > len(self.cells):
+            for k, b in self.cells.items():
+                if lx <= k[0] <= hx and lz <= k[1] <= hz:
+                    out.update(b)
+            return out
+        cells = self.cells
+        for ix in range(lx, hx + 1):
+            for iz in range(lz, hz + 1):
+                b = cells.get((ix, iz))
+                if b:
+                    out.update(b)
+        return out
+
+    def ray_cells(self, ox, oz, dx, dz, t_max):
+        """Yield (t_exit, bucket) for the XZ cells the ray o + t*d crosses for t in [0, t_max],
+        in order (2D DDA). t is in the ray's own parameter (d need not be unit)."""
+        s = self.cell
+        if not self.cells:
+            return
+        # clip to the occupied cell range first, so a ray from far outside doesn't walk empty cells
+        t0, t1 = 0.0, t_max
+        for o, d, lo, hi in ((ox, dx, self.lo[0] * s, (self.hi[0] + 1) * s),
+                             (oz, dz, self.lo[1] * s, (self.hi[1] + 1) * s)):
+            if abs(d) < _EPS:
+                if o < lo or o >= hi:
+                    return
+                continue
+            ta, tb = (lo - o) / d, (hi - o) / d
+            if ta > tb:
+                ta, tb = tb, ta
+            t0, t1 = max(t0, ta), min(t1, tb)
+            if t0 > t1:
+                return
+        inv = 1.0 / s
+        px, pz = ox + dx * t0, oz + dz * t0
+        ix, iz = int(math.floor(px * inv)), int(math.floor(pz * inv))
+        if abs(dx) >= _EPS:
+            sx = 1 if dx > 0 else -1
+            nx = ((ix + (sx > 0)) * s - ox) / dx
+            ddx = s / abs(dx)
+        else:
+            sx, nx, ddx = 0, float("inf"), float("inf")
+        if abs(dz) >= _EPS:
+            sz = 1 if dz > 0 else -1
+            nz = ((iz + (sz > 0)) * s - oz) / dz
+            ddz = s / abs(dz)
+        else:
+            sz, nz, ddz = 0, float("inf"), float("inf")
+        cells = self.cells
+        while True:
+            t_exit = min(nx, nz, t1)
+            b = cells.get((ix, iz))
+            if b:
+                yield t_exit, b
+            if t_exit >= t1:
+                return
+            if nx <= nz:
+                ix += sx
+                nx += ddx
+            else:
+                iz += sz
+                nz += ddz
+
+
+def surface_grid(mesh):
+    """The mesh's SurfaceGrid, built on first use and stored in the mesh dict."""
+    g = mesh.get("surf")
+    if g is None:
+        g = mesh["surf"] = SurfaceGrid(mesh["verts"], mesh["tris"], mesh["classes"])
+    return g
+
+
+# --- level of detail -----------------------------------------------------------------------
+# Vertex clustering: each vertex snaps to the mean of the vertices sharing its cell of a uniform
+# grid, and triangles that collapse (two corners in one cluster) or repeat drop out. Clusters are
+# per class, except that vertices used by triangles of different classes cluster among themselves,
+# so a ground / wall crease stays one edge both sides snap to: no cracks, no class bleeding across.
+# Cells are flat boxes (height capped at `cell_y`): rooms are wide and low, and a cube as wide as a
+# far level's cell would fold every wall into a line.
+
+LOD_CELLS = (2.0, 5.0, 12.0)     # cluster cell per level, in multiples of the mesh's TriGrid cell
+LOD_CELL_Y = 1.0                 # cluster cell height cap, likewise
+LOD_MIN_GAIN = 0.75              # stop adding levels once one keeps more than this share of tris
+LOD_TRIS_PER_CELL = 4 * GRID_TRIS_PER_CELL   # far levels are culled / queried in coarser cells
+
+
+def decimate(verts, tris, classes, cell, cell_y=None):
+    """Vertex-clustered copy of a mesh at cluster size `cell` (`cell_y` high, default `cell`):
+    (verts, tris, classes). Output tris keep the DZB row shape (vtx0, vtx1, vtx2, id, grp), id /
+    grp from one of the merged sources."""
+    vcls = {}
+    for (a, b, c, _id, _grp), cls in zip(tris, classes):
+        for vi in (a, b, c):
+            k = vcls.get(vi)
+            if k is None:
+                vcls[vi] = cls
+            elif k != cls:
+                vcls[vi] = ""                       # class boundary
+    inv = 1.0 / cell
+    inv_y = 1.0 / (cell_y or cell)
+    floor = math.floor
+    cid, sums, remap = {}, [], {}
+    for vi, cls in vcls.items():
+        x, y, z = verts[vi]
+        k = (int(floor(x * inv)), int(floor(y * inv_y)), int(floor(z * inv)), cls)
+        j = cid.get(k)
+        if j is None:
+            j = cid[k] = len(sums)
+            sums.append([0.0, 0.0, 0.0, 0])
+        s = sums[j]
+        s[0] += x; s[1] += y; s[2] += z; s[3] += 1
+        remap[vi] = j
+    out_v = [(s[0] / s[3], s[1] / s[3], s[2] / s[3]) for s in sums]
+    out_t, out_c, seen = [], [], set()
+    for (a, b, c, tid, grp), cls in zip(tris, classes):
+        a, b, c = remap[a], remap[b], remap[c]
+        if a == b or b == c or a == c:
+            continue
+        r = min((a, b, c), (b, c, a), (c, a, b))   # same winding, rotation-free key
+        if (r, cls) in seen:
+            continue
+        seen.add((r, cls))
+        out_t.append((a, b, c, tid, grp))
+        out_c.append(cls)
+    return out_v, out_t, out_c
+
+
+def mesh_lods(mesh):
+    """Coarser copies of a static mesh, built on first use and kept in mesh["lods"] (so they live
+    as long as read_collision reuses the mesh). Each level is a mesh dict (verts / tris / centroids
+    / classes / grid, plus `cell`, its cluster size), coarsest last; [] for a mesh without a
+    TriGrid or one too fine-grained to gain."""
+    lods = mesh.get("lods")
+    if lods is not None:
+        return lods
+    lods = mesh["lods"] = []
+    grid = mesh.get("grid")
+    if grid is None:
+        return lods
+    verts, tris, classes = mesh["verts"], mesh["tris"], mesh["classes"]
+    for scale in LOD_CELLS:
+        cell = grid.cell * scale
+        v, t, c = decimate(verts, tris, classes, cell, grid.cell * min(scale, LOD_CELL_Y))
+        if not t:
+            break
+        if len(t) > LOD_MIN_GAIN * len(tris):
+            continue                                # this cell merges too little; try coarser
+        cen = [((v[a][0] + v[b][0] + v[d][0]) / 3.0, (v[a][1] + v[b][1] + v[d][1]) / 3.0,
+                (v[a][2] + v[b][2] + v[d][2]) / 3.0) for a, b, d, _id, _grp in t]
+        lods.append({"v_num": len(v), "t_num": len(t), "verts": v, "tris": t, "centroids": cen,
+                     "classes": c, "is_movebg": False, "cell": cell,
+                     "grid": TriGrid(cen, c, LOD_TRIS_PER_CELL)})
+        verts, tris, classes = v, t, c               # the next level clusters this one
+    return lods
+
+
+def mesh_from_tables(vbytes, tbytes, v_num, t_num, tibytes=None, ti_num=0):
+    """A minimal mesh dict (verts/tris/centroids/classes, props when the m_ti_tbl bytes are given)
+    from raw DZB tables -- e.g. a Room.dzb loaded with collision_bench.load_dzb -- so
+    CollisionQuery runs without a live snapshot."""
+    verts, tris, centroids, classes = decode_mesh_tables(vbytes, tbytes, v_num, t_num)
+    props = decode_properties(tibytes, ti_num, tris) if tibytes and ti_num > 0 else None
+    return {"v_num": v_num, "t_num": t_num, "verts": verts, "tris": tris,
+            "centroids": centroids, "classes": classes, "is_movebg": False, "props": props}
+
+
+def _in_tri_xz(x, z, v0, v1, v2):
+    """(x, z) inside the triangle's XZ projection (either winding, edges inclusive)."""
+    e0 = (v1[0] - v0[0]) * (z - v0[2]) - (v1[2] - v0[2]) * (x - v0[0])
+    e1 = (v2[0] - v1[0]) * (z - v1[2]) - (v2[2] - v1[2]) * (x - v1[0])
+    e2 = (v0[0] - v2[0]) * (z - v2[2]) - (v0[2] - v2[2]) * (x - v2[0])
+    return (e0 >= 0.0 and e1 >= 0.0 and e2 >= 0.0) or (e0 <= 0.0 and e1 <= 0.0 and e2 <= 0.0)
+
+
+def _ray_tri(o, d, v0, v1, v2):
+    """Moller-Trumbore: ray parameter t of the hit (t >= 0, either face), or None."""
+    e1x, e1y, e1z = v1[0] - v0[0], v1[1] - v0[1], v1[2] - v0[2]
+    e2x, e2y, e2z = v2[0] - v0[0], v2[1] - v0[1], v2[2] - v0[2]
+    px = d[1] * e2z - d[2] * e2y
+    py = d[2] * e2x - d[0] * e2z
+    pz = d[0] * e2y - d[1] * e2x
+    det = e1x * px + e1y * py + e1z * pz
+    if -_EPS < det < _EPS:
+        return None
+    inv = 1.0 / det
+    sx, sy, sz = o[0] - v0[0], o[1] - v0[1], o[2] - v0[2]
+    u = (sx * px + sy * py + sz * pz) * inv
+    if u < 0.0 or u > 1.0:
+        return None
+    qx = sy * e1z - sz * e1y
+    qy = sz * e1x - sx * e1z
+    qz = sx * e1y - sy * e1x
+    v = (d[0] * qx + d[1] * qy + d[2] * qz) * inv
+    if v < 0.0 or u + v > 1.0:
+        return None
+    t = (e2x * qx + e2y * qy + e2z * qz) * inv
+    return t if t >= 0.0 else None
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _closest_on_tri(p, a, b, c):
+    """Closest point to p on triangle abc (Ericson, Real-Time Collision Detection 5.1.5)."""
+    ab, ac, ap = _sub(b, a), _sub(c, a), _sub(p, a)
+    d1, d2 = _dot(ab, ap), _dot(ac, ap)
+    if d1 <= 0.0 and d2 <= 0.0:
+        return a
+    bp = _sub(p, b)
+    d3, d4 = _dot(ab, bp), _dot(ac, bp)
+    if d3 >= 0.0 and d4 <= d3:
+        return b
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / (d1 - d3)
+        return (a[0] + v * ab[0], a[1] + v * ab[1], a[2] + v * ab[2])
+    cp = _sub(p, c)
+    d5, d6 = _dot(ab, cp), _dot(ac, cp)
+    if d6 >= 0.0 and d5 <= d6:
+        return c
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / (d2 - d6)
+        return (a[0] + w * ac[0], a[1] + w * ac[1], a[2] + w * ac[2])
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and (d4 - d3) >= 0.0 and (d5 - d6) >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        return (b[0] + w * (c[0] - b[0]), b[1] + w * (c[1] - b[1]), b[2] + w * (c[2] - b[2]))
+    denom = 1.0 / (va + vb + vc)
+    v, w = vb * denom, vc * denom
+    return (a[0] + ab[0] * v + ac[0] * w, a[1] + ab[1] * v + ac[1] * w,
+            a[2] + ab[2] * v + ac[2] * w)
+
+
+def _seg_seg_dist2(p0, p1, q0, q1):
+    """Squared distance between segments p0p1 and q0q1 (Ericson 5.1.9)."""
+    d1, d2, r = _sub(p1, p0), _sub(q1, q0), _sub(p0, q0)
+    a, e, f = _dot(d1, d1), _dot(d2, d2), _dot(d2, r)
+    if a <= _EPS and e <= _EPS:
+        s = t = 0.0
+    elif a <= _EPS:
+        s, t = 0.0, min(1.0, max(0.0, f / e))
+    else:
+        c = _dot(d1, r)
+        if e <= _EPS:
+            s, t = min(1.0, max(0.0, -c / a)), 0.0
+        else:
+            b = _dot(d1, d2)
+            den = a * e - b * b
+            s = min(1.0, max(0.0, (b * f - c * e) / den)) if den > _EPS else 0.0
+            t = (b * s + f) / e
+            if t < 0.0:
+                s, t = min(1.0, max(0.0, -c / a)), 0.0
+            elif t > 1.0:
+                s, t = min(1.0, max(0.0, (b - c) / a)), 1.0
+    cx = p0[0] + d1[0] * s - q0[0] - d2[0] * t
+    cy = p0[1] + d1[1] * s - q0[1] - d2[1] * t
+    cz = p0[2] + d1[2] * s - q0[2] - d2[2] * t
+    return cx * cx + cy * cy + cz * cz
+
+
+def _seg_tri_dist2(p0, p1, v0, v1, v2):
+    """Squared distance between segment p0p1 and a triangle (0 when the segment crosses it)."""
+    d = _sub(p1, p0)
+    t = _ray_tri(p0, d, v0, v1, v2)
+    if t is not None and t <= 1.0:
+        return 0.0
+    best = float("inf")
+    for p in (p0, p1):
+        q = _sub(p, _closest_on_tri(p, v0, v1, v2))
+        best = min(best, _dot(q, q))
+    for a, b in ((v0, v1), (v1, v2), (v2, v0)):
+        best = min(best, _seg_seg_dist2(p0, p1, a, b))
+    return best
+
+
+class CollisionQuery:
+    """Ground / ray / wall queries over a collision snapshot's real triangles.
+
+    `meshes` is a read_collision() snapshot, its "meshes" dict ({bg_index: mesh}) or a list of
+    mesh dicts (e.g. from mesh_from_tables; their list position stands in for bg_index). Hits are
+    reported as (bg_index, poly_index), the same pair as snapshot["floor"]. Build one per snapshot;
+    the per-mesh SurfaceGrids are cached on the meshes, so a new query over a reused static room
+    costs nothing.
+
+    `skip` drops triangles by surface property for every query: a SURFACE_FLAGS name, a
+    (field, codes) tuple, or a list of those (e.g. skip="void" to ignore void-out floors)."""
+
+    def __init__(self, meshes, skip=None):
+        if isinstance(meshes, dict) and "meshes" in meshes:
+            meshes = meshes["meshes"]
+        items = meshes.items() if isinstance(meshes, dict) else enumerate(meshes)
+        if skip is None:
+            rules = []
+        elif isinstance(skip, (str, tuple)):
+            rules = [skip]
+        else:
+            rules = list(skip)
+        self.grids = []
+        for bg, m in items:
+            mask = None
+            for rule in rules:
+                mk = tri_mask(m, rule, ()) if isinstance(rule, str) else tri_mask(m, *rule)
+                if 1 not in mk:
+                    continue
+                if mask is not None:        # OR the two 0/1 masks as big integers
+                    mk = (int.from_bytes(mask, "big") | int.from_bytes(mk, "big")).to_bytes(len(mk), "big")
+                mask = mk
+            self.grids.append((bg, surface_grid(m), mask))
+
+    def ground_height(self, x, z, y_hint=None):
+        """Highest ground-class surface under (x, z) at or below y_hint (any height when None),
+        as (y, (bg_index, poly_index)), or None if there is no floor there."""
+        best = None
+        for bg, g, skip in self.grids:
+            corners, planes, classes = g.corners, g.planes, g.classes
+            for i in g.column(x, z):
+                if classes[i] != "ground" or (skip is not None and skip[i]):
+                    continue
+                nx, ny, nz, d = planes[i]
+                v0, v1, v2 = corners[i]
+                if not _in_tri_xz(x, z, v0, v1, v2):
+                    continue
+                y = -(nx * x + nz * z + d) / ny
+                if y_hint is not None and y > y_hint:
+                    continue
+                if best is None or y > best[0]:
+                    best = (y, (bg, i))
+        return best
+
+    def raycast(self, origin, direction, max_dist=float("inf"), classes=None):
+        """First triangle hit along origin + t*direction for 0 <= t <= max_dist (t in world
+        units: `direction` is normalized here). `classes` optionally limits the surface classes
+        tested, e.g. ("wall",). Returns (t, (x, y, z), class, (bg_index, poly_index)) or None."""
+        m = math.sqrt(_dot(direction, direction))
+        if m < _EPS:
+            return None
+        d = (direction[0] / m, direction[1] / m, direction[2] / m)
+        o = tuple(origin)
+        best_t, best = max_dist, None
+        for bg, g, skip in self.grids:
+            corners, cls = g.corners, g.classes
+            seen = set()
+
+            def test(bucket):
+                nonlocal best_t, best
+                for i in bucket:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    if classes is not None and cls[i] not in classes:
+                        continue
+                    if skip is not None and skip[i]:
+                        continue
+                    t = _ray_tri(o, d, *corners[i])
+                    if t is not None and t <= best_t:
+                        best_t, best = t, (bg, i, cls[i])
+
+            test(g.big)
+            # cells come in ray order: once the best hit lies before the current cell's exit,
+            # nothing further along can beat it
+            t_lim = best_t if best_t != float("inf") else 1e12
+            for t_exit, bucket in g.ray_cells(o[0], o[2], d[0], d[2], t_lim):
+                test(bucket)
+                if best_t <= t_exit:
+                    break
+        if best is None:
+            return None
+        bg, i, c = best
+        return (best_t, (o[0] + d[0] * best_t, o[1] + d[1] * best_t, o[2] + d[2] * best_t),
+                c, (bg, i))
+
+    def wall_hits(self, p0, p1, radius):
+        """Wall-class triangles within `radius` of the segment p0 -> p1 (a swept sphere), as
+        [(distance, (bg_index, poly_index)), ...] nearest first. radius=0 gives the walls the
+        segment actually crosses."""
+        p0, p1 = tuple(p0), tuple(p1)
+        r2 = radius * radius
+        x0, x1 = min(p0[0], p1[0]) - radius, max(p0[0], p1[0]) + radius
+        z0, z1 = min(p0[2], p1[2]) - radius, max(p0[2], p1[2]) + radius
+        out = []
+        for bg, g, skip in self.grids:
+            corners, planes, classes = g.corners, g.planes, g.classes
+            for i in g.box(x0, z0, x1, z1):
+                if classes[i] != "wall" or (skip is not None and skip[i]):
+                    continue
+                nx, ny, nz, d = planes[i]
+                s0 = nx * p0[0] + ny * p0[1] + nz * p0[2] + d
+                s1 = nx * p1[0] + ny * p1[1] + nz * p1[2] + d
+                if (s0 > radius and s1 > radius) or (s0 < -radius and s1 < -radius):
+                    continue            # both ends on one side of the plane, beyond reach
+                d2 = _seg_tri_dist2(p0, p1, *corners[i])
+                if d2 <= r2:
+                    out.append((math.sqrt(d2), (bg, i)))
+        out.sort()
+        return out
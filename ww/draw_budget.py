@@ -0,0 +1,164 @@
+"""
+ww.draw_budget
+--------------
+Adaptive per-frame draw caps for the canvas viewers (collision_viewer, cull_viewer).
+
+A viewer canvas becomes ONE ImGui draw list with 16-bit indices: past VERTEX_CEILING vertices in
+a frame the core crashes. Fixed primitive caps have to be tuned for the worst scene on the slowest
+machine, so instead:
+  - BudgetCanvas wraps the canvas and counts the vertices every draw call emits (VERTS: ImGui's
+    anti-aliased worst case per primitive, text at 4 per glyph); as a last guard it drops calls
+    that would cross the ceiling,
+  - DrawBudget times each frame's draw and scales the viewer's caps (one per kind of item it
+    budgets: collision triangles, actor boxes) toward a target in milliseconds -- down when a
+    frame ran over, up when it ran under and the cap was what limited it,
+  - every cap is also bounded so cap x (the item's worst-case vertices) plus the rest of the frame
+    (HUD, markers: last frame's unbudgeted vertices) stays under the ceiling.
+BudgetCanvas can also record a run of draw calls and replay them, so a viewer whose scene did not
+change since the last frame re-emits the same calls without collecting / projecting / sorting.
+
+Typical use, per frame:
+    budget.begin()
+    n = budget.cap("tri", verts_per_tri)
+    ... draw up to n items through budget.cv ...
+    budget.used("tri", drawn, verts_emitted)
+    budget.end()
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Tuple
+
+VERTEX_CEILING = 65535       # 16-bit draw-list indices
+VERTEX_MARGIN = 1024         # kept free below the ceiling
+TARGET_MS = 8.0              # draw-time goal per frame
+GROW_MAX = 1.25              # per-frame cap change limits
+SHRINK_MIN = 0.5
+
+# Worst-case vertices per canvas call (anti-aliased fills double the outline; thick AA lines are
+# 4 per point; small circles stay under 32 segments; rect_filled is an unrounded quad).
+VERTS = {"triangle_filled": 6, "line": 8, "circle_filled": 64, "rect_filled": 4}
+TEXT_VERTS_PER_CHAR = 4
+
+
+class BudgetCanvas:
+    """Canvas proxy: counts each draw call's vertices (`verts`, reset by clear()) and drops calls
+    that would go past `limit` (counted in `dropped`). Between record() and stop() the draw calls
+    are also kept, for replay() on a later frame. Other attributes pass through."""
+
+    def __init__(self, canvas, limit: int = VERTEX_CEILING - VERTEX_MARGIN):
+        self._cv = canvas
+        self.limit = limit
+        self.verts = 0
+        self.dropped = 0
+        self._rec = None
+
+    def __getattr__(self, name):
+        return getattr(self._cv, name)
+
+    def record(self):
+        self._rec = []
+
+    def stop(self) -> tuple:
+        """End record(); returns the recording, (calls, vertices), for replay()."""
+        calls, self._rec = self._rec or [], None
+        return calls, sum(c[4] for c in calls)
+
+    def replay(self, recording: tuple):
+        """Re-emit recorded calls: straight to the canvas when they all fit under `limit`, else one
+        by one through the guard."""
+        calls, verts = recording
+        if self.verts + verts <= self.limit:
+            self.verts += verts
+            for _name, fn, a, kw, _n in calls:
+                fn(*a, **kw)
+            return
+        for name, _fn, a, kw, _n in calls:
+            getattr(self, name)(*a, **kw)
+
+    def _take(self, n: int, name: str, a, kw) -> bool:
+        if self._rec is not None:
+            self._rec.append((name, getattr(self._cv, name), a, kw, n))
+        if self.verts + n > self.limit:
+            self.dropped += 1
+            return False
+        self.verts += n
+        return True
+
+    def clear(self):
+        self.verts = self.dropped = 0
+        self._cv.clear()
+
+    def triangle_filled(self, *a, **kw):
+        if self._take(VERTS["triangle_filled"], "triangle_filled", a, kw):
+            self._cv.triangle_filled(*a, **kw)
+
+    def line(self, *a, **kw):
+        if self._take(VERTS["line"], "line", a, kw):
+            self._cv.line(*a, **kw)
+
+    def circle_filled(self, *a, **kw):
+        if self._take(VERTS["circle_filled"], "circle_filled", a, kw):
+            self._cv.circle_filled(*a, **kw)
+
+    def rect_filled(self, *a, **kw):
+        if self._take(VERTS["rect_filled"], "rect_filled", a, kw):
+            self._cv.rect_filled(*a, **kw)
+
+    def text(self, pos, color, s, *a, **kw):
+        if self._take(TEXT_VERTS_PER_CHAR * len(s), "text", (pos, color, s) + a, kw):
+            self._cv.text(pos, color, s, *a, **kw)
+
+
+class DrawBudget:
+    """Frame-to-frame caps for a BudgetCanvas. `caps` is {kind: (start, lo, hi)} in items."""
+
+    def __init__(self, canvas: BudgetCanvas, caps: Dict[str, Tuple[int, int, int]],
+                 target_ms: float = TARGET_MS):
+        self.cv = canvas
+        self.target_ms = target_ms
+        self.caps = {k: float(s) for k, (s, _lo, _hi) in caps.items()}
+        self.bounds = {k: (lo, hi) for k, (_s, lo, hi) in caps.items()}
+        self.ms = 0.0              # last frame's draw time
+        self._other = 0            # last frame's vertices outside the budgeted kinds
+        self._reserved = 0
+        self._used: Dict[str, Tuple[int, int, bool]] = {}
+        self._t0 = None
+
+    def begin(self):
+        self._t0 = time.perf_counter()
+        self._reserved = 0
+        self._used = {}
+
+    def cap(self, kind: str, per_item: int) -> int:
+        """This frame's item cap for `kind`, one item emitting at most `per_item` vertices. Kinds
+        capped earlier in the frame keep their share of the vertex room."""
+        lo, hi = self.bounds[kind]
+        per_item = max(1, per_item)
+        room = (self.cv.limit - self._other - self._reserved) // per_item
+        n = max(0, min(int(self.caps[kind]), hi, room))
+        if room >= lo:
+            n = max(n, lo)
+        self._reserved += n * per_item
+        return n
+
+    def used(self, kind: str, items: int, verts: int, retune: bool = True):
+        """Record what `kind` actually drew this frame (items, vertices emitted). retune=False for a
+        replayed frame: its vertices are accounted, but its (short) time doesn't move the cap."""
+        self._used[kind] = (items, verts, retune)
+
+    def end(self) -> float:
+        """Close the frame: returns its draw time (ms) and retunes the caps."""
+        if self._t0 is None:
+            return 0.0
+        self.ms = (time.perf_counter() - self._t0) * 1e3
+        self._t0 = None
+        self._other = max(0, self.cv.verts - sum(u[1] for u in self._used.values()))
+        scale = max(SHRINK_MIN, min(GROW_MAX, self.target_ms / max(self.ms, 1e-3)))
+        for kind, (items, _v, retune) in self._used.items():
+            c = self.caps[kind]
+            if retune and (scale < 1.0 or items >= int(c)):    # only grow a cap that was the limit
+                lo, hi = self.bounds[kind]
+                self.caps[kind] = max(float(lo), min(float(hi), c * scale))
+        return self.ms
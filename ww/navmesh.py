@@ -0,0 +1,511 @@
+"""
+ww.navmesh
+----------
+Walkable-surface navigation mesh over ww.collision_geo meshes, for grid_navigator.
+
+Built from the ground-classified triangles of a collision snapshot:
+  1. vertices are welded through a quantized position hash (1/QUANT units), so triangles from
+     different meshes / duplicated DZB vertices still share edges,
+  2. two ground triangles sharing an edge are neighbours; the shared edge is their portal,
+  3. an XZ bucket grid over triangle footprints locates the triangle under a point (the one
+     nearest the given height, for stacked floors).
+find_path() runs A* over the triangle graph (a triangle sits where the line toward the goal
+crosses its entry portal, clamped to the portal; straight-line heuristic), pulls the corridor
+tight with the simple-stupid funnel, then drops every corner a raycast over the mesh can see
+past, so the result is the few corner waypoints a walker needs, not one point per triangle.
+The NavMesh object is built once per room (the caller keys it); NavMesh.begin() builds it a
+slice at a time for a caller that can't stall a frame. Open-room queries take a few
+milliseconds; a search that has to flood around a long wall can take ~10k expansions (tens of
+ms on 20k triangles), so begin_path() runs it MAX_EXPANSIONS at a time, one slice per frame,
+and a replan toward the same goal reuses the last path while only the start moved.
+
+Pure Python, no dolphin / ww imports: it only reads mesh dicts (verts / tris / classes, and
+`props` when a skip mask is wanted), so it also runs offline on mesh_from_tables() meshes.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Point = Tuple[float, float]            # world (x, z)
+
+QUANT = 64.0            # vertex weld grid: 1/64 world unit
+CELL_MIN = 100.0        # locate-grid cell floor (world units)
+TRIS_PER_CELL = 4
+# A* heuristic weight. With portal points on the line toward the goal an open-room corridor already
+# costs the straight-line distance; on cluttered floors 1.2 expands about a third of what plain A*
+# does for paths ~1.5% longer (the raycast refit takes back most detours anyway).
+HEURISTIC_WEIGHT = 1.2
+MAX_EXPANSIONS = 600    # A* expansions per PathSearch.step(): a few ms in CPython
+RAY_NUDGE = 0.05        # world units: visibility rays start this far past a corner / off its edges
+BUILD_SLICE = 500       # triangles / edges per NavMeshBuild.step()
+
+
+def _portal_point(p, gp, a, b):
+    """Where the XZ line p -> gp crosses portal a-b, clamped to the portal (3D, height
+    interpolated along it); the portal point nearest p when the two are parallel."""
+    ex, ez = b[0] - a[0], b[2] - a[2]
+    dx, dz = gp[0] - p[0], gp[2] - p[2]
+    den = ex * dz - ez * dx
+    if abs(den) > 1e-9:
+        u = ((p[0] - a[0]) * dz - (p[2] - a[2]) * dx) / den
+    else:
+        l2 = ex * ex + ez * ez
+        u = ((p[0] - a[0]) * ex + (p[2] - a[2]) * ez) / l2 if l2 > 0.0 else 0.0
+    u = 0.0 if u < 0.0 else 1.0 if u > 1.0 else u
+    return (a[0] + u * ex, a[1] + u * (b[1] - a[1]), a[2] + u * ez)
+
+
+def _tri_area2(a: Point, b: Point, c: Point) -> float:
+    """Twice the signed XZ area of a-b-c (the funnel's side test)."""
+    return (c[0] - a[0]) * (b[1] - a[1]) - (b[0] - a[0]) * (c[1] - a[1])
+
+
+class NavMesh:
+    """Ground-triangle adjacency + portal graph over one room's collision meshes.
+
+    `meshes` is an iterable of mesh dicts; `skip_masks` an optional parallel iterable of per-
+    triangle 0/1 masks (ww.collision_geo.tri_mask) whose set triangles are left out, e.g. void
+    floors. Triangle ids here are indices into the navmesh's own arrays, not DZB poly indices."""
+
+    def __init__(self, meshes: Iterable[dict], skip_masks: Optional[Iterable] = None):
+        _run(self._build(meshes, skip_masks))
+
+    @classmethod
+    def begin(cls, meshes: Iterable[dict], skip_masks: Optional[Iterable] = None) -> "NavMeshBuild":
+        """NavMesh(meshes, skip_masks) a slice at a time: a NavMeshBuild whose step() each handle
+        at most BUILD_SLICE triangles / edges."""
+        nav = cls.__new__(cls)
+        return NavMeshBuild(nav, nav._build(meshes, skip_masks))
+
+    def _build(self, meshes, skip_masks):
+        """The constructor as a generator: yields after every BUILD_SLICE triangles / edges."""
+        meshes = list(meshes)
+        budget = BUILD_SLICE
+        masks = list(skip_masks) if skip_masks is not None else [None] * len(meshes)
+        wkey: Dict[Tuple[int, int, int], int] = {}
+        pts: List[Tuple[float, float, float]] = []
+        tris: List[Tuple[int, int, int]] = []
+        centroids: List[Tuple[float, float, float]] = []
+        for m, mask in zip(meshes, masks):
+            verts = m["verts"]
+            for i, ((a, b, c, _tid, _grp), cls) in enumerate(zip(m["tris"], m["classes"])):
+                budget -= 1
+                if budget <= 0:
+                    yield
+                    budget = BUILD_SLICE
+                if cls != "ground" or (mask is not None and mask[i]):
+                    continue
+                ids = []
+                for vi in (a, b, c):
+                    v = verts[vi]
+                    k = (int(round(v[0] * QUANT)), int(round(v[1] * QUANT)),
+                         int(round(v[2] * QUANT)))
+                    w = wkey.get(k)
+                    if w is None:
+                        w = wkey[k] = len(pts)
+                        pts.append(v)
+                    ids.append(w)
+                if ids[0] != ids[1] and ids[1] != ids[2] and ids[0] != ids[2]:
+                    tris.append((ids[0], ids[1], ids[2]))
+                    p, q, r = pts[ids[0]], pts[ids[1]], pts[ids[2]]
+                    centroids.append(((p[0] + q[0] + r[0]) / 3.0, (p[1] + q[1] + r[1]) / 3.0,
+                                      (p[2] + q[2] + r[2]) / 3.0))
+        self.pts = pts
+        self.tris = tris
+        self.centroids = centroids
+
+        # adjacency: triangle -> [(neighbour, (va, vb) shared edge, pts[va], pts[vb]), ...]
+        edges: Dict[Tuple[int, int], List[int]] = {}
+        for t, (a, b, c) in enumerate(tris):
+            for u, v in ((a, b), (b, c), (c, a)):
+                edges.setdefault((u, v) if u < v else (v, u), []).append(t)
+            budget -= 1
+            if budget <= 0:
+                yield
+                budget = BUILD_SLICE
+        self.adj: List[list] = [[] for _ in tris]
+        for e, ts in edges.items():
+            if len(ts) < 2:
+                continue
+            a, b = pts[e[0]], pts[e[1]]
+            for t in ts:
+                for o in ts:
+                    if o != t:
+                        self.adj[t].append((o, e, a, b))
+            budget -= 1
+            if budget <= 0:
+                yield
+                budget = BUILD_SLICE
+
+        # locate grid over XZ footprints
+        n = len(tris)
+        if n:
+            xs = list(map(itemgetter(0), pts))
+            zs = list(map(itemgetter(2), pts))
+            area = max(1.0, max(xs) - min(xs)) * max(1.0, max(zs) - min(zs))
+        else:
+            area = 1.0
+        self.cell = max(CELL_MIN, math.sqrt(area * TRIS_PER_CELL / max(1, n)))
+        inv = 1.0 / self.cell
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for t, (a, b, c) in enumerate(tris):
+            x0 = int(math.floor(min(pts[a][0], pts[b][0], pts[c][0]) * inv))
+            x1 = int(math.floor(max(pts[a][0], pts[b][0], pts[c][0]) * inv))
+            z0 = int(math.floor(min(pts[a][2], pts[b][2], pts[c][2]) * inv))
+            z1 = int(math.floor(max(pts[a][2], pts[b][2], pts[c][2]) * inv))
+            for ix in range(x0, x1 + 1):
+                for iz in range(z0, z1 + 1):
+                    cells.setdefault((ix, iz), []).append(t)
+            budget -= 1
+            if budget <= 0:
+                yield
+                budget = BUILD_SLICE
+        self.cells = cells
+        self._last = None       # (goal tri, goal XZ, waypoints) of the last finished search
+
+    def __len__(self) -> int:
+        return len(self.tris)
+
+    # ── point location ───────────────────────────────────────────────
+
+    def _height(self, t: int, x: float, z: float) -> Optional[float]:
+        """Triangle t's height at (x, z) if (x, z) lies inside its XZ projection, else None."""
+        a, b, c = (self.pts[i] for i in self.tris[t])
+        d = (b[0] - a[0]) * (c[2] - a[2]) - (c[0] - a[0]) * (b[2] - a[2])
+        if abs(d) < 1e-9:
+            return None
+        u = ((x - a[0]) * (c[2] - a[2]) - (c[0] - a[0]) * (z - a[2])) / d
+        v = ((b[0] - a[0]) * (z - a[2]) - (x - a[0]) * (b[2] - a[2])) / d
+        if u < -1e-6 or v < -1e-6 or u + v > 1.0 + 1e-6:
+            return None
+        return a[1] + u * (b[1] - a[1]) + v * (c[1] - a[1])
+
+    def locate(self, x: float, z: float, y: Optional[float] = None,
+               search: float = 0.0) -> Optional[int]:
+        """The triangle under (x, z) whose surface is nearest height `y` (highest when None).
+        Off the mesh, the triangle with the nearest centroid within `search` units, else None."""
+        inv = 1.0 / self.cell
+        best, best_dy = None, float("inf")
+        for t in self.cells.get((int(math.floor(x * inv)), int(math.floor(z * inv))), ()):
+            h = self._height(t, x, z)
+            if h is None:
+                continue
+            dy = abs(h - y) if y is not None else -h
+            if dy < best_dy:
+                best, best_dy = t, dy
+        if best is not None or search <= 0.0:
+            return best
+        r = int(math.ceil(search * inv))
+        cx, cz = int(math.floor(x * inv)), int(math.floor(z * inv))
+        best_d2 = search * search
+        for ix in range(cx - r, cx + r + 1):
+            for iz in range(cz - r, cz + r + 1):
+                for t in self.cells.get((ix, iz), ()):
+                    c = self.centroids[t]
+                    d2 = (c[0] - x) ** 2 + (c[2] - z) ** 2
+                    if y is not None:
+                        d2 += (c[1] - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = t, d2
+        return best
+
+    # ── search ───────────────────────────────────────────────────────
+
+    def corridor(self, start_t: int, goal_t: int,
+                 start: Sequence[float], goal: Sequence[float]) -> Optional[List[Tuple[int, Tuple[int, int]]]]:
+        """A* over triangles from start_t to goal_t. Returns [(tri, edge entered through), ...]
+        (the start triangle's edge is None), or None when they aren't connected. A triangle's
+        position is where the line from its parent's position toward `goal` crosses the portal it
+        was reached through, clamped to that portal (`start` for start_t); `start` / `goal` are 3D
+        points."""
+        return _run(self._search(start_t, goal_t, start, goal))
+
+    def _search(self, start_t, goal_t, start, goal):
+        """corridor() as a generator: yields after every MAX_EXPANSIONS expanded triangles and
+        returns the corridor (StopIteration.value)."""
+        if start_t == goal_t:
+            return [(start_t, None)]
+        d3 = math.dist
+        s, gp = tuple(start), tuple(goal)
+        g_cost = {start_t: 0.0}
+        pos = {start_t: s}
+        came: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+        w = HEURISTIC_WEIGHT
+        heap = [(w * d3(s, gp), 0.0, start_t)]
+        closed = set()
+        budget = MAX_EXPANSIONS
+        while heap:
+            _f, g, t = heapq.heappop(heap)
+            if t in closed:
+                continue
+            if t == goal_t:
+                break
+            budget -= 1
+            if budget < 0:
+                yield
+                budget = MAX_EXPANSIONS - 1
+            closed.add(t)
+            here = pos[t]
+            for o, e, a, b in self.adj[t]:
+                if o in closed:
+                    continue
+                p = _portal_point(here, gp, a, b)
+                ng = g + d3(here, p)
+                if ng < g_cost.get(o, float("inf")):
+                    g_cost[o] = ng
+                    pos[o] = p
+                    came[o] = (t, e)
+                    heapq.heappush(heap, (ng + w * d3(p, gp), ng, o))
+        else:
+            return None
+        out = []
+        t = goal_t
+        while t != start_t:
+            prev, e = came[t]
+            out.append((t, e))
+            t = prev
+        out.append((start_t, None))
+        out.reverse()
+        return out
+
+    def _portals(self, corridor, start: Point, goal: Point) -> List[Tuple[Point, Point]]:
+        """(left, right) XZ portal pairs along the corridor, framed by start and goal."""
+        portals = [(start, start)]
+        for k in range(1, len(corridor)):
+            prev_t = corridor[k - 1][0]
+            e = corridor[k][1]
+            a, b = self.pts[e[0]], self.pts[e[1]]
+            pa, pb = (a[0], a[2]), (b[0], b[2])
+            c = self.centroids[prev_t]
+            # Facing across the portal from the triangle we leave, `left` is on the left.
+            if _tri_area2((c[0], c[2]), pa, pb) < 0.0:
+                pa, pb = pb, pa
+            portals.append((pa, pb))
+        portals.append((goal, goal))
+        return portals
+
+    @staticmethod
+    def _funnel(portals: List[Tuple[Point, Point]]) -> List[Point]:
+        """Simple stupid funnel (Mononen): the taut XZ path through the portal sequence."""
+        apex = left = right = portals[0][0]
+        ai = li = ri = 0
+        path = [apex]
+        i = 1
+        while i < len(portals):
+            pl, pr = portals[i]
+            if _tri_area2(apex, right, pr) <= 0.0:
+                if apex == right or _tri_area2(apex, left, pr) >= 0.0:
+                    right, ri = pr, i
+                else:
+                    path.append(left)
+                    apex, ai = left, li
+                    left = right = apex
+                    li = ri = ai
+                    i = ai + 1
+                    continue
+            if _tri_area2(apex, left, pl) >= 0.0:
+                if apex == left or _tri_area2(apex, right, pl) <= 0.0:
+                    left, li = pl, i
+                else:
+                    path.append(right)
+                    apex, ai = right, ri
+                    left = right = apex
+                    li = ri = ai
+                    i = ai + 1
+                    continue
+            i += 1
+        end = portals[-1][0]
+        if path[-1] != end:
+            path.append(end)
+        return path
+
+    def _visible(self, a: Point, ay: float, b: Point) -> bool:
+        """True when the XZ segment a-b stays on the mesh. Walks the triangles it crosses until one
+        contains `b`, failing at a border edge. Waypoints are mesh vertices and rays often run
+        along edges, so the segment is tried shifted RAY_NUDGE to either side (and started
+        RAY_NUDGE past `a`, in the triangle under it at height ay)."""
+        dx, dz = b[0] - a[0], b[1] - a[1]
+        d = math.hypot(dx, dz)
+        if d <= 2.0 * RAY_NUDGE:
+            return True
+        ux, uz = dx * RAY_NUDGE / d, dz * RAY_NUDGE / d
+        for side in (1.0, -1.0):
+            ox, oz = -uz * side, ux * side
+            if self._walk((a[0] + ux + ox, a[1] + uz + oz), ay, (b[0] + ox, b[1] + oz)):
+                return True
+        return False
+
+    def _walk(self, p: Point, py: float, q: Point) -> bool:
+        """_visible() for one segment p-q: done once q lies before the exit edge."""
+        pts, tris = self.pts, self.tris
+        px, pz = p
+        dx, dz = q[0] - px, q[1] - pz
+        t = self.locate(px, pz, py)
+        entry = None
+        for _ in range(len(tris)):
+            if t is None:
+                return False
+            # exit edge: the one (other than the way in) the ray crosses furthest along
+            best_s, exit_e = -1.0, None
+            i0, i1, i2 = tris[t]
+            for u, v in ((i0, i1), (i1, i2), (i2, i0)):
+                e = (u, v) if u < v else (v, u)
+                if e == entry:
+                    continue
+                ax, az = pts[u][0] - px, pts[u][2] - pz
+                ex, ez = pts[v][0] - pts[u][0], pts[v][2] - pts[u][2]
+                den = dx * ez - dz * ex
+                if abs(den) < 1e-12:
+                    continue
+                k = (ax * dz - az * dx) / den
+                if -1e-9 <= k <= 1.0 + 1e-9:
+                    s = (ax * ez - az * ex) / den
+                    if s > best_s:
+                        best_s, exit_e = s, e
+            if exit_e is None:
+                return False
+            if best_s >= 1.0:
+                return True
+            nxt = None
+            for o, e, _a, _b in self.adj[t]:
+                if e == exit_e:
+                    nxt = o
+                    break
+            t, entry = nxt, exit_e
+        return False
+
+    def _shortcut(self, path: List[Point], heights: Dict[Point, float]) -> List[Point]:
+        """Refit the funnel's path: from each kept waypoint jump to the furthest later one it
+        sees. The A* corridor can detour (its triangle positions only approximate the taut path)
+        and the funnel stays inside it, so this is what straightens it. The goal is tried first,
+        then later waypoints by galloping + bisection, so a long staircase costs a few rays."""
+        out = [path[0]]
+        i, n = 0, len(path) - 1
+        while i < n - 1:
+            a = path[i]
+            ay = heights.get(a)
+            if self._visible(a, ay, path[n]):
+                break
+            lo, hi, step = i + 1, n, 1      # path[lo] is seen (the funnel leg), path[hi] is not
+            while lo + step < hi and self._visible(a, ay, path[lo + step]):
+                lo += step
+                step *= 2
+            hi = min(hi, lo + step)
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if self._visible(a, ay, path[mid]):
+                    lo = mid
+                else:
+                    hi = mid
+            out.append(path[lo])
+            i = lo
+        out.append(path[n])
+        return out
+
+    def _finish(self, cor, gt: int, start: Sequence[float], goal: Point) -> Optional[List[Point]]:
+        """Waypoints through a finished corridor (None: not connected); kept for reuse."""
+        if cor is None:
+            return None
+        s = (start[0], start[2])
+        heights = {s: start[1], goal: self.centroids[gt][1]}
+        for _t, e in cor[1:]:
+            for vi in e:
+                p = self.pts[vi]
+                heights[(p[0], p[2])] = p[1]
+        path = self._shortcut(self._funnel(self._portals(cor, s, goal)), heights)
+        self._last = (gt, goal, path)
+        return path
+
+    def begin_path(self, start: Sequence[float], goal: Sequence[float],
+                   search: float = 300.0) -> Optional["PathSearch"]:
+        """find_path() a slice at a time: a PathSearch whose step() each run at most
+        MAX_EXPANSIONS A* expansions. None when either end is off the mesh (beyond `search`).
+        When the goal is the last finished query's and the new start still sees that path's
+        first waypoint, the path is reused from there and is done at once (no search)."""
+        st = self.locate(start[0], start[2], start[1], search)
+        gt = self.locate(goal[0], goal[2], goal[1], search)
+        if st is None or gt is None:
+            return None
+        g = (goal[0], goal[2])
+        last = self._last
+        if last is not None and last[0] == gt and last[1] == g:
+            s, path = (start[0], start[2]), last[2]
+            if self._visible(s, start[1], path[1]):
+                j = 1
+                while j < len(path) - 1 and self._visible(s, start[1], path[j + 1]):
+                    j += 1
+                return PathSearch(self, None, gt, start, g, [s] + path[j:])
+        it = self._search(st, gt, start, (goal[0], self.centroids[gt][1], goal[2]))
+        return PathSearch(self, it, gt, start, g)
+
+    def find_path(self, start: Sequence[float], goal: Sequence[float],
+                  search: float = 300.0) -> Optional[List[Point]]:
+        """XZ waypoints from `start` to `goal`, start first, goal last. Both are (x, y, z); y picks
+        the floor level (goal y may be None: the highest floor there). None when either end is off
+        the mesh (beyond `search`) or the two are not connected. Runs the whole search at once;
+        begin_path() spreads it over several calls."""
+        q = self.begin_path(start, goal, search)
+        if q is None:
+            return None
+        while not q.step():
+            pass
+        return q.path
+
+
+class NavMeshBuild:
+    """An in-progress NavMesh.begin() build. step() runs one slice and returns True once `nav`
+    is ready to query."""
+
+    def __init__(self, nav: NavMesh, it):
+        self.nav, self._it = nav, it
+        self.done = False
+
+    def step(self) -> bool:
+        if not self.done:
+            try:
+                next(self._it)
+            except StopIteration:
+                self.done = True
+        return self.done
+
+
+class PathSearch:
+    """An in-progress NavMesh.begin_path() query. Each step() either advances the A* by at most
+    MAX_EXPANSIONS triangles or, once it has its corridor, funnels and refits the path; it
+    returns True once `path` is final (None: not connected)."""
+
+    def __init__(self, nav: NavMesh, it, gt: int, start: Sequence[float], goal: Point,
+                 path: Optional[List[Point]] = None):
+        self.nav, self._it, self._gt = nav, it, gt
+        self._start, self._goal = tuple(start), goal
+        self._cor = None
+        self.done = it is None
+        self.path = path
+
+    def step(self) -> bool:
+        if self.done:
+            return True
+        if self._it is not None:
+            try:
+                next(self._it)
+                return False
+            except StopIteration as e:
+                self._it, self._cor = None, e.value
+                if self._cor is not None:
+                    return False
+        self.path = self.nav._finish(self._cor, self._gt, self._start, self._goal)
+        self.done = True
+        return True
+
+
+def _run(gen):
+    """Drive a generator to the end and return its return value."""
+    while True:
+        try:
+            next(gen)
+        except StopIteration as e:
+            return e.value
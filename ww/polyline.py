@@ -0,0 +1,157 @@
+"""
+ww.polyline
+-----------
+Screen-space level of detail for polylines drawn on a `gui` canvas.
+
+A world polyline (e.g. the superswim projection, up to thousands of steps) is reduced to what can
+actually be seen at the current view before any canvas call:
+  1. transform to canvas pixels once,
+  2. drop vertices closer than `min_px` to the last kept one (sub-pixel wiggle),
+  3. Douglas-Peucker to `eps_px` (segment distance, so back-and-forth paths keep their extent),
+  4. keep only segments whose bounding box touches the canvas, and drop exact overlaps,
+and the step dots are thinned to one per `dot_px` cell. PolylineLOD caches the result per
+(source version, view key), so an unchanged path at an unchanged zoom/pan is a dict lookup.
+
+Pure Python on purpose: usable from ss_navigator / grid_navigator (2D transforms) and from the 3D
+viewers (pass already-projected screen points with an identity `to_screen`).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+Point = Tuple[float, float]
+Segment = Tuple[Point, Point]
+Rect = Tuple[float, float, float, float]   # x0, y0, x1, y1 (canvas pixels)
+
+
+def _seg_dist2(p: Point, a: Point, b: Point) -> float:
+    """Squared distance from p to the SEGMENT a-b (clamped, not the infinite line)."""
+    ax, ay = a
+    abx, aby = b[0] - ax, b[1] - ay
+    apx, apy = p[0] - ax, p[1] - ay
+    l2 = abx * abx + aby * aby
+    if l2 > 0.0:
+        t = (apx * abx + apy * aby) / l2
+        if t > 1.0:
+            t = 1.0
+        elif t < 0.0:
+            t = 0.0
+        apx -= t * abx
+        apy -= t * aby
+    return apx * apx + apy * apy
+
+
+def drop_short(pts: Sequence[Point], min_px: float) -> List[Point]:
+    """Drop vertices within `min_px` of the previously kept one (endpoints always kept)."""
+    if len(pts) < 3:
+        return list(pts)
+    m2 = min_px * min_px
+    out = [pts[0]]
+    lx, ly = pts[0]
+    for p in pts[1:-1]:
+        dx, dy = p[0] - lx, p[1] - ly
+        if dx * dx + dy * dy >= m2:
+            out.append(p)
+            lx, ly = p
+    out.append(pts[-1])
+    return out
+
+
+def douglas_peucker(pts: Sequence[Point], eps_px: float) -> List[Point]:
+    """Iterative Douglas-Peucker: keep the vertices that deviate more than `eps_px` from the
+    simplified segment spanning them."""
+    n = len(pts)
+    if n < 3:
+        return list(pts)
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    e2 = eps_px * eps_px
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        a, b = pts[i], pts[j]
+        best, bi = e2, -1
+        for k in range(i + 1, j):
+            d = _seg_dist2(pts[k], a, b)
+            if d > best:
+                best, bi = d, k
+        if bi >= 0:
+            keep[bi] = 1
+            stack.append((i, bi))
+            stack.append((bi, j))
+    return [p for p, k in zip(pts, keep) if k]
+
+
+def visible_segments(pts: Sequence[Point], rect: Rect) -> List[Segment]:
+    """Segments of the polyline whose bounding box touches `rect`, with exact repeats (a path
+    retracing itself) emitted once."""
+    x0, y0, x1, y1 = rect
+    out: List[Segment] = []
+    seen = set()
+    for i in range(len(pts) - 1):
+        a, b = pts[i], pts[i + 1]
+        if (max(a[0], b[0]) < x0 or min(a[0], b[0]) > x1
+                or max(a[1], b[1]) < y0 or min(a[1], b[1]) > y1):
+            continue
+        k = (a, b) if a <= b else (b, a)
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append((a, b))
+    return out
+
+
+def thin_points(pts: Sequence[Point], dot_px: float, rect: Rect) -> List[Point]:
+    """At most one point per `dot_px` grid cell, and only points inside `rect`."""
+    x0, y0, x1, y1 = rect
+    out: List[Point] = []
+    cells = set()
+    for p in pts:
+        x, y = p
+        if x < x0 or x > x1 or y < y0 or y > y1:
+            continue
+        c = (int(x // dot_px), int(y // dot_px))
+        if c in cells:
+            continue
+        cells.add(c)
+        out.append(p)
+    return out
+
+
+def screen_lod(pts: Sequence[Point], rect: Rect, eps_px: float = 0.5,
+               min_px: float = 1.0) -> List[Segment]:
+    """Canvas-space polyline -> the minimal list of segments to draw inside `rect`."""
+    return visible_segments(douglas_peucker(drop_short(pts, min_px), eps_px), rect)
+
+
+class PolylineLOD:
+    """Caches the simplified draw list (segments + thinned dots) for ONE polyline.
+
+    `src_key` identifies the world points (e.g. ProjectionCache.version) and `view_key` the
+    world->canvas mapping (e.g. ViewTransform.view_key plus anything else the mapping reads);
+    the transform + simplification only re-run when either changes."""
+
+    def __init__(self, eps_px: float = 0.5, min_px: float = 1.0, dot_px: float = 4.0) -> None:
+        self.eps_px = eps_px
+        self.min_px = min_px
+        self.dot_px = dot_px
+        self._key: Optional[Tuple[Hashable, Hashable, Rect]] = None
+        self.segments: List[Segment] = []
+        self.dots: List[Point] = []
+
+    def get(self, src_key: Hashable, view_key: Hashable, world_pts: Sequence[Point],
+            to_screen: Callable[[float, float], Point],
+            rect: Rect) -> Tuple[List[Segment], List[Point]]:
+        key = (src_key, view_key, rect)
+        if key != self._key:
+            self._key = key
+            spts = [to_screen(x, z) for x, z in world_pts]
+            self.segments = screen_lod(spts, rect, self.eps_px, self.min_px)
+            self.dots = thin_points(spts[1:], self.dot_px, rect)
+        return self.segments, self.dots
+
+    def clear(self) -> None:
+        self._key = None
+        self.segments = []
+        self.dots = []